@@ -0,0 +1,381 @@
+# Vectorized process-score engine
+"""
+Batched NumPy implementation of the lineup process-score analytics.
+
+The formulas mirror ``calculatePlayerProcessScore`` and the season
+aggregation in ``getLeagueAnalysis`` (prototype/src/services/api.ts), but
+run over every lineup player of every team-week of a league-season at once
+instead of one player at a time in the browser.
+
+Input is a LeagueSeasonStore (league_store.py) built from the fetched weeks.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict
+
+import numpy as np
+
+from league_store import FLEX_CODE, POSITION_CODES, POSITIONS, LeagueSeasonStore, PlayerRows
+
+FLEX_ELIGIBLE_CODES = [POSITION_CODES['RB'], POSITION_CODES['WR'], POSITION_CODES['TE'], FLEX_CODE]
+
+# (elite, good, average) thresholds per position code
+THRESHOLDS = np.array([
+    [25, 20, 15],  # QB
+    [20, 15, 10],  # RB
+    [20, 15, 10],  # WR
+    [15, 10, 5],   # TE
+    [18, 12, 8],   # FLEX
+    [12, 8, 6],    # K
+    [15, 10, 5],   # D/ST
+], dtype=np.float64)
+
+TIER_NAMES = np.array(['Poor', 'Average', 'Good', 'Elite'])
+TIER_BASE_SCORES = np.array([3.0, 5.0, 6.0, 7.5])
+
+# Order the frontend walks positionMisses in, which decides ties between equal misses
+IMPROVEMENT_ORDER = [POSITION_CODES[position] for position in ('QB', 'RB', 'WR', 'TE', 'K', 'D/ST', 'FLEX')]
+IMPROVEMENT_AREAS = {
+    'QB': ('Streaming Decisions', 'Optimize quarterback streaming'),
+    'RB': ('Rotation Timing', 'Better start/sit decisions for running backs'),
+    'WR': ('Matchup Analysis', 'Exploit favorable receiver matchups'),
+    'TE': ('Start/Sit Decisions', 'Improve tight end selection'),
+    'K': ('Start/Sit Decisions', 'Target dome games and good matchups'),
+    'D/ST': ('Start/Sit Decisions', 'Stream defenses more effectively'),
+    'FLEX': ('Start/Sit Decisions', 'General lineup optimization'),
+}
+
+
+def to_fixed1(value: float) -> str:
+    """Number.prototype.toFixed(1): halves of the exact binary value round up"""
+    return str(Decimal(float(value)).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP))
+
+
+def to_fixed1_array(values: np.ndarray) -> np.ndarray:
+    """parseFloat(x.toFixed(1)) for an array, without going through strings.
+
+    10 * x is formed exactly as a float pair (8x and 2x are exact, TwoSum
+    recovers the rounding error), so halves are detected on the true value.
+    """
+    eight, two = values * 8, values * 2
+    scaled = eight + two
+    virtual = scaled - eight
+    error = (eight - (scaled - virtual)) + (two - virtual)
+    tenths = np.floor(scaled)
+    round_up = (scaled - tenths - 0.5) + error >= 0
+    return (tenths + round_up) / 10
+
+
+def round1(value):
+    """Math.round(x * 10) / 10 (rounds halves up, unlike numpy's banker's rounding)"""
+    return np.floor(np.asarray(value, dtype=np.float64) * 10 + 0.5) / 10
+
+
+def best_bench_options(lineup: PlayerRows, bench: PlayerRows, n_groups: int):
+    """Best same-position bench alternative for every lineup player.
+
+    A FLEX starter is compared against RB/WR/TE/FLEX bench players. Ties go to
+    the bench player listed first, matching the reduce() in the frontend.
+    Returns (has_bench, bench_points, bench_index) aligned with the lineup.
+    """
+    n_positions = len(POSITIONS)
+    best_points = np.full((n_groups, n_positions), -np.inf)
+    best_index = np.full((n_groups, n_positions), -1, dtype=np.int64)
+
+    if len(bench):
+        # Sort by group, position, points descending, then original order; the
+        # first row of each (group, position) run is that slot's best option.
+        order = np.lexsort((np.arange(len(bench)), -bench.points, bench.position, bench.group))
+        keys = bench.group[order] * n_positions + bench.position[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        winners = order[first]
+        best_points[bench.group[winners], bench.position[winners]] = bench.points[winners]
+        best_index[bench.group[winners], bench.position[winners]] = winners
+
+    # FLEX starters pick the best across the eligible positions, earliest bench entry on ties
+    flex_points = best_points[:, FLEX_ELIGIBLE_CODES]
+    flex_index = best_index[:, FLEX_ELIGIBLE_CODES]
+    flex_max = flex_points.max(axis=1)
+    tie_index = np.where(
+        (flex_points == flex_max[:, None]) & (flex_index >= 0),
+        flex_index,
+        np.iinfo(np.int64).max
+    )
+    flex_best_index = tie_index.min(axis=1)
+    flex_best_index[flex_best_index == np.iinfo(np.int64).max] = -1
+
+    is_flex = lineup.position == FLEX_CODE
+    option_index = np.where(
+        is_flex,
+        flex_best_index[lineup.group],
+        best_index[lineup.group, lineup.position]
+    )
+    has_bench = option_index >= 0
+    option_points = np.where(has_bench, bench.points[np.maximum(option_index, 0)] if len(bench) else 0.0, 0.0)
+    return has_bench, option_points, option_index
+
+
+def score_lineup_players(lineup: PlayerRows, bench: PlayerRows, n_groups: int) -> Dict[str, np.ndarray]:
+    """Per-player process score components for every lineup player of every team-week"""
+    thresholds = THRESHOLDS[lineup.position]
+    points = lineup.points
+
+    tier = (
+        (points >= thresholds[:, 2]).astype(np.int64)
+        + (points >= thresholds[:, 1])
+        + (points >= thresholds[:, 0])
+    )
+    base_score = TIER_BASE_SCORES[tier]
+
+    projection_diff = points - lineup.projected
+    projection_adjustment = np.where(
+        np.abs(projection_diff) > 2,
+        np.where(
+            projection_diff > 0,
+            np.minimum(1.5, projection_diff * 0.15),
+            np.maximum(-1.0, projection_diff * 0.1)
+        ),
+        0.0
+    )
+
+    has_bench, bench_points, bench_index = best_bench_options(lineup, bench, n_groups)
+    bench_diff = points - bench_points
+    bench_adjustment = np.where(
+        has_bench & (np.abs(bench_diff) > 1),
+        np.where(
+            bench_diff > 0,
+            np.minimum(1.0, bench_diff * 0.1),
+            np.maximum(-1.0, bench_diff * 0.15)
+        ),
+        0.0
+    )
+
+    process_score = np.clip(base_score + projection_adjustment + bench_adjustment, 0, 10)
+    # '⚠️' bench impact in the frontend: an alternative existed and scored at least as much
+    bench_miss = has_bench & (bench_diff <= 0)
+
+    return {
+        'tier': tier,
+        'base_score': base_score,
+        'projection_diff': projection_diff,
+        'projection_adjustment': projection_adjustment,
+        'has_bench': has_bench,
+        'bench_points': bench_points,
+        'bench_index': bench_index,
+        'bench_adjustment': bench_adjustment,
+        'process_score': process_score,
+        'bench_miss': bench_miss,
+        'missed_points': np.where(bench_miss, to_fixed1_array(np.abs(bench_diff)), 0.0),
+    }
+
+
+def points_lost_to_bench(lineup: PlayerRows, bench: PlayerRows, n_groups: int) -> np.ndarray:
+    """Best bench scores paired against the worst lineup scores, summed where the bench won"""
+    def padded(arrays: PlayerRows, fill: float, descending: bool) -> np.ndarray:
+        counts = np.bincount(arrays.group, minlength=n_groups)
+        width = int(counts.max()) if len(arrays) else 0
+        matrix = np.full((n_groups, width), fill)
+        order = np.lexsort((-arrays.points if descending else arrays.points, arrays.group))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.arange(len(arrays)) - starts[arrays.group[order]]
+        matrix[arrays.group[order], rank] = arrays.points[order]
+        return matrix
+
+    bench_matrix = padded(bench, -np.inf, descending=True)
+    lineup_matrix = padded(lineup, np.inf, descending=False)
+    width = min(bench_matrix.shape[1], lineup_matrix.shape[1])
+    gains = bench_matrix[:, :width] - lineup_matrix[:, :width]
+    return np.where(gains > 0, gains, 0.0).sum(axis=1)
+
+
+def group_first_argmax(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """Index of the first maximum of values within each group (-1 for empty groups)"""
+    result = np.full(n_groups, -1, dtype=np.int64)
+    if len(values):
+        order = np.lexsort((np.arange(len(values)), -values, groups))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = groups[order][1:] != groups[order][:-1]
+        result[groups[order][first]] = order[first]
+    return result
+
+
+def analyze_league_season(
+    store: LeagueSeasonStore,
+    team_info: Dict[str, Dict],
+    include_players: bool = False
+) -> Dict[str, Dict]:
+    """Season analytics for every team, in the shape getLeagueAnalysis() produces.
+
+    team_info maps each of store.team_ids to {'team_name', 'owner_name'}. With
+    include_players, each week also carries the per-player score components.
+    """
+    team_ids = store.team_ids
+    group_team, group_week = store.group_team, store.group_week
+    lineup, bench = store.lineup, store.bench
+    n_groups = store.n_groups
+    n_teams = store.n_teams
+
+    scores = score_lineup_players(lineup, bench, n_groups)
+    process_score = scores['process_score']
+
+    # Weekly aggregates: points, mean of valid (> 0) process scores, points lost to bench
+    week_points = store.group_sums(lineup)
+    valid = process_score > 0
+    valid_count = np.bincount(lineup.group[valid], minlength=n_groups)
+    valid_sum = np.bincount(lineup.group[valid], weights=process_score[valid], minlength=n_groups)
+    week_process_score = np.where(valid_count > 0, valid_sum / np.maximum(valid_count, 1), 5.0)
+    week_bench_loss = points_lost_to_bench(lineup, bench, n_groups)
+    top_player = group_first_argmax(lineup.points, lineup.group, n_groups)
+
+    # First lineup player per week whose bench miss exceeds 5 points
+    big_miss_rows = np.flatnonzero(scores['bench_miss'] & (scores['missed_points'] > 5))
+    big_miss = np.full(n_groups, -1, dtype=np.int64)
+    big_miss[lineup.group[big_miss_rows[::-1]]] = big_miss_rows[::-1]
+
+    # Season aggregates per team
+    weeks_per_team = store.weeks_played()
+    season_points = store.team_sums(week_points)
+    season_process = store.team_sums(week_process_score)
+    season_bench_loss = store.team_sums(week_bench_loss)
+    game_tier = np.digitize(week_process_score, [5.0, 6.5, 8.0])  # 0 poor .. 3 elite
+    tier_counts = np.zeros((n_teams, 4), dtype=np.int64)
+    np.add.at(tier_counts, (group_team, game_tier), 1)
+
+    player_team = lineup.team
+    position_misses = np.zeros((n_teams, len(POSITIONS)))
+    np.add.at(position_misses, (player_team, lineup.position), scores['missed_points'])
+
+    # Highlights: lineup performances of 20+ points, best five per team
+    highlight_rows = np.flatnonzero(lineup.points >= 20)
+    highlight_rows = highlight_rows[np.lexsort((highlight_rows, -lineup.points[highlight_rows], player_team[highlight_rows]))]
+
+    group_rows = np.split(np.arange(len(lineup)), np.cumsum(np.bincount(lineup.group, minlength=n_groups))[:-1]) \
+        if include_players else None
+
+    analysis = {}
+    for team_index, team_id in enumerate(team_ids):
+        weeks = max(int(weeks_per_team[team_index]), 0)
+        avg_points = season_points[team_index] / weeks if weeks else 0.0
+        avg_process = season_process[team_index] / weeks if weeks else 0.0
+
+        weekly_performance = []
+        for group in np.flatnonzero(group_team == team_index):
+            top = top_player[group]
+            miss = big_miss[group]
+            week_entry = {
+                'week': int(group_week[group]),
+                'points': float(round1(week_points[group])),
+                'topPlayer': lineup.names[top] if top >= 0 else 'None',
+                'topPoints': float(round1(lineup.points[top])) if top >= 0 else 0.0,
+                'processScore': float(round1(week_process_score[group])),
+                'bigMiss': bench.names[scores['bench_index'][miss]] if miss >= 0 else None,
+                'pointsLostToBench': float(round1(week_bench_loss[group]))
+            }
+            if include_players:
+                week_entry['players'] = [player_scores(lineup, bench, scores, row) for row in group_rows[group]]
+            weekly_performance.append(week_entry)
+
+        team_highlights = highlight_rows[player_team[highlight_rows] == team_index][:5]
+        season_highlights = [
+            {
+                'week': int(lineup.week[row]),
+                'player': lineup.names[row],
+                'points': float(lineup.points[row]),
+                'type': 'elite' if lineup.points[row] >= 25 else 'good'
+            }
+            for row in team_highlights
+        ]
+
+        misses = [
+            (POSITIONS[code], float(position_misses[team_index, code]))
+            for code in np.array(IMPROVEMENT_ORDER)[np.argsort(-position_misses[team_index, IMPROVEMENT_ORDER], kind='stable')]
+            if position_misses[team_index, code] > 5
+        ][:4]
+        improvement_areas = [
+            {
+                'area': f"{position} {IMPROVEMENT_AREAS[position][0]}",
+                'impact': f"+{to_fixed1(points)} pts",
+                'priority': 'high' if points > 15 else 'medium' if points > 8 else 'low',
+                'description': IMPROVEMENT_AREAS[position][1]
+            }
+            for position, points in misses
+        ]
+
+        info = team_info[team_id]
+        analysis[team_id] = {
+            'teamId': team_id,
+            'teamName': info.get('team_name') or f"Team {team_id}",
+            'ownerName': info.get('owner_name') or 'Unknown Owner',
+            'seasonSummary': {
+                'avgPoints': float(round1(avg_points)),
+                'avgProcessScore': float(round1(avg_process)),
+                'totalWeeks': weeks,
+                'eliteGames': int(tier_counts[team_index, 3]),
+                'strongGames': int(tier_counts[team_index, 2]),
+                'averageGames': int(tier_counts[team_index, 1]),
+                'poorGames': int(tier_counts[team_index, 0]),
+                'benchPoints': float(round1(season_bench_loss[team_index]))
+            },
+            'weeklyPerformance': weekly_performance,
+            'seasonHighlights': season_highlights,
+            'improvementAreas': improvement_areas
+        }
+
+    return analysis
+
+
+def player_scores(lineup: PlayerRows, bench: PlayerRows, scores: Dict[str, np.ndarray], row: int) -> Dict:
+    """Score components of a single lineup player, for the optional per-player output"""
+    bench_index = scores['bench_index'][row]
+    return {
+        'name': lineup.names[row],
+        'position': POSITIONS[lineup.position[row]],
+        'points': float(lineup.points[row]),
+        'projected': float(lineup.projected[row]),
+        'tier': str(TIER_NAMES[scores['tier'][row]]),
+        'baseScore': float(scores['base_score'][row]),
+        'projectionAdjustment': float(scores['projection_adjustment'][row]),
+        'benchAlternative': bench.names[bench_index] if bench_index >= 0 else None,
+        'benchPoints': float(scores['bench_points'][row]),
+        'benchAdjustment': float(scores['bench_adjustment'][row]),
+        'processScore': float(scores['process_score'][row])
+    }
+
+
+def league_summary(store: LeagueSeasonStore, team_info: Dict[str, Dict]) -> Dict:
+    """League-wide weekly totals, bench points, position averages and leaderboards"""
+    weekly_totals = store.weekly_totals()
+    bench_points = store.bench_points()
+    position_averages = store.position_averages()
+    weeks_played = store.weeks_played()
+    season_points = np.nansum(weekly_totals, axis=1)
+    season_bench = np.nansum(bench_points, axis=1)
+    per_week = np.divide(season_points, weeks_played, out=np.zeros(store.n_teams), where=weeks_played > 0)
+
+    def series(values: np.ndarray) -> list:
+        return [None if np.isnan(value) else float(round1(value)) for value in values]
+
+    def leaderboard(values: np.ndarray) -> list:
+        return [
+            {
+                'teamId': store.team_ids[index],
+                'teamName': team_info[store.team_ids[index]].get('team_name') or f"Team {store.team_ids[index]}",
+                'value': float(round1(values[index]))
+            }
+            for index in store.leaderboard(values)
+        ]
+
+    return {
+        'weeks': [int(week) for week in store.weeks],
+        'weeklyTotals': {team_id: series(weekly_totals[index]) for index, team_id in enumerate(store.team_ids)},
+        'benchPoints': {team_id: series(bench_points[index]) for index, team_id in enumerate(store.team_ids)},
+        'positionAverages': {
+            team_id: dict(zip(POSITIONS, series(position_averages[index])))
+            for index, team_id in enumerate(store.team_ids)
+        },
+        'leaderboards': {
+            'pointsFor': leaderboard(season_points),
+            'pointsPerWeek': leaderboard(per_week),
+            'benchPoints': leaderboard(season_bench)
+        }
+    }
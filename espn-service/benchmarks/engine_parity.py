@@ -0,0 +1,413 @@
+# Process-score engine parity check
+"""
+Compares analysis_engine.analyze_league_season() with the frontend code it
+replaced: getLeagueAnalysis() and calculatePlayerProcessScore() from
+prototype/src/services/api.ts before the engine existed (see
+`git show 11bb54d^:prototype/src/services/api.ts`).
+
+    python benchmarks/engine_parity.py [--random-leagues 200] [--seed 1]
+
+The fixture (benchmarks/fixtures/process_scores_league.json) is a 10-team,
+17-week league in the /secure-all-teams-analysis layout. Its points sit on
+a quarter-point grid, so equal scores and bench ties come up often. Small
+randomized tie-heavy leagues are checked as well. The script exits with
+status 1 on any difference.
+
+The frontend left seasonSummary.benchPoints at 0 and had no
+weeklyPerformance[].pointsLostToBench. Both are checked against their own
+definition (best bench scores paired against the worst starters) instead.
+
+It also runs the league analytics, including the optimal-lineup solver, on
+two edge cases: a store with no team-weeks, and a team-week with no roster
+rows next to one with points left on the bench.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+from decimal import ROUND_HALF_UP, Decimal
+
+from harness import load_server
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'process_scores_league.json')
+
+THRESHOLDS = {
+    'QB': (25, 20, 15),
+    'RB': (20, 15, 10),
+    'WR': (20, 15, 10),
+    'TE': (15, 10, 5),
+    'FLEX': (18, 12, 8),
+    'K': (12, 8, 6),
+    'D/ST': (15, 10, 5),
+}
+POSITIONS = list(THRESHOLDS)
+FIXTURE_POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'K', 'D/ST']
+
+
+def js_round1(value: float) -> float:
+    """Math.round(x * 10) / 10"""
+    return math.floor(value * 10 + 0.5) / 10
+
+
+def js_to_fixed1(value: float) -> str:
+    """Number.prototype.toFixed(1)"""
+    return str(Decimal(value).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP))
+
+
+def legacy_player_process_score(player: dict, bench_players: list) -> dict:
+    """calculatePlayerProcessScore(), keeping only the fields getLeagueAnalysis() reads"""
+    position = player.get('position') or 'FLEX'
+    points = player.get('points') or 0
+    elite, good, average = THRESHOLDS.get(position, THRESHOLDS['FLEX'])
+
+    base_score = 3.0
+    if points >= elite:
+        base_score = 7.5
+    elif points >= good:
+        base_score = 6.0
+    elif points >= average:
+        base_score = 5.0
+
+    projection_diff = points - (player.get('projected') or 0)
+    projection_adjustment = 0
+    if abs(projection_diff) > 2:
+        projection_adjustment = min(1.5, projection_diff * 0.15) if projection_diff > 0 else max(-1.0, projection_diff * 0.1)
+
+    position_bench = [
+        p for p in bench_players
+        if p['position'] == position or (position == 'FLEX' and p['position'] in ('RB', 'WR', 'TE'))
+    ]
+    best_bench_option = None
+    for current in position_bench:  # reduce(): later entries only win on strictly more points
+        if best_bench_option is None or current['points'] > best_bench_option['points']:
+            best_bench_option = current
+
+    bench_adjustment = 0
+    bench_impact = 'No alternatives'
+    bench_alternative = None
+    if best_bench_option:
+        bench_alternative = best_bench_option['name']
+        bench_diff = points - best_bench_option['points']
+        if abs(bench_diff) > 1:
+            bench_adjustment = min(1.0, bench_diff * 0.1) if bench_diff > 0 else max(-1.0, bench_diff * 0.15)
+        bench_impact = (
+            f"✅ Beat {best_bench_option['name']} ({js_to_fixed1(best_bench_option['points'])})" if bench_diff > 0
+            else f"⚠️ {best_bench_option['name']} (+{js_to_fixed1(abs(bench_diff))})"
+        )
+
+    return {
+        'name': player['name'],
+        'position': player.get('position'),
+        'espnPoints': points,
+        'processScore': min(10, max(0, base_score + projection_adjustment + bench_adjustment)),
+        'benchImpact': bench_impact,
+        'benchAlternative': bench_alternative,
+    }
+
+
+def bench_miss_points(bench_impact: str) -> float:
+    """parseFloat(benchImpact.match(/\\+(\\d+\\.?\\d*)/)?.[1] || '0')"""
+    match = re.search(r'\+(\d+\.?\d*)', bench_impact)
+    return float(match.group(1)) if match else 0.0
+
+
+def legacy_league_analysis(teams: dict) -> dict:
+    """getLeagueAnalysis() over an all-teams response's teams"""
+    league_analysis = {}
+    for team_id, team_data in teams.items():
+        weekly_data = team_data.get('weekly_data') or {}
+        weeks = sorted((w for w in weekly_data if int(w) <= 17), key=int)
+
+        weekly_analytics = []
+        total_points = total_process_score = 0
+        elite_games = strong_games = average_games = poor_games = 0
+        for week in weeks:
+            lineup = weekly_data[week].get('lineup') or []
+            bench = weekly_data[week].get('bench') or []
+            analyzed = [legacy_player_process_score(player, bench) for player in lineup]
+
+            week_points = sum(player['espnPoints'] for player in analyzed)
+            valid = [player['processScore'] for player in analyzed if player['processScore'] > 0]
+            week_process_score = sum(valid) / len(valid) if valid else 5.0
+            total_points += week_points
+            total_process_score += week_process_score
+            if week_process_score >= 8.0:
+                elite_games += 1
+            elif week_process_score >= 6.5:
+                strong_games += 1
+            elif week_process_score >= 5.0:
+                average_games += 1
+            else:
+                poor_games += 1
+
+            top = analyzed[0] if analyzed else {'name': 'None', 'espnPoints': 0}
+            for current in analyzed:
+                if current['espnPoints'] > top['espnPoints']:
+                    top = current
+            big_miss = next((p for p in analyzed if '⚠️' in p['benchImpact'] and bench_miss_points(p['benchImpact']) > 5), None)
+            weekly_analytics.append({
+                'week': int(week),
+                'points': js_round1(week_points),
+                'topPlayer': top['name'] or 'Unknown',
+                'topPoints': js_round1(top['espnPoints'] or 0),
+                'processScore': js_round1(week_process_score),
+                'bigMiss': big_miss['benchAlternative'] if big_miss else None
+            })
+
+        performances = []
+        position_misses = {position: 0.0 for position in ('QB', 'RB', 'WR', 'TE', 'K', 'D/ST', 'FLEX')}
+        for week in weeks:
+            lineup = weekly_data[week].get('lineup') or []
+            bench = weekly_data[week].get('bench') or []
+            for player in (legacy_player_process_score(p, bench) for p in lineup):
+                if player['espnPoints'] >= 20:
+                    performances.append({
+                        'week': int(week),
+                        'player': player['name'],
+                        'points': player['espnPoints'],
+                        'type': 'elite' if player['espnPoints'] >= 25 else 'good'
+                    })
+                if '⚠️' in player['benchImpact']:
+                    # undefined += x is NaN in JS, which the "> 5" filter then drops
+                    position_misses[player['position']] = position_misses.get(player['position'], math.nan) + bench_miss_points(player['benchImpact'])
+
+        areas = {
+            'QB': ('Streaming Decisions', 'Optimize quarterback streaming'),
+            'RB': ('Rotation Timing', 'Better start/sit decisions for running backs'),
+            'WR': ('Matchup Analysis', 'Exploit favorable receiver matchups'),
+            'TE': ('Start/Sit Decisions', 'Improve tight end selection'),
+            'K': ('Start/Sit Decisions', 'Target dome games and good matchups'),
+            'D/ST': ('Start/Sit Decisions', 'Stream defenses more effectively'),
+        }
+        improvement_areas = [
+            {
+                'area': f"{position} {areas.get(position, ('Start/Sit Decisions',))[0]}",
+                'impact': f"+{js_to_fixed1(points)} pts",
+                'priority': 'high' if points > 15 else 'medium' if points > 8 else 'low',
+                'description': areas.get(position, (None, 'General lineup optimization'))[1]
+            }
+            for position, points in sorted(
+                ((position, points) for position, points in position_misses.items() if points > 5),
+                key=lambda item: -item[1]
+            )[:4]
+        ]
+
+        league_analysis[team_id] = {
+            'teamId': team_id,
+            'teamName': team_data.get('team_name') or team_data.get('teamName') or f"Team {team_id}",
+            'ownerName': team_data.get('owner_name') or team_data.get('ownerName') or 'Unknown Owner',
+            'seasonSummary': {
+                'avgPoints': js_round1(total_points / len(weeks)) if weeks else 0,
+                'avgProcessScore': js_round1(total_process_score / len(weeks)) if weeks else 0,
+                'totalWeeks': len(weeks),
+                'eliteGames': elite_games,
+                'strongGames': strong_games,
+                'averageGames': average_games,
+                'poorGames': poor_games,
+            },
+            'weeklyPerformance': weekly_analytics,
+            'seasonHighlights': sorted(performances, key=lambda p: -p['points'])[:5],
+            'improvementAreas': improvement_areas
+        }
+    return league_analysis
+
+
+def week_points_lost(week_data: dict) -> float:
+    """Best bench scores paired against the worst starters, summed where the bench won"""
+    bench = sorted((p['points'] for p in week_data.get('bench') or []), reverse=True)
+    lineup = sorted(p['points'] for p in week_data.get('lineup') or [])
+    return sum(max(0.0, b - s) for b, s in zip(bench, lineup))
+
+
+def engine_analysis(server, teams: dict) -> dict:
+    """analyze_league_season() over the same teams, through the server's record types"""
+    from analysis_engine import analyze_league_season
+    from league_store import LeagueSeasonStore
+
+    def players(rows, bench: bool):
+        return [
+            server.PlayerWeek(p['name'], p['position'], p['points'], p['projected'], p.get('player_id', 0),
+                              p.get('lineup_slot', 20 if bench else 0), ())
+            for p in rows
+        ]
+
+    week_records = {}
+    for team_id, team_data in teams.items():
+        for week, week_data in team_data['weekly_data'].items():
+            week_records.setdefault(int(week), {})[team_id] = server.TeamWeek(
+                team_id, team_data['team_name'], team_data['owner_name'],
+                players(week_data.get('lineup') or [], False), players(week_data.get('bench') or [], True)
+            )
+    team_info = {team_id: {'team_name': t['team_name'], 'owner_name': t['owner_name']} for team_id, t in teams.items()}
+    store = LeagueSeasonStore.from_week_records(week_records, list(teams))
+    return analyze_league_season(store, team_info)
+
+
+def differences(teams: dict, engine: dict, legacy: dict) -> list:
+    """Human-readable mismatches between the engine and the frontend port"""
+    problems = []
+    for team_id, expected in legacy.items():
+        actual = json.loads(json.dumps(engine[team_id]))
+        weekly_data = teams[team_id]['weekly_data']
+        season_lost = 0.0
+        for week_entry in actual['weeklyPerformance']:
+            lost = week_points_lost(weekly_data[str(week_entry['week'])])
+            season_lost += lost
+            if week_entry.pop('pointsLostToBench') != js_round1(lost):
+                problems.append(f"team {team_id} week {week_entry['week']}: pointsLostToBench")
+        if actual['seasonSummary'].pop('benchPoints') != js_round1(season_lost):
+            problems.append(f"team {team_id}: seasonSummary.benchPoints")
+        for key, value in expected.items():
+            if actual[key] == value:
+                continue
+            if isinstance(value, list) and len(value) == len(actual[key]):
+                problems += [
+                    f"team {team_id} {key}[{index}]:\n  engine   {mine}\n  frontend {theirs}"
+                    for index, (mine, theirs) in enumerate(zip(actual[key], value)) if mine != theirs
+                ]
+            else:
+                problems.append(f"team {team_id} {key}:\n  engine   {actual[key]}\n  frontend {value}")
+    return problems
+
+
+def solver_edge_cases(server) -> list:
+    """Mismatches from build_league_analytics() on an empty store and on a team-week without roster rows"""
+    problems = []
+    team_info = {'1': {'team_name': 'Team 1', 'owner_name': 'Owner 1'}, '2': {'team_name': 'Team 2', 'owner_name': 'Owner 2'}}
+    qb_slots = {0: 1}
+
+    def left_on_bench(week_records) -> dict:
+        _, summary = server.build_league_analytics(week_records, team_info, qb_slots, False)
+        return {
+            team_id: [(week['week'], week['pointsLeftOnBench'], len(week['swaps'])) for week in team['weeks']]
+            for team_id, team in summary['optimalLineups']['teams'].items()
+        }
+
+    try:
+        found = left_on_bench({})
+        if found != {'1': [], '2': []}:
+            problems.append(f"empty store: {found}")
+    except Exception as e:
+        problems.append(f"empty store: {type(e).__name__}: {e}")
+
+    # Team 1's week has no rows; team 2 left a 25-point QB on the bench for a 10-point one
+    starter = server.PlayerWeek('QB one', 'QB', 10.0, 0.0, 1, 0, (0, 20))
+    backup = server.PlayerWeek('QB two', 'QB', 25.0, 0.0, 2, 20, (0, 20))
+    week_records = {1: {
+        '1': server.TeamWeek('1', 'Team 1', 'Owner 1', [], []),
+        '2': server.TeamWeek('2', 'Team 2', 'Owner 2', [starter], [backup])
+    }}
+    try:
+        found = left_on_bench(week_records)
+        if found != {'1': [(1, 0.0, 0)], '2': [(1, 15.0, 1)]}:
+            problems.append(f"team-week without rows: {found}")
+    except Exception as e:
+        problems.append(f"team-week without rows: {type(e).__name__}: {e}")
+    return problems
+
+
+def fixture_league(n_teams: int = 10, n_weeks: int = 17, bench_size: int = 6, seed: int = 2024) -> dict:
+    """The committed fixture: points on a quarter-point grid so ties are common"""
+    rng = random.Random(seed)
+    teams = {}
+    for team_id in range(1, n_teams + 1):
+        starters = [(team_id * 100 + index, f"T{team_id} {position} {index}", position)
+                    for index, position in enumerate(FIXTURE_POSITIONS)]
+        reserves = [(team_id * 100 + 50 + index, f"T{team_id} bench {index}", rng.choice(['QB', 'RB', 'WR', 'TE', 'K', 'D/ST']))
+                    for index in range(bench_size)]
+        weekly_data = {}
+        for week in range(1, n_weeks + 1):
+            def line(player_id, name, position, slot):
+                return {
+                    'name': name,
+                    'position': position,
+                    'points': rng.randrange(0, 140) / 4,
+                    'projected': rng.randrange(0, 100) / 4,
+                    'player_id': player_id,
+                    'lineup_slot': slot
+                }
+            weekly_data[str(week)] = {
+                'lineup': [line(*player, 0) for player in starters],
+                'bench': [line(*player, 20) for player in reserves]
+            }
+        teams[str(team_id)] = {
+            'team_id': str(team_id),
+            'team_name': f"Team {team_id}",
+            'owner_name': f"Owner {team_id}",
+            'weekly_data': weekly_data
+        }
+    return teams
+
+
+def random_league(rng: random.Random) -> dict:
+    """A small league with uneven rosters, missing weeks and many equal scores"""
+    teams = {}
+    for team_id in range(1, rng.randint(2, 6)):
+        weekly_data = {}
+        for week in range(1, rng.randint(2, 9)):
+            if rng.random() < 0.1:
+                continue
+
+            def line(index):
+                return {
+                    'name': f"p{week}-{team_id}-{index}",
+                    'position': rng.choice(POSITIONS),
+                    'points': float(rng.choice([0, 5, 10, 12, 15, 20, 25, 30]) + rng.choice([0, 0.5, 0.25])),
+                    'projected': float(rng.choice([0, 8, 12, 18, 22]))
+                }
+            weekly_data[str(week)] = {
+                'lineup': [line(index) for index in range(rng.randint(0, 9))],
+                'bench': [line(100 + index) for index in range(rng.randint(0, 7))]
+            }
+        teams[str(team_id)] = {'team_id': str(team_id), 'team_name': f"T{team_id}", 'owner_name': 'o', 'weekly_data': weekly_data}
+    return teams
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--random-leagues', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--write-fixture', action='store_true', help='regenerate the committed fixture file')
+    args = parser.parse_args()
+
+    if args.write_fixture:
+        os.makedirs(os.path.dirname(FIXTURE_PATH), exist_ok=True)
+        with open(FIXTURE_PATH, 'w') as f:
+            json.dump({'teams': fixture_league()}, f, separators=(',', ':'))
+            f.write('\n')
+        print(f"fixture written to {FIXTURE_PATH}")
+
+    server = load_server()
+    logging.disable(logging.INFO)
+    with open(FIXTURE_PATH) as f:
+        fixture = json.load(f)['teams']
+
+    problems = differences(fixture, engine_analysis(server, fixture), legacy_league_analysis(fixture))
+    weeks = sum(len(team['weekly_data']) for team in fixture.values())
+    print(f"fixture: {len(fixture)} teams, {weeks} team-weeks, {len(problems)} differences")
+
+    rng = random.Random(args.seed)
+    random_problems = 0
+    for trial in range(args.random_leagues):
+        teams = random_league(rng)
+        found = differences(teams, engine_analysis(server, teams), legacy_league_analysis(teams))
+        random_problems += len(found)
+        problems += [f"random league {trial}, {problem}" for problem in found]
+    print(f"random tie-heavy leagues: {args.random_leagues}, {random_problems} differences")
+
+    found = solver_edge_cases(server)
+    problems += found
+    print(f"solver edge cases: 2, {len(found)} differences")
+
+    for problem in problems[:20]:
+        print(problem)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
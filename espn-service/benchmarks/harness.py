@@ -0,0 +1,32 @@
+# Shared helpers for the benchmark scripts
+import importlib.util
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_server(path: str = None):
+    """Import secure-espn-server.py (its file name is not a valid module name), or another copy of it"""
+    if SERVICE_DIR not in sys.path:
+        sys.path.insert(0, SERVICE_DIR)
+    spec = importlib.util.spec_from_file_location('secure_espn_server', path or os.path.join(SERVICE_DIR, 'secure-espn-server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(fn: Callable[[], object], repeat: int = 7, number: int = 1,
+            clock: Callable[[], float] = time.perf_counter) -> Dict[str, float]:
+    """Best and median time per call, in milliseconds (wall time unless another clock is given)"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = clock()
+        for _ in range(number):
+            fn()
+        samples.append((clock() - start) * 1000 / number)
+    return {'best_ms': min(samples), 'median_ms': statistics.median(samples)}
@@ -0,0 +1,199 @@
+# End-to-end load test against the mock ESPN upstream
+"""
+Drives the authenticate -> league-info -> all-teams flow with N concurrent
+users and reports latency percentiles, throughput and ESPN calls per endpoint.
+
+    python benchmarks/load_test.py [--users 20] [--rounds 3] [--leagues 1] [--teams 12] [--weeks 17] [--latency-ms 50]
+
+By default it starts benchmarks/mock_espn.py and secure-espn-server.py as
+subprocesses (the server pointed at the mock through ESPN_API_BASE_URL,
+with upstream pacing and the per-session request limit off unless
+ESPN_RATE_LIMIT_RPS or SESSION_RATE_LIMIT is exported). Pass
+--server-url and --mock-url to test instances that are already running,
+e.g. a multi-worker server.
+
+Each round runs the three steps as phases: every user authenticates, then
+every user requests league info, then the full-season analysis. Users are
+spread over --leagues leagues, so the first round sees cold caches and
+later rounds show the warm path. ESPN calls are counted by the mock.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))]
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"{url} exited with status {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_processes(args) -> List[subprocess.Popen]:
+    mock = subprocess.Popen([
+        sys.executable, os.path.join(BENCHMARKS_DIR, 'mock_espn.py'),
+        '--port', str(args.mock_port), '--teams', str(args.teams), '--weeks', str(args.weeks),
+        '--bench-size', str(args.bench_size), '--latency-ms', str(args.latency_ms)
+    ], cwd=BENCHMARKS_DIR)
+    env = dict(os.environ)
+    env.setdefault('ESPN_RATE_LIMIT_RPS', '0')
+    env.setdefault('SESSION_RATE_LIMIT', '0')
+    env.setdefault('LOG_LEVEL', 'WARNING')
+    env['ESPN_API_BASE_URL'] = f"{args.mock_url}/apis/v3/games/ffl"
+    env['PORT'] = str(args.port)
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SERVICE_DIR, 'secure-espn-server.py')],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL
+    )
+    processes = [mock, server]
+    try:
+        wait_ready(f"{args.mock_url}/_mock/stats", mock)
+        wait_ready(f"{args.server_url}/health", server)
+    except BaseException:
+        stop_processes(processes)
+        raise
+    return processes
+
+
+def stop_processes(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run_phase(client: httpx.AsyncClient, mock: httpx.AsyncClient, users: List[Dict], step) -> Dict:
+    """Run one step for every user at once; returns latencies, errors and ESPN calls"""
+    before = (await mock.get('/_mock/stats')).json()['total']
+    latencies = []
+    errors = 0
+
+    async def one(user):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            response = await step(client, user)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(user) for user in users))
+    elapsed = time.perf_counter() - start
+    after = (await mock.get('/_mock/stats')).json()['total']
+    return {'latencies': latencies, 'errors': errors, 'seconds': elapsed, 'upstream_calls': after - before}
+
+
+async def authenticate(client: httpx.AsyncClient, user: Dict) -> httpx.Response:
+    response = await client.post('/secure-authenticate', json={
+        'espn_s2': user['espn_s2'], 'swid': user['swid'], 'league_id': user['league_id']
+    })
+    if response.status_code == 200:
+        user['headers'] = {'Authorization': f"Bearer {response.json()['session_token']}"}
+    return response
+
+
+async def league_info(client: httpx.AsyncClient, user: Dict) -> httpx.Response:
+    return await client.post('/secure-league-info', headers=user.get('headers'),
+                             json={'league_id': user['league_id'], 'year': user['year']})
+
+
+def all_teams(weeks: int):
+    async def step(client: httpx.AsyncClient, user: Dict) -> httpx.Response:
+        return await client.post('/secure-all-teams-analysis', headers=user.get('headers'), json={
+            'league_id': user['league_id'], 'year': user['year'], 'start_week': 1, 'end_week': weeks
+        })
+    return step
+
+
+async def run(args) -> None:
+    users = [
+        {
+            'espn_s2': f"load-test-{index:06d}-" + 'x' * 32,
+            'swid': f"{{MEMBER-{index % args.teams + 1}}}",
+            'league_id': str(100000 + index % args.leagues),
+            'year': 2024
+        }
+        for index in range(args.users)
+    ]
+    steps = [('authenticate', authenticate), ('league-info', league_info), ('all-teams', all_teams(args.weeks))]
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.server_url, limits=limits, timeout=120.0) as client, \
+            httpx.AsyncClient(base_url=args.mock_url) as mock:
+        print(f"{args.users} users in {args.leagues} league(s), {args.teams} teams x {args.weeks} weeks, "
+              f"{args.rounds} round(s), server {args.server_url}")
+        print()
+        print(f"{'round':<7}{'endpoint':<15}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}"
+              f"{'p99 ms':>9}{'req/s':>9}{'ESPN calls':>12}")
+        for round_number in range(1, args.rounds + 1):
+            for label, step in steps:
+                result = await run_phase(client, mock, users, step)
+                latencies = result['latencies']
+                print(f"{round_number:<7}{label:<15}{len(latencies):>9}{result['errors']:>8}"
+                      f"{percentile(latencies, 0.50):>9.1f}{percentile(latencies, 0.95):>9.1f}"
+                      f"{percentile(latencies, 0.99):>9.1f}{len(latencies) / result['seconds']:>9.1f}"
+                      f"{result['upstream_calls']:>12}")
+        stats = (await mock.get('/_mock/stats')).json()
+        print()
+        print(f"ESPN calls by view: {stats['by_view']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=17)
+    parser.add_argument('--bench-size', type=int, default=7)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='mock ESPN response latency')
+    parser.add_argument('--port', type=int, default=8010, help='port for the spawned server')
+    parser.add_argument('--mock-port', type=int, default=8011, help='port for the spawned mock ESPN')
+    parser.add_argument('--server-url', help='use an already running server instead of spawning one')
+    parser.add_argument('--mock-url', help='mock ESPN the running server points at')
+    args = parser.parse_args()
+
+    if bool(args.server_url) != bool(args.mock_url):
+        parser.error('--server-url and --mock-url go together')
+    processes = []
+    if not args.server_url:
+        args.server_url = f"http://127.0.0.1:{args.port}"
+        args.mock_url = f"http://127.0.0.1:{args.mock_port}"
+        processes = start_processes(args)
+    args.server_url = args.server_url.rstrip('/')
+    args.mock_url = args.mock_url.rstrip('/')
+    try:
+        asyncio.run(run(args))
+    finally:
+        stop_processes(processes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# Logging overhead benchmark
+"""
+CPU time logging adds to a cold full-season /secure-all-teams-analysis
+request, served end to end against a mocked ESPN. Modes are run in
+interleaved rounds so machine noise hits them alike.
+
+    python benchmarks/logging_overhead.py [--teams 12] [--weeks 17] [--server PATH]
+
+At INFO a request writes its summary line; per-team, per-week and
+per-ESPN-call detail is only formatted at DEBUG. Log output goes to an
+in-memory stream so terminal speed does not count. To see what the
+change saved, run it again with --server pointing at an older copy of
+secure-espn-server.py, e.g. from `git show <rev>:espn-service/secure-espn-server.py`.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import statistics
+import time
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+from fastapi.testclient import TestClient
+
+from harness import load_server
+from synthetic import league_members, league_settings, league_status, league_teams, mroster_payload
+
+
+def mock_espn(n_teams: int, n_weeks: int) -> httpx.MockTransport:
+    """Pre-encoded ESPN responses for a finished season"""
+    league = json.dumps({
+        'id': 123456,
+        'seasonId': 2024,
+        'scoringPeriodId': n_weeks,
+        'status': league_status(n_weeks + 1, final_week=n_weeks),
+        'settings': league_settings(),
+        'members': league_members(n_teams),
+        'teams': league_teams(n_teams)
+    }).encode()
+    weeks = {
+        week: json.dumps(mroster_payload(week, n_teams=n_teams, current_week=n_weeks + 1)).encode()
+        for week in range(1, n_weeks + 1)
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = parse_qs(urlparse(str(request.url)).query)
+        week = int(query.get('scoringPeriodId', ['0'])[0])
+        body = weeks[week] if week else league
+        return httpx.Response(200, content=body, headers={'content-type': 'application/json'})
+
+    return httpx.MockTransport(handler)
+
+
+def reset_caches(server):
+    """Empty every cache so each request fetches and parses the whole season again"""
+    server.upstream_cache = server.UpstreamResponseCache(server.UPSTREAM_CACHE_MAX_ENTRIES, server.UPSTREAM_CACHE_MAX_BYTES)
+    server.week_result_cache = server.WeekResultCache(server.RESULT_CACHE_MAX_WEEKS)
+    server.week_store = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=17)
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--server', help='path of the secure-espn-server.py to load')
+    args = parser.parse_args()
+
+    # The mock ESPN has no rate limit, so don't pace calls to it, and every
+    # round reuses one session, which the per-session limit would cut off
+    os.environ.setdefault('ESPN_RATE_LIMIT_RPS', '0')
+    os.environ.setdefault('SESSION_RATE_LIMIT', '0')
+    server = load_server(args.server)
+    transport = mock_espn(args.teams, args.weeks)
+    create_client = server.create_espn_client
+
+    def create_mock_client():
+        client = create_client()
+        client._transport = transport
+        return client
+
+    server.create_espn_client = create_mock_client
+    server.espn_http_client = None
+
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    root = logging.getLogger()
+    root.handlers = [handler]
+
+    client = TestClient(server.app)
+    auth = client.post('/secure-authenticate', json={'espn_s2': 'x' * 40, 'swid': '{MEMBER-1}', 'league_id': '123456'})
+    headers = {'Authorization': f"Bearer {auth.json()['session_token']}"}
+    body = {'league_id': '123456', 'year': 2024, 'start_week': 1, 'end_week': args.weeks}
+
+    def request():
+        reset_caches(server)
+        response = client.post('/secure-all-teams-analysis', json=body, headers=headers)
+        assert response.status_code == 200, response.text
+
+    text = logging.Formatter(logging.BASIC_FORMAT)
+    modes = [('disabled', logging.CRITICAL + 1, text), ('INFO text', logging.INFO, text)]
+    if hasattr(server, 'JsonLogFormatter'):
+        modes += [
+            ('INFO json', logging.INFO, server.JsonLogFormatter()),
+            ('DEBUG text', logging.DEBUG, text),
+            ('DEBUG json', logging.DEBUG, server.JsonLogFormatter()),
+        ]
+    print(f"cold all-teams request: {args.teams} teams x {args.weeks} weeks, server {args.server or 'secure-espn-server.py'}")
+    print()
+    print(f"{'log level':<14}{'lines':>7}{'log bytes':>11}{'CPU ms':>9}{'vs disabled':>13}")
+
+    def run(level, formatter) -> float:
+        root.setLevel(level)
+        handler.setFormatter(formatter)
+        stream.seek(0)
+        stream.truncate()
+        start = time.process_time()
+        request()
+        return (time.process_time() - start) * 1000
+
+    samples = {label: [] for label, _, _ in modes}
+    output = {}
+    for _ in range(args.rounds + 1):  # the first round warms up
+        for label, level, formatter in modes:
+            samples[label].append(run(level, formatter))
+            output[label] = stream.getvalue()
+    baseline = statistics.median(samples['disabled'][1:])
+    for label, _, _ in modes:
+        cpu_ms = statistics.median(samples[label][1:])
+        print(f"{label:<14}{output[label].count(chr(10)):>7}{len(output[label]):>11,}{cpu_ms:>9.2f}{cpu_ms - baseline:>+13.2f}")
+
+
+if __name__ == '__main__':
+    main()
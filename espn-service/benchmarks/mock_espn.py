@@ -0,0 +1,113 @@
+# Local stand-in for the ESPN fantasy API
+"""
+Serves synthetic mTeam, mSettings, mRoster and mMatchup payloads at the
+lm-api-reads URL shape, so the server can be run and load-tested without
+real ESPN cookies:
+
+    python benchmarks/mock_espn.py [--port 8011] [--teams 12] [--weeks 17] [--bench-size 7] [--latency-ms 50]
+    ESPN_API_BASE_URL=http://127.0.0.1:8011/apis/v3/games/ffl python secure-espn-server.py
+
+Any league id and season are accepted. Requests without an espn_s2 cookie
+get 401. GET /_mock/stats returns the number of calls served per view
+(POST /_mock/reset zeroes them).
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from functools import lru_cache
+from typing import Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+from synthetic import (league_members, league_settings, league_status, league_teams,
+                       matchup_schedule, mroster_payload)
+
+
+def requested_views(request: Request) -> Tuple[str, ...]:
+    """Views from ?view=a&view=b, and from the ?view=a&b form the server sends"""
+    views = request.query_params.getlist('view')
+    views += [key for key in request.query_params if key.startswith('m') and key != 'view']
+    return tuple(sorted(set(views)))
+
+
+def create_app(n_teams: int = 12, n_weeks: int = 17, current_week: int = None, bench_size: int = 7,
+               latency_ms: float = 0.0, jitter_ms: float = 0.0, history: bool = False) -> FastAPI:
+    current = current_week or n_weeks + 1
+    calls = Counter()
+    app = FastAPI(title="Mock ESPN")
+
+    @lru_cache(maxsize=1024)
+    def payload(league_id: str, year: int, views: Tuple[str, ...], week: int) -> bytes:
+        # Leagues differ from each other but every league is stable across calls
+        seed = int(league_id) % 10007 if league_id.isdigit() else 0
+        data = {
+            'id': int(league_id) if league_id.isdigit() else 0,
+            'seasonId': year,
+            'scoringPeriodId': week,
+            'status': league_status(current, final_week=n_weeks),
+            'members': league_members(n_teams)
+        }
+        teams = {team['id']: team for team in league_teams(n_teams)} if 'mTeam' in views else {
+            team_id: {'id': team_id} for team_id in range(1, n_teams + 1)
+        }
+        if 'mSettings' in views:
+            data['settings'] = league_settings()
+            data['settings']['size'] = n_teams
+        if 'mRoster' in views:
+            rosters = mroster_payload(week, n_teams=n_teams, bench_size=bench_size, history=history,
+                                      current_week=current, seed=seed)
+            for team in rosters['teams']:
+                teams[team['id']].update(team)
+        if 'mMatchup' in views:
+            data['schedule'] = matchup_schedule(n_teams, n_weeks, current_week=current, seed=seed)
+            for team_id, team in teams.items():
+                team.setdefault('name', f"Team {team_id}")
+        data['teams'] = list(teams.values())
+        return json.dumps(data).encode()
+
+    @app.get("/apis/v3/games/ffl/seasons/{year}/segments/0/leagues/{league_id}")
+    async def league(year: int, league_id: str, request: Request):
+        views = requested_views(request)
+        calls[','.join(views) or '(none)'] += 1
+        if latency_ms or jitter_ms:
+            await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+        if 'espn_s2=' not in request.headers.get('cookie', ''):
+            return Response(status_code=401, content=b'{"messages":["Not authorized"]}', media_type='application/json')
+        week = int(request.query_params.get('scoringPeriodId') or min(current, n_weeks))
+        return Response(content=payload(league_id, year, views, week), media_type='application/json')
+
+    @app.get("/_mock/stats")
+    async def stats():
+        return {'total': sum(calls.values()), 'by_view': dict(calls)}
+
+    @app.post("/_mock/reset")
+    async def reset():
+        calls.clear()
+        return {'total': 0, 'by_view': {}}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8011)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=17, help='final scoring period')
+    parser.add_argument('--current-week', type=int, help='in-progress week (default: season finished)')
+    parser.add_argument('--bench-size', type=int, default=7, help='bench and IR entries per roster')
+    parser.add_argument('--history', action='store_true', help='list every earlier week in each stat array')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='uniform +/- jitter on the latency')
+    args = parser.parse_args()
+
+    app = create_app(args.teams, args.weeks, args.current_week, args.bench_size,
+                     args.latency_ms, args.jitter_ms, args.history)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# mRoster parsing benchmark
+"""
+Throughput of turning a league-wide mRoster response into per-team
+lineup/bench records, compared with the three-scan stat lookup the
+server used before stat lines were indexed.
+
+    python benchmarks/parse_rosters.py [--teams 12] [--week 14]
+"""
+import argparse
+
+from harness import load_server, measure
+from synthetic import mroster_payload
+
+
+def legacy_parse_team_week(server, team_roster, week):
+    """parse_team_week() as it was before stat lines were indexed: up to three scans per player"""
+    lineup_players = []
+    bench_players = []
+    
+    for entry in team_roster['roster'].get('entries', []):
+        player_pool_entry = entry.get('playerPoolEntry', {})
+        player = player_pool_entry.get('player', {})
+        lineup_slot_id = entry.get('lineupSlotId', 20)
+        
+        fantasy_points = 0.0
+        projected_points = 0.0
+        stats = player.get('stats', [])
+        
+        for stat in stats:
+            if (stat.get('scoringPeriodId') == week and 
+                stat.get('statSourceId') == 0 and 
+                stat.get('statSplitTypeId') == 1):
+                fantasy_points = stat.get('appliedTotal', 0.0)
+                break
+        
+        if fantasy_points == 0.0:
+            for stat in stats:
+                if (stat.get('scoringPeriodId') == week and 
+                    stat.get('statSourceId') == 0):
+                    fantasy_points = stat.get('appliedTotal', 0.0)
+                    break
+        
+        for stat in stats:
+            if (stat.get('scoringPeriodId') == week and 
+                stat.get('statSourceId') == 1):
+                projected_points = stat.get('appliedTotal', 0.0)
+                break
+        
+        player_info = {
+            'name': player.get('fullName', 'Unknown Player'),
+            'position': server.get_position_name(player.get('defaultPositionId', 0)),
+            'points': fantasy_points,
+            'projected': projected_points,
+            'player_id': player.get('id', 0),
+            'lineup_slot': lineup_slot_id
+        }
+        
+        if lineup_slot_id in [20, 21]:
+            bench_players.append(player_info)
+        else:
+            lineup_players.append(player_info)
+    
+    team_id = str(team_roster.get('id'))
+    return {
+        'team_id': team_id,
+        'team_name': team_roster.get('name', 'Unknown Team'),
+        'owner_name': server.roster_owner_name(team_roster),
+        'lineup': lineup_players,
+        'bench': bench_players
+    }
+
+
+def legacy_period_points(stats, week):
+    """The three stat scans of legacy_parse_team_week() on their own"""
+    fantasy_points = 0.0
+    projected_points = 0.0
+    for stat in stats:
+        if stat.get('scoringPeriodId') == week and stat.get('statSourceId') == 0 and stat.get('statSplitTypeId') == 1:
+            fantasy_points = stat.get('appliedTotal', 0.0)
+            break
+    if fantasy_points == 0.0:
+        for stat in stats:
+            if stat.get('scoringPeriodId') == week and stat.get('statSourceId') == 0:
+                fantasy_points = stat.get('appliedTotal', 0.0)
+                break
+    for stat in stats:
+        if stat.get('scoringPeriodId') == week and stat.get('statSourceId') == 1:
+            projected_points = stat.get('appliedTotal', 0.0)
+            break
+    return fantasy_points, projected_points
+
+
+def legacy_split_week_rosters(server, week_data, week):
+    return {
+        str(team_roster.get('id')): legacy_parse_team_week(server, team_roster, week)
+        for team_roster in week_data.get('teams', [])
+        if 'roster' in team_roster
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--week', type=int, default=14)
+    args = parser.parse_args()
+
+    server = load_server()
+    payloads = {
+        'week only': mroster_payload(args.week, n_teams=args.teams, history=False),
+        'season history': mroster_payload(args.week, n_teams=args.teams, history=True),
+    }
+
+    print('Full split_week_rosters()')
+    print(f"{'payload':<16}{'stat lines':>11}{'before ms':>11}{'after ms':>10}{'entries/s before':>18}{'entries/s after':>17}{'speedup':>9}")
+    for label, payload in payloads.items():
+        entries = sum(len(team['roster']['entries']) for team in payload['teams'])
+        stat_lines = sum(
+            len(entry['playerPoolEntry']['player']['stats'])
+            for team in payload['teams'] for entry in team['roster']['entries']
+        )
+        parsed = server.split_week_rosters(payload, args.week)
+        assert legacy_split_week_rosters(server, payload, args.week) == {team_id: record.to_dict() for team_id, record in parsed.items()}
+
+        before = measure(lambda: legacy_split_week_rosters(server, payload, args.week), number=20, repeat=100)['best_ms']
+        after = measure(lambda: server.split_week_rosters(payload, args.week), number=20, repeat=100)['best_ms']
+        print(f"{label:<16}{stat_lines:>11}{before:>11.2f}{after:>10.2f}"
+              f"{entries / before * 1000:>18,.0f}{entries / after * 1000:>17,.0f}{before / after:>8.2f}x")
+
+    print()
+    print('Stat lookups only')
+    print(f"{'payload':<16}{'periods':>8}{'before ms':>11}{'after ms':>10}{'speedup':>9}")
+    for label, payload, periods in (
+        ('week only', payloads['week only'], [args.week]),
+        ('season history', payloads['season history'], [args.week]),
+        ('season history', payloads['season history'], list(range(1, args.week + 1))),
+    ):
+        stats = [
+            entry['playerPoolEntry']['player']['stats']
+            for team in payload['teams'] for entry in team['roster']['entries']
+        ]
+
+        def before_lookup():
+            return [[legacy_period_points(player_stats, period) for period in periods] for player_stats in stats]
+
+        def after_lookup():
+            return [[server.period_points(player_stats, period) for period in periods] for player_stats in stats]
+
+        assert before_lookup() == after_lookup()
+        before = measure(before_lookup, number=10, repeat=50)['best_ms']
+        after = measure(after_lookup, number=10, repeat=50)['best_ms']
+        print(f"{label:<16}{len(periods):>8}{before:>11.2f}{after:>10.2f}{before / after:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# Rate limiter benchmark
+"""
+Cost of one failed-authentication check while many failures are on
+record, compared with the rate_limit_check the server used before (which
+rebuilt the failure dict and prefix-scanned every key on each call).
+
+    python benchmarks/rate_limiter.py [--failures 50000]
+"""
+import argparse
+import time
+
+from harness import load_server, measure
+
+
+def legacy_rate_limit_check(failed_attempts: dict, identifier: str) -> dict:
+    current_time = time.time()
+    cleaned_attempts = {}
+    for k, v in failed_attempts.items():
+        try:
+            timestamp = float(k.split('_')[-1]) if k.split('_')[-1].isdigit() else 0
+            if current_time - timestamp < 3600:
+                cleaned_attempts[k] = v
+        except (ValueError, IndexError):
+            pass
+    recent_failures = sum(1 for k in cleaned_attempts.keys() if k.startswith(identifier))
+    assert recent_failures < 10
+    return cleaned_attempts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--failures', type=int, default=50000)
+    args = parser.parse_args()
+
+    server = load_server()
+    now = int(time.time())
+    # A credential-stuffing burst: one failure each from many identifiers
+    identifiers = [f"{index:016x}" for index in range(args.failures)]
+    legacy = {f"{identifier}_{now - index % 3000}": 1 for index, identifier in enumerate(identifiers)}
+    limiter = server.SlidingWindowLimiter(10, 3600, max(args.failures, server.RATE_LIMIT_MAX_KEYS))
+    for identifier in identifiers:
+        limiter.record(identifier)
+
+    before = measure(lambda: legacy_rate_limit_check(legacy, 'ffffffffffffffff'), repeat=5)['best_ms'] * 1000
+    after = measure(lambda: limiter.allowed('ffffffffffffffff'), repeat=7, number=10000)['best_ms'] * 1000
+    record = measure(lambda: limiter.record('ffffffffffffffff'), repeat=7, number=10000)['best_ms'] * 1000
+    print(f"{args.failures:,} recent failures on record")
+    print()
+    print(f"{'check':<28}{'us per call':>12}")
+    print(f"{'rate_limit_check (before)':<28}{before:>12.2f}")
+    print(f"{'SlidingWindowLimiter':<28}{after:>12.2f}")
+    print(f"{'  record a failure':<28}{record:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# Memory held by parsed roster records
+"""
+Memory retained by one league-season of parsed lineup/bench records, the
+unit the week result cache holds per league.
+
+    python benchmarks/record_memory.py [--teams 12] [--weeks 17]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from harness import load_server
+from synthetic import mroster_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=17)
+    args = parser.parse_args()
+
+    server = load_server()
+    # Payloads are allocated before tracing starts, so only the records count
+    payloads = {week: mroster_payload(week, n_teams=args.teams) for week in range(1, args.weeks + 1)}
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    season = {week: server.split_week_rosters(payload, week) for week, payload in payloads.items()}
+    gc.collect()
+    retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename'))
+    tracemalloc.stop()
+
+    players = sum(
+        len(record.lineup) + len(record.bench) for week_records in season.values() for record in week_records.values()
+    )
+    print(f"league-season: {args.teams} teams x {args.weeks} weeks, {players} player-weeks")
+    print(f"retained: {retained / 1024:,.1f} KiB ({retained / players:,.0f} bytes per player-week)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# Response serialization and compression
+"""
+Serialization CPU time and bytes on the wire for a full-season
+/secure-all-teams-analysis response.
+
+    python benchmarks/serialize_responses.py [--teams 12] [--weeks 17]
+
+"before" is FastAPI's default path for a returned dict (jsonable_encoder,
+then JSONResponse); "after" is FastJSONResponse returned directly. The last
+table compares the default layout with the "format": "compact" one.
+"""
+import argparse
+import gzip
+import json
+import logging
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from harness import load_server, measure
+from synthetic import league_members, league_teams, mroster_payload
+
+
+def all_teams_response(server, n_teams: int, n_weeks: int, compact: bool = False) -> dict:
+    """Same shape the all-teams endpoint returns"""
+    encoder = server.CompactRosterEncoder() if compact else None
+    teams = server.resolve_league_teams({'teams': league_teams(n_teams), 'members': league_members(n_teams)})
+    all_teams_data = {team_id: {**team_info, 'weekly_data': {}, 'weeks_processed': 0} for team_id, team_info in teams.items()}
+    for week in range(1, n_weeks + 1):
+        for team_id, team_week in server.split_week_rosters(mroster_payload(week, n_teams=n_teams), week).items():
+            if team_id in all_teams_data:
+                all_teams_data[team_id]['weekly_data'][str(week)] = (
+                    encoder.team_week(team_week) if encoder else team_week.rosters_dict()
+                )
+    for team_data in all_teams_data.values():
+        team_data['weeks_processed'] = len(team_data['weekly_data'])
+    result = {
+        'league_id': '123456',
+        'year': 2024,
+        'teams': all_teams_data,
+        'total_teams': len(all_teams_data),
+        'weeks_range': f"1-{n_weeks}",
+        'failed_weeks': [],
+        'metadata': {'upstream_calls': 1 + n_weeks}
+    }
+    if encoder:
+        result.update(encoder.tables())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=17)
+    args = parser.parse_args()
+
+    server = load_server()
+    logging.disable(logging.INFO)  # team resolution logs every lookup
+    result = all_teams_response(server, args.teams, args.weeks)
+
+    def before():
+        return JSONResponse(jsonable_encoder(result)).body
+
+    def after():
+        return server.FastJSONResponse(result).body
+
+    body = after()
+    assert json.loads(before()) == json.loads(body)
+    print(f"all-teams response: {args.teams} teams x {args.weeks} weeks, "
+          f"orjson {'on' if server.orjson is not None else 'not installed'}")
+    print()
+    print(f"{'serialization':<28}{'best ms':>9}{'median ms':>11}")
+    for label, fn in (('jsonable_encoder + json', before), ('FastJSONResponse', after)):
+        timing = measure(fn, repeat=20)
+        print(f"{label:<28}{timing['best_ms']:>9.2f}{timing['median_ms']:>11.2f}")
+
+    print()
+    print(f"{'wire encoding':<28}{'bytes':>11}{'ratio':>8}{'compress ms':>13}")
+    print(f"{'identity':<28}{len(body):>11,}{1:>8.1f}{0:>13.2f}")
+    encodings = [(f"gzip level {level}", lambda level=level: gzip.compress(body, compresslevel=level)) for level in (1, server.GZIP_LEVEL)]
+    if server.brotli is not None:
+        encodings += [
+            (f"brotli quality {quality}", lambda quality=quality: server.brotli.compress(body, quality=quality))
+            for quality in (1, server.BROTLI_QUALITY)
+        ]
+    for label, compress in encodings:
+        size = len(compress())
+        timing = measure(compress, repeat=10)
+        print(f"{label:<28}{size:>11,}{len(body) / size:>8.1f}{timing['best_ms']:>13.2f}")
+
+    print()
+    print(f"{'layout':<28}{'bytes':>11}{'gzip bytes':>12}{'parse ms':>10}")
+    for label, compact in (('json', False), ('compact', True)):
+        layout_body = server.dumps_json(all_teams_response(server, args.teams, args.weeks, compact))
+        parse = measure(lambda: json.loads(layout_body), repeat=20)['best_ms']
+        print(f"{label:<28}{len(layout_body):>11,}{len(gzip.compress(layout_body, compresslevel=server.GZIP_LEVEL)):>12,}{parse:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# Session store benchmark
+"""
+Session lookup and expiry cost with many active sessions, compared with
+the plain dict the server used before (linear scan for the league
+fallback and for expiry cleanup).
+
+    python benchmarks/session_store.py [--sessions 50000] [--leagues 5000]
+"""
+import argparse
+import time
+
+from harness import load_server, measure
+
+
+def session(league_id: str, expires_at: float) -> dict:
+    return {'credentials': b'', 'league_id': league_id, 'user_teams': [], 'expires_at': expires_at, 'created_at': 0.0}
+
+
+def legacy_find(sessions: dict, session_id: str, league_id: str):
+    if session_id in sessions:
+        return session_id, sessions[session_id]
+    for stored_session_id, session_info in sessions.items():
+        if session_info.get('league_id') == league_id:
+            return stored_session_id, session_info
+    return None
+
+
+def legacy_cleanup(sessions: dict) -> None:
+    current_time = time.time()
+    expired_sessions = [
+        session_id for session_id, data in sessions.items()
+        if current_time > data.get('expires_at', 0)
+    ]
+    for session_id in expired_sessions:
+        del sessions[session_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50000)
+    parser.add_argument('--leagues', type=int, default=5000)
+    args = parser.parse_args()
+
+    server = load_server()
+    now = time.time()
+    entries = [
+        (f"user{index:08d}_{index % args.leagues}", session(str(index % args.leagues), now + 3600 + index))
+        for index in range(args.sessions)
+    ]
+    legacy = dict(entries)
+    store = server.SessionStore()
+    for session_id, info in entries:
+        store.put(session_id, info)
+
+    # Fallback for a league whose sessions were added last: the worst case for a scan
+    league = str((args.sessions - 1) % args.leagues)
+    rows = [
+        ('own session', lambda: legacy_find(legacy, entries[0][0], '0'), lambda: store.find(entries[0][0], '0')),
+        ('league fallback', lambda: legacy_find(legacy, 'someone_else', league), lambda: store.find('someone_else', league)),
+        ('expiry check (none due)', lambda: legacy_cleanup(legacy), store.purge_expired),
+    ]
+    print(f"{args.sessions:,} sessions across {args.leagues:,} leagues")
+    print()
+    print(f"{'operation':<26}{'dict scan us':>14}{'SessionStore us':>17}")
+    for label, before, after in rows:
+        before_us = measure(before, repeat=7, number=20)['best_ms'] * 1000
+        after_us = measure(after, repeat=7, number=2000)['best_ms'] * 1000
+        print(f"{label:<26}{before_us:>14.2f}{after_us:>17.2f}")
+
+    # Let 10% of the sessions expire at once
+    start = time.perf_counter()
+    purged = store.purge_expired(now + 3600 + args.sessions // 10)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print()
+    print(f"purging {purged:,} expired sessions: {elapsed_ms:.2f} ms ({elapsed_ms * 1000 / purged:.2f} us each)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+# Hot-path microbenchmark suite
+"""
+Times the parsing and analysis hot paths of secure-espn-server.py one by one
+on synthetic leagues, writes the results to JSON and compares them with a
+stored baseline.
+
+    python benchmarks/suite.py [--teams 8,12,32] [--weeks 17,18] [--output benchmarks/results.json]
+    python benchmarks/suite.py --save-baseline   # after an intended change, on the reference machine
+
+Cases, each over a whole season:
+  roster_extraction   split_week_rosters() on every week's mRoster response
+  team_resolution     resolve_league_teams() on the mTeam response
+  matchup_building    build_matchups() for every week of an mMatchup response
+  serialize_default   dumps_json() of a full all-teams response
+  serialize_compact   the same with "format": "compact"
+
+Stat arrays list every earlier scoring period, as ESPN's season views do,
+so late weeks scan the longest arrays. Cases are sampled in interleaved
+rounds of process CPU time, each sample starting from a collected heap with
+the garbage collector paused. Right before every case sample a fixed
+reference workload (the same kind of dict and list building as the parse
+paths) is timed too, and the case is scored by the median over rounds of
+its time relative to that reference. Drift on a busy machine hits both
+halves of a pair alike and one disturbed round does not move the median.
+A case counts as a regression when its relative time is more than
+--threshold above the baseline's; the script then exits with status 1.
+Timings only compare within one machine.
+"""
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+
+from harness import load_server, measure
+from serialize_responses import all_teams_response
+from synthetic import league_members, league_teams, mmatchup_payload, mroster_payload
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, 'results.json')
+REFERENCE = 'reference'
+
+
+def reference_workload() -> int:
+    """Fixed allocation-heavy dict/str/list work used to normalize for the machine's speed"""
+    counts = {}
+    rows = []
+    for index in range(10000):
+        counts[index % 997] = counts.get(index % 997, 0) + index
+        rows.append({'name': f"Player {index}", 'points': index * 0.5, 'slots': [index % 7, index % 23]})
+    return len(counts) + sum(len(row['slots']) for row in rows)
+
+
+def season_cases(server, n_teams: int, n_weeks: int):
+    """(case name, callable) pairs for one league size"""
+    rosters = [(week, mroster_payload(week, n_teams=n_teams, history=True, current_week=n_weeks + 1))
+               for week in range(1, n_weeks + 1)]
+    league = {'teams': league_teams(n_teams), 'members': league_members(n_teams)}
+    matchups = mmatchup_payload(n_weeks, n_teams=n_teams, n_weeks=n_weeks, current_week=n_weeks + 1)
+    default_response = all_teams_response(server, n_teams, n_weeks)
+    compact_response = all_teams_response(server, n_teams, n_weeks, compact=True)
+
+    def roster_extraction():
+        for week, payload in rosters:
+            server.split_week_rosters(payload, week)
+
+    def matchup_building():
+        for week in range(1, n_weeks + 1):
+            server.build_matchups(matchups, week)
+
+    return [
+        ('roster_extraction', roster_extraction),
+        ('team_resolution', lambda: server.resolve_league_teams(league)),
+        ('matchup_building', matchup_building),
+        ('serialize_default', lambda: server.dumps_json(default_response)),
+        ('serialize_compact', lambda: server.dumps_json(compact_response)),
+    ]
+
+
+def calibrated_number(fn, min_sample_seconds: float) -> int:
+    """Calls per sample so one sample takes at least min_sample_seconds"""
+    start = time.process_time()
+    fn()
+    elapsed = time.process_time() - start
+    return max(1, math.ceil(min_sample_seconds / max(elapsed, 1e-9)))
+
+
+def sample_ms(fn, number: int) -> float:
+    """One timed sample from a freshly collected heap"""
+    gc.collect()
+    return measure(fn, repeat=1, number=number, clock=time.process_time)['best_ms']
+
+
+def run_suite(server, team_sizes, week_counts, repeat: int, min_sample_seconds: float) -> dict:
+    cases = [
+        (f"{case}/teams={n_teams}/weeks={n_weeks}", fn)
+        for n_teams in team_sizes
+        for n_weeks in week_counts
+        for case, fn in season_cases(server, n_teams, n_weeks)
+    ]
+    reference_number = calibrated_number(reference_workload, min_sample_seconds)
+    numbers = {name: calibrated_number(fn, min_sample_seconds) for name, fn in cases}
+    samples = {name: [] for name in [REFERENCE] + [name for name, _ in cases]}
+    ratios = {name: [] for name, _ in cases}
+    # Like timeit, keep collector pauses out of the samples. The payloads built
+    # above live for the whole run, so freeze them out of every collection.
+    gc.collect()
+    gc.freeze()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for name, fn in cases:
+                reference_ms = sample_ms(reference_workload, reference_number)
+                case_ms = sample_ms(fn, numbers[name])
+                samples[REFERENCE].append(reference_ms)
+                samples[name].append(case_ms)
+                ratios[name].append(case_ms / reference_ms)
+    finally:
+        gc.enable()
+        gc.unfreeze()
+    results = {
+        name: {'best_ms': round(min(values), 4), 'median_ms': round(statistics.median(values), 4)}
+        for name, values in samples.items()
+    }
+    for name, values in ratios.items():
+        results[name]['relative'] = round(statistics.median(values), 6)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print current vs baseline median times; returns the regressed case names.
+    
+    The change is that of the median time relative to the paired reference
+    samples, so a machine that is slower today does not show up as a regression.
+    """
+    regressions = []
+    print(f"{'case':<42}{'baseline ms':>13}{'current ms':>12}{'change':>9}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if name == REFERENCE:
+            if before is not None:
+                print(f"{name:<42}{before['median_ms']:>13.3f}{current['median_ms']:>12.3f}{'(speed)':>9}")
+            continue
+        if before is None or 'relative' not in before:
+            print(f"{name:<42}{'-':>13}{current['median_ms']:>12.3f}{'new':>9}")
+            continue
+        change = current['relative'] / before['relative'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<42}{before['median_ms']:>13.3f}{current['median_ms']:>12.3f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', default='8,12,32', help='comma-separated league sizes')
+    parser.add_argument('--weeks', default='17,18', help='comma-separated season lengths')
+    parser.add_argument('--repeat', type=int, default=11, help='interleaved rounds')
+    parser.add_argument('--min-sample-ms', type=float, default=50.0, help='minimum duration of one timing sample')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='where to write this run')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before a case fails')
+    parser.add_argument('--save-baseline', action='store_true', help='write this run as the new baseline')
+    args = parser.parse_args()
+
+    server = load_server()
+    logging.disable(logging.INFO)
+    team_sizes = [int(value) for value in args.teams.split(',')]
+    week_counts = [int(value) for value in args.weeks.split(',')]
+    results = run_suite(server, team_sizes, week_counts, args.repeat, args.min_sample_ms / 1000)
+    run = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_encoder': 'orjson' if server.orjson is not None else 'json',
+        'results': results
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(run, f, indent=2)
+        f.write('\n')
+    print(f"results written to {args.output}")
+
+    baseline = {'results': {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"baseline from {baseline.get('created', '?')} "
+              f"({baseline.get('python', '?')}, {baseline.get('json_encoder', '?')})")
+    elif not args.save_baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+    print()
+    regressions = compare(results, baseline['results'], args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+            f.write('\n')
+        print()
+        print(f"baseline written to {args.baseline}")
+    elif regressions:
+        print()
+        print(f"{len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# Synthetic ESPN payloads for benchmarks
+"""
+Deterministic generators for ESPN-shaped league payloads.
+
+The shapes follow what lm-api-reads returns for the views the server uses
+(mTeam, mSettings, mRoster, mMatchup), with enough variety in positions, lineup slots
+and stat lines to exercise the parsing paths.
+"""
+import random
+from typing import Dict, List
+
+# Starting lineup by ESPN lineup slot: QB, RB x2, WR x2, TE, FLEX, D/ST, K
+STARTING_SLOTS = [0, 2, 2, 4, 4, 6, 23, 16, 17]
+BENCH_SLOT = 20
+IR_SLOT = 21
+
+LINEUP_SLOT_COUNTS = {'0': 1, '2': 2, '4': 2, '6': 1, '23': 1, '16': 1, '17': 1, '20': 7, '21': 1}
+
+# defaultPositionId -> eligibleSlots as ESPN lists them
+ELIGIBLE_SLOTS = {
+    1: [0, 7, 20, 21],
+    2: [2, 3, 23, 7, 20, 21],
+    3: [4, 3, 5, 23, 7, 20, 21],
+    4: [6, 5, 23, 7, 20, 21],
+    5: [17, 20, 21],
+    16: [16, 20, 21],
+}
+SLOT_POSITIONS = {0: [1], 2: [2], 4: [3], 6: [4], 23: [2, 3, 4], 16: [16], 17: [5]}
+BENCH_POSITIONS = [1, 2, 2, 3, 3, 4, 2, 3]
+
+
+def player_stats(rng: random.Random, week: int, history: bool, bye_rate: float = 0.1) -> List[Dict]:
+    """Stat lines for one player as returned with an mRoster request for `week`.
+
+    With history, every earlier scoring period is listed too (as ESPN does
+    for some season views), which makes the stat arrays much longer. A
+    bye_rate share of player-weeks has no actual line, like byes and
+    inactive players.
+    """
+    stats = [
+        {'scoringPeriodId': 0, 'statSourceId': 0, 'statSplitTypeId': 0, 'appliedTotal': round(rng.uniform(0, 250), 2)},
+        {'scoringPeriodId': 0, 'statSourceId': 1, 'statSplitTypeId': 0, 'appliedTotal': round(rng.uniform(0, 250), 2)},
+    ]
+    periods = range(1, week + 1) if history else [week]
+    for period in periods:
+        if rng.random() >= bye_rate:
+            stats.append({'scoringPeriodId': period, 'statSourceId': 0, 'statSplitTypeId': 1, 'appliedTotal': round(rng.uniform(0, 30), 2)})
+        stats.append({'scoringPeriodId': period, 'statSourceId': 1, 'statSplitTypeId': 1, 'appliedTotal': round(rng.uniform(0, 25), 2)})
+    return stats
+
+
+def roster_entry(rng: random.Random, player_id: int, position_id: int, lineup_slot_id: int,
+                 week: int, history: bool) -> Dict:
+    return {
+        'lineupSlotId': lineup_slot_id,
+        'playerId': player_id,
+        'playerPoolEntry': {
+            'id': player_id,
+            'player': {
+                'id': player_id,
+                'fullName': f"Player {player_id}",
+                'defaultPositionId': position_id,
+                'eligibleSlots': ELIGIBLE_SLOTS[position_id],
+                'stats': player_stats(rng, week, history)
+            }
+        }
+    }
+
+
+def league_members(n_teams: int) -> List[Dict]:
+    return [{'id': f"{{MEMBER-{team_id}}}", 'displayName': f"owner{team_id}"} for team_id in range(1, n_teams + 1)]
+
+
+def league_teams(n_teams: int) -> List[Dict]:
+    """mTeam-style team list"""
+    return [
+        {
+            'id': team_id,
+            'abbrev': f"T{team_id}",
+            'location': f"City {team_id}",
+            'nickname': 'Squad',
+            'owners': [f"{{MEMBER-{team_id}}}"],
+            'record': {'overall': {'wins': team_id % 9, 'losses': 9 - team_id % 9, 'pointsFor': 1200.0 + team_id, 'pointsAgainst': 1150.0}}
+        }
+        for team_id in range(1, n_teams + 1)
+    ]
+
+
+def league_status(current_week: int, final_week: int = 17) -> Dict:
+    return {
+        'latestScoringPeriod': current_week,
+        'currentMatchupPeriod': current_week,
+        'finalScoringPeriod': final_week,
+        'isActive': current_week <= final_week
+    }
+
+
+def league_settings() -> Dict:
+    return {'name': 'Synthetic League', 'size': 12, 'rosterSettings': {'lineupSlotCounts': dict(LINEUP_SLOT_COUNTS)}}
+
+
+def mroster_payload(week: int, n_teams: int = 12, bench_size: int = 7, history: bool = False,
+                    current_week: int = None, seed: int = 0) -> Dict:
+    """A league-wide mRoster response for one scoring period.
+
+    Player ids and positions depend only on the seed, so the same players
+    show up in every week; stat values vary by week.
+    """
+    rosters = random.Random(seed)
+    rng = random.Random(seed * 1000 + week)
+    teams = []
+    player_id = 1000
+    for team_id in range(1, n_teams + 1):
+        entries = []
+        for slot in STARTING_SLOTS:
+            entries.append(roster_entry(rng, player_id, rosters.choice(SLOT_POSITIONS[slot]), slot, week, history))
+            player_id += 1
+        for index in range(bench_size):
+            slot = IR_SLOT if index == bench_size - 1 and bench_size > 6 else BENCH_SLOT
+            entries.append(roster_entry(rng, player_id, rosters.choice(BENCH_POSITIONS), slot, week, history))
+            player_id += 1
+        teams.append({
+            'id': team_id,
+            'name': f"Team {team_id}",
+            'owners': [{'displayName': f"owner{team_id}"}],
+            'roster': {'entries': entries}
+        })
+
+    current = current_week or week
+    return {
+        'id': 123456,
+        'seasonId': 2024,
+        'scoringPeriodId': current,
+        'status': league_status(current),
+        'settings': league_settings(),
+        'members': league_members(n_teams),
+        'teams': teams
+    }
+
+
+def matchup_schedule(n_teams: int = 12, n_weeks: int = 17, current_week: int = None, seed: int = 0) -> List[Dict]:
+    """mMatchup-style schedule: a round robin, scored up to the current week"""
+    rng = random.Random(seed * 1000 + 999)
+    team_ids = list(range(1, n_teams + 1))
+    if n_teams % 2:
+        team_ids.append(None)  # bye
+    current = current_week or n_weeks + 1
+    schedule = []
+    for week in range(1, n_weeks + 1):
+        half = len(team_ids) // 2
+        for home_id, away_id in zip(team_ids[:half], reversed(team_ids[half:])):
+            if home_id is None or away_id is None:
+                continue
+            scored = week < current
+            home = {'teamId': home_id, 'totalPoints': round(rng.uniform(70, 160), 2) if scored else 0}
+            away = {'teamId': away_id, 'totalPoints': round(rng.uniform(70, 160), 2) if scored else 0}
+            winner = 'UNDECIDED'
+            if scored:
+                winner = 'HOME' if home['totalPoints'] > away['totalPoints'] else 'AWAY'
+            schedule.append({'id': len(schedule) + 1, 'matchupPeriodId': week, 'home': home, 'away': away, 'winner': winner})
+        # Circle method: keep the first team fixed and rotate the rest
+        team_ids = [team_ids[0], team_ids[-1]] + team_ids[1:-1]
+    return schedule
+
+
+def mmatchup_payload(week: int, n_teams: int = 12, n_weeks: int = 17, current_week: int = None, seed: int = 0) -> Dict:
+    """A league-wide mMatchup response: the season schedule plus team names"""
+    current = current_week or week
+    return {
+        'id': 123456,
+        'seasonId': 2024,
+        'scoringPeriodId': week,
+        'status': league_status(current, final_week=n_weeks),
+        'schedule': matchup_schedule(n_teams, n_weeks, current_week=current, seed=seed),
+        'teams': [{'id': team_id, 'name': f"Team {team_id}", 'abbrev': f"T{team_id}"} for team_id in range(1, n_teams + 1)]
+    }
@@ -0,0 +1,182 @@
+# Columnar league-season store
+"""
+In-memory columnar representation of a league-season of lineup/bench
+records.
+
+Every player-week becomes one row, and each field lives in its own NumPy
+array sharing that row index (team, week, player id, lineup slot, position,
+actual and projected points, eligible slots). Weekly totals, bench points,
+per-position averages and leaderboards are then reductions over those
+arrays instead of walks over ``teams -> weeks -> lineup[]``.
+
+Input is the per-week record layout produced by the server's result cache:
+``{week: {team_id: TeamWeek}}``.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Position codes shared by the analytics. Anything unknown is treated as FLEX.
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'FLEX', 'K', 'D/ST']
+POSITION_CODES = {position: code for code, position in enumerate(POSITIONS)}
+FLEX_CODE = POSITION_CODES['FLEX']
+
+BENCH_SLOTS = (20, 21)  # bench, IR
+
+
+def position_code(position: Optional[str]) -> int:
+    return POSITION_CODES.get(position or 'FLEX', FLEX_CODE)
+
+
+def slot_mask(slots) -> int:
+    """Bitmask of ESPN lineup slot ids (all ids are below 64)"""
+    mask = 0
+    for slot in slots:
+        mask |= 1 << slot
+    return mask
+
+
+class PlayerRows:
+    """A subset of store rows (e.g. all lineup players) as parallel arrays"""
+
+    def __init__(self, store: 'LeagueSeasonStore', rows: np.ndarray):
+        self.rows = rows
+        self.group = store.group[rows]
+        self.team = store.team[rows]
+        self.week = store.week[rows]
+        self.player_id = store.player_id[rows]
+        self.lineup_slot = store.lineup_slot[rows]
+        self.position = store.position[rows]
+        self.points = store.points[rows]
+        self.projected = store.projected[rows]
+        self.eligible_mask = store.eligible_mask[rows]
+        self.names = store.names[rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class LeagueSeasonStore:
+    """One row per player-week of a league-season, stored column-wise.
+
+    Rows are ordered by week, then team, then lineup before bench, each in
+    the order ESPN listed them. Team-weeks ("groups") are numbered in the
+    same order; group_team and group_week map each group back to its team
+    index and week.
+    """
+
+    def __init__(self, team_ids: List[str], group_team: np.ndarray, group_week: np.ndarray,
+                 group: np.ndarray, player_id: np.ndarray, lineup_slot: np.ndarray, position: np.ndarray,
+                 points: np.ndarray, projected: np.ndarray, eligible_mask: np.ndarray, names: np.ndarray):
+        self.team_ids = team_ids
+        self.group_team = group_team
+        self.group_week = group_week
+        self.group = group
+        self.team = group_team[group]
+        self.week = group_week[group]
+        self.player_id = player_id
+        self.lineup_slot = lineup_slot
+        self.position = position
+        self.points = points
+        self.projected = projected
+        self.eligible_mask = eligible_mask
+        self.names = names
+
+        self.weeks = np.unique(group_week)
+        self.week_index = np.searchsorted(self.weeks, group_week)
+        self.is_bench = np.isin(lineup_slot, BENCH_SLOTS)
+        self.lineup = PlayerRows(self, np.flatnonzero(~self.is_bench))
+        self.bench = PlayerRows(self, np.flatnonzero(self.is_bench))
+
+    @classmethod
+    def from_week_records(cls, week_records: Dict[int, Dict[str, Any]], team_ids: List[str]) -> 'LeagueSeasonStore':
+        """Build the store from {week: {team_id: TeamWeek}}, keeping only the given teams"""
+        team_index = {team_id: index for index, team_id in enumerate(team_ids)}
+        group_team, group_week = [], []
+        group, player_id, lineup_slot, position, points, projected, eligible, names = [], [], [], [], [], [], [], []
+        masks = {}
+
+        for week in sorted(week_records):
+            for team_id, team_week in week_records[week].items():
+                if team_id not in team_index:
+                    continue
+                current = len(group_team)
+                group_team.append(team_index[team_id])
+                group_week.append(week)
+                for player in team_week.lineup + team_week.bench:
+                    group.append(current)
+                    player_id.append(player.player_id)
+                    lineup_slot.append(player.lineup_slot)
+                    position.append(position_code(player.position))
+                    points.append(player.points or 0.0)
+                    projected.append(player.projected or 0.0)
+                    # eligible_slots tuples are interned, so this caches per distinct list
+                    slots = player.eligible_slots
+                    if slots not in masks:
+                        masks[slots] = slot_mask(slots)
+                    eligible.append(masks[slots])
+                    names.append(player.name or 'Unknown Player')
+
+        return cls(
+            team_ids,
+            np.asarray(group_team, dtype=np.int64),
+            np.asarray(group_week, dtype=np.int64),
+            np.asarray(group, dtype=np.int64),
+            np.asarray(player_id, dtype=np.int64),
+            np.asarray(lineup_slot, dtype=np.int64),
+            np.asarray(position, dtype=np.int64),
+            np.asarray(points, dtype=np.float64),
+            np.asarray(projected, dtype=np.float64),
+            np.asarray(eligible, dtype=np.int64),
+            np.asarray(names, dtype=object),
+        )
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.team_ids)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.group_team)
+
+    def __len__(self) -> int:
+        return len(self.group)
+
+    def group_sums(self, rows: PlayerRows, values: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per team-week sum of values (points by default) over a row subset"""
+        return np.bincount(rows.group, weights=rows.points if values is None else values, minlength=self.n_groups)
+
+    def team_week_grid(self, per_group: np.ndarray, fill: float = np.nan) -> np.ndarray:
+        """Scatter per-group values into a (team, week) grid; missing team-weeks get fill"""
+        grid = np.full((self.n_teams, len(self.weeks)), fill)
+        grid[self.group_team, self.week_index] = per_group
+        return grid
+
+    def team_sums(self, per_group: np.ndarray) -> np.ndarray:
+        """Season total per team of a per-group value"""
+        return np.bincount(self.group_team, weights=per_group, minlength=self.n_teams)
+
+    def weeks_played(self) -> np.ndarray:
+        return np.bincount(self.group_team, minlength=self.n_teams)
+
+    def weekly_totals(self) -> np.ndarray:
+        """Starting lineup points per (team, week)"""
+        return self.team_week_grid(self.group_sums(self.lineup))
+
+    def bench_points(self) -> np.ndarray:
+        """Points scored on the bench (including IR) per (team, week)"""
+        return self.team_week_grid(self.group_sums(self.bench))
+
+    def position_averages(self) -> np.ndarray:
+        """Average starting-lineup points per (team, position code); NaN where a team never started one"""
+        lineup = self.lineup
+        cells = lineup.team * len(POSITIONS) + lineup.position
+        size = self.n_teams * len(POSITIONS)
+        totals = np.bincount(cells, weights=lineup.points, minlength=size)
+        counts = np.bincount(cells, minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (totals / counts).reshape(self.n_teams, len(POSITIONS))
+
+    def leaderboard(self, per_team: np.ndarray, descending: bool = True) -> np.ndarray:
+        """Team indices ordered by a per-team value; ties keep team order"""
+        return np.argsort(-per_team if descending else per_team, kind='stable')
@@ -0,0 +1,262 @@
+# Optimal-lineup solver
+"""
+Best possible starting lineup for every team-week of a league-season,
+under the league's own roster slot rules.
+
+Slot counts come from ``settings.rosterSettings.lineupSlotCounts`` in the
+mSettings view and each player's eligibility from ``eligibleSlots``. Any set
+of players that can be matched into the starting slots is independent in a
+transversal matroid, so taking players in descending points order whenever
+they still fit gives the optimal lineup.
+
+When slot eligibility is laminar (any two starting slots accept nested or
+disjoint sets of players, as with QB/RB/WR/TE under FLEX under OP) the fit
+test reduces to filling the most restrictive slots first. That runs for
+every team-week at once as a few array passes over a LeagueSeasonStore.
+Other configurations (e.g. RB/WR and WR/TE slots together) fall back to an
+exact augmenting-path matching per team-week.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from league_store import LeagueSeasonStore
+
+# ESPN lineup slot ids
+LINEUP_SLOT_NAMES = {
+    0: 'QB', 1: 'TQB', 2: 'RB', 3: 'RB/WR', 4: 'WR', 5: 'WR/TE', 6: 'TE', 7: 'OP',
+    8: 'DT', 9: 'DE', 10: 'LB', 11: 'DL', 12: 'CB', 13: 'S', 14: 'DB', 15: 'DP',
+    16: 'D/ST', 17: 'K', 18: 'P', 19: 'HC', 20: 'BE', 21: 'IR', 23: 'FLEX', 24: 'ER'
+}
+BENCH_SLOT = 20
+IR_SLOT = 21
+
+
+def starting_slot_counts(settings: Dict) -> Dict[int, int]:
+    """Starting slot id -> count from an mSettings `settings` object (bench and IR excluded)"""
+    counts = settings.get('rosterSettings', {}).get('lineupSlotCounts', {})
+    return {
+        int(slot): int(count)
+        for slot, count in counts.items()
+        if int(count) > 0 and int(slot) not in (BENCH_SLOT, IR_SLOT)
+    }
+
+
+def slot_order(slot_counts: Dict[int, int], eligible_mask: np.ndarray) -> Optional[List[int]]:
+    """Starting slots from most to least restrictive if eligibility is laminar, else None.
+
+    Players are grouped into classes by the set of starting slots they can
+    fill; each slot accepts a set of classes. The family is laminar when every
+    pair of those sets is nested or disjoint.
+    """
+    starting_mask = 0
+    for slot in slot_counts:
+        starting_mask |= 1 << slot
+    classes = np.unique(eligible_mask & starting_mask)
+
+    accepts = {}
+    for slot in slot_counts:
+        bits = 0
+        for index, mask in enumerate(classes):
+            if (int(mask) >> slot) & 1:
+                bits |= 1 << index
+        accepts[slot] = bits
+
+    slots = sorted(slot_counts, key=lambda slot: (bin(accepts[slot]).count('1'), slot))
+    for position, slot in enumerate(slots):
+        for other in slots[position + 1:]:
+            shared = accepts[slot] & accepts[other]
+            if shared and shared != accepts[slot]:
+                return None
+    return slots
+
+
+def solve_laminar(points: np.ndarray, group: np.ndarray, eligible_mask: np.ndarray,
+                  slot_counts: Dict[int, int], slots: List[int]) -> np.ndarray:
+    """Assigned starting slot per row (-1 for bench) for all team-weeks at once.
+
+    Rows must be sorted by group, then points descending; each slot in turn
+    takes its count of best still-unassigned eligible players per group.
+    """
+    assigned = np.full(len(points), -1, dtype=np.int64)
+    if not len(points):
+        return assigned
+    group_start = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    start_of_row = np.repeat(group_start, np.diff(np.r_[group_start, len(group)]))
+
+    for slot in slots:
+        eligible = ((eligible_mask >> slot) & 1).astype(bool) & (assigned < 0)
+        running = np.cumsum(eligible)
+        before_group = np.where(start_of_row > 0, running[start_of_row - 1], 0)
+        rank = running - before_group  # 1-based rank among eligible rows in the group
+        assigned[eligible & (rank <= slot_counts[slot])] = slot
+    return assigned
+
+
+def solve_matching(points: np.ndarray, group: np.ndarray, eligible_mask: np.ndarray,
+                   slot_counts: Dict[int, int]) -> np.ndarray:
+    """Exact per team-week solution by augmenting paths, for non-laminar slot rules.
+
+    Rows must be sorted by group, then points descending. Each player is
+    kept if the current starters can be rearranged to make room for them.
+    """
+    seats = [slot for slot, count in sorted(slot_counts.items()) for _ in range(count)]
+    assigned = np.full(len(points), -1, dtype=np.int64)
+    masks = [int(mask) for mask in eligible_mask]
+    boundaries = np.flatnonzero(np.r_[True, group[1:] != group[:-1], True])
+
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        seat_holder = [-1] * len(seats)
+
+        def place(row: int, visited: List[bool]) -> bool:
+            for seat, slot in enumerate(seats):
+                if visited[seat] or not (masks[row] >> slot) & 1:
+                    continue
+                visited[seat] = True
+                if seat_holder[seat] < 0 or place(seat_holder[seat], visited):
+                    seat_holder[seat] = row
+                    return True
+            return False
+
+        for row in range(start, end):
+            place(row, [False] * len(seats))
+        for seat, row in enumerate(seat_holder):
+            if row >= 0:
+                assigned[row] = seats[seat]
+    return assigned
+
+
+def solve_optimal_lineups(store: LeagueSeasonStore, slot_counts: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray, str]:
+    """Optimal starting slot per store row (-1 if benched), optimal points per team-week, and the method used.
+
+    Players in the IR slot are not considered available.
+    """
+    candidates = np.flatnonzero(store.lineup_slot != IR_SLOT)
+    order = candidates[np.lexsort((candidates, -store.points[candidates], store.group[candidates]))]
+    points = store.points[order]
+    group = store.group[order]
+    eligible_mask = store.eligible_mask[order]
+
+    slots = slot_order(slot_counts, eligible_mask)
+    if slots is not None:
+        sorted_assigned = solve_laminar(points, group, eligible_mask, slot_counts, slots)
+        method = 'laminar-greedy'
+    else:
+        sorted_assigned = solve_matching(points, group, eligible_mask, slot_counts)
+        method = 'matching'
+
+    assigned = np.full(len(store), -1, dtype=np.int64)
+    assigned[order] = sorted_assigned
+    started = assigned >= 0
+    optimal_points = np.bincount(store.group[started], weights=store.points[started], minlength=store.n_groups)
+    return assigned, optimal_points, method
+
+
+def lineup_swaps(columns: Dict[str, list], rows: range) -> List[Dict]:
+    """Bench-to-lineup moves that turn one team-week's actual lineup into the optimal one.
+
+    `columns` holds the store's names, player ids, points, lineup slots and
+    solved slots as plain lists. A player moving in replaces the benched
+    starter from the slot they take when there is one; the rest are paired
+    best in with worst out.
+    """
+    points, lineup_slot, assigned = columns['points'], columns['lineup_slot'], columns['assigned']
+    moved_in = sorted((row for row in rows if assigned[row] >= 0 and lineup_slot[row] in (BENCH_SLOT, IR_SLOT)),
+                      key=lambda row: -points[row])
+    moved_out = sorted((row for row in rows if assigned[row] < 0 and lineup_slot[row] not in (BENCH_SLOT, IR_SLOT)),
+                       key=lambda row: points[row])
+
+    pairs = []
+    for row in moved_in:
+        match = next((out for out in moved_out if lineup_slot[out] == assigned[row]), None)
+        if match is not None:
+            moved_out.remove(match)
+        pairs.append([row, match])
+    unmatched = iter(moved_out)
+    for pair in pairs:
+        if pair[1] is None:
+            pair[1] = next(unmatched, None)
+    pairs.extend([None, out] for out in unmatched)
+
+    def player(row: Optional[int], slot: int) -> Optional[Dict]:
+        if row is None:
+            return None
+        return {
+            'name': columns['names'][row],
+            'player_id': columns['player_id'][row],
+            'points': points[row],
+            'slot': LINEUP_SLOT_NAMES.get(slot, str(slot))
+        }
+
+    return [
+        {
+            # 'slot' is where the player starts in the optimal lineup / sat in the actual one
+            'start': player(start, assigned[start]) if start is not None else None,
+            'bench': player(bench, lineup_slot[bench]) if bench is not None else None,
+            'gain': round((points[start] if start is not None else 0.0) - (points[bench] if bench is not None else 0.0), 2)
+        }
+        for start, bench in pairs
+    ]
+
+
+def optimal_lineup_summary(store: LeagueSeasonStore, slot_counts: Dict[int, int], team_info: Dict[str, Dict]) -> Dict:
+    """Optimal vs actual points per team-week with the swaps, season efficiency per team, and leaderboards"""
+    assigned, optimal_points, method = solve_optimal_lineups(store, slot_counts)
+    actual_points = store.group_sums(store.lineup)
+    left_on_bench = np.maximum(optimal_points - actual_points, 0.0)
+
+    season_actual = store.team_sums(actual_points)
+    season_optimal = store.team_sums(optimal_points)
+    season_left = store.team_sums(left_on_bench)
+    efficiency = np.divide(season_actual * 100, season_optimal, out=np.zeros(store.n_teams), where=season_optimal > 0)
+
+    # Rows are stored group by group; a team-week without rows is an empty run
+    boundaries = np.r_[0, np.cumsum(np.bincount(store.group, minlength=store.n_groups))].tolist()
+    columns = {
+        'names': store.names.tolist(),
+        'player_id': store.player_id.tolist(),
+        'points': store.points.tolist(),
+        'lineup_slot': store.lineup_slot.tolist(),
+        'assigned': assigned.tolist()
+    }
+    group_team, group_week = store.group_team.tolist(), store.group_week.tolist()
+    actual_list, optimal_list, left_list = actual_points.tolist(), optimal_points.tolist(), left_on_bench.tolist()
+    teams = {
+        team_id: {
+            'points': round(float(season_actual[index]), 2),
+            'optimalPoints': round(float(season_optimal[index]), 2),
+            'pointsLeftOnBench': round(float(season_left[index]), 2),
+            'efficiency': round(float(efficiency[index]), 1),
+            'weeks': []
+        }
+        for index, team_id in enumerate(store.team_ids)
+    }
+    for group in range(store.n_groups):
+        start, end = boundaries[group], boundaries[group + 1]
+        teams[store.team_ids[group_team[group]]]['weeks'].append({
+            'week': group_week[group],
+            'points': round(actual_list[group], 2),
+            'optimalPoints': round(optimal_list[group], 2),
+            'pointsLeftOnBench': round(left_list[group], 2),
+            'swaps': lineup_swaps(columns, range(start, end)) if left_list[group] > 1e-9 else []
+        })
+
+    def leaderboard(values: np.ndarray, descending: bool) -> list:
+        return [
+            {
+                'teamId': store.team_ids[index],
+                'teamName': team_info[store.team_ids[index]].get('team_name') or f"Team {store.team_ids[index]}",
+                'value': round(float(values[index]), 1)
+            }
+            for index in store.leaderboard(values, descending)
+        ]
+
+    return {
+        'method': method,
+        'slots': {LINEUP_SLOT_NAMES.get(slot, str(slot)): count for slot, count in sorted(slot_counts.items())},
+        'teams': teams,
+        'leaderboards': {
+            'efficiency': leaderboard(efficiency, True),
+            'pointsLeftOnBench': leaderboard(season_left, False)
+        }
+    }
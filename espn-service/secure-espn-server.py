@@ -1,62 +1,297 @@
 # Secure server state
 import os
 import json
+import random
+import asyncio
 import logging
 import secrets
+import sqlite3
+import sys
+import threading
 import time
+import gzip
+import heapq
+import zlib
+from collections import OrderedDict, deque
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 # from dotenv import load_dotenv  # Commented out
-from fastapi import FastAPI, HTTPException, Depends, Security
+from fastapi import FastAPI, HTTPException, Depends, Request, Security
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import uvicorn
-import requests
+import httpx
 import jwt
 from cryptography.fernet import Fernet
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from starlette.datastructures import Headers, MutableHeaders
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # falls back to the standard json encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+from analysis_engine import analyze_league_season, league_summary
+from league_store import LeagueSeasonStore
+from lineup_solver import optimal_lineup_summary, starting_slot_counts
+
 # load_dotenv()  # Commented out
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging: per-team and per-week detail is logged at DEBUG; each HTTP request
+# gets one summary line, sampled at LOG_SAMPLE_RATE (errors are always logged).
+# LOG_FORMAT=json writes one JSON object per line.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 1.0))
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record; fields passed as extra={'fields': {...}} become top-level keys"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging():
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler])
+    # httpx logs every upstream request at INFO; the request summary counts them instead
+    if logging.getLogger().getEffectiveLevel() > logging.DEBUG:
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Security configuration
 JWT_SECRET = os.getenv('JWT_SECRET', secrets.token_urlsafe(32))
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY', Fernet.generate_key())
+
+# Where sessions and rate-limit windows live: "memory" (this process only) or
+# "sqlite" (a WAL-mode file shared by every worker on the host)
+STATE_BACKEND = os.getenv('STATE_BACKEND', 'memory').lower()
+STATE_DB_PATH = os.getenv('STATE_DB_PATH', 'espn-state.db')
+if STATE_BACKEND not in ('memory', 'sqlite'):
+    raise RuntimeError(f"Unknown STATE_BACKEND {STATE_BACKEND!r} (expected 'memory' or 'sqlite')")
+if STATE_BACKEND != 'memory' and not (os.getenv('JWT_SECRET') and os.getenv('ENCRYPTION_KEY')):
+    # Tokens and stored credentials must be readable by every worker
+    raise RuntimeError("A shared STATE_BACKEND needs JWT_SECRET and ENCRYPTION_KEY to be set")
 SESSION_TIMEOUT = 3600  # 1 hour in seconds
+# Decrypted ESPN cookies are kept in memory (never on disk) for this long per session
+CREDENTIAL_CACHE_TTL = int(os.getenv('CREDENTIAL_CACHE_TTL', 300))
+CREDENTIAL_CACHE_MAX_ENTRIES = 10000
 
-# In-memory cache for league analysis (1 hour TTL) - CLEARED FOR TESTING
-league_analysis_cache = {}
-CACHE_TTL = 3600  # 1 hour
-
-def get_cache_key(league_id: str, year: int, start_week: int, end_week: int) -> str:
-    """Generate a cache key for league analysis"""
-    return f"league_{league_id}_{year}_{start_week}_{end_week}"
-
-def get_cached_analysis(cache_key: str) -> Optional[Dict]:
-    """Get cached analysis if still valid"""
-    if cache_key in league_analysis_cache:
-        cached_data = league_analysis_cache[cache_key]
-        if time.time() - cached_data['timestamp'] < CACHE_TTL:
-            logger.info(f"Cache HIT for {cache_key}")
-            return cached_data['data']
-        else:
-            # Cache expired, remove it
-            del league_analysis_cache[cache_key]
-            logger.info(f"Cache EXPIRED for {cache_key}")
-    
-    logger.info(f"Cache MISS for {cache_key}")
-    return None
-
-def set_cached_analysis(cache_key: str, data: Dict) -> None:
-    """Cache the analysis result"""
-    league_analysis_cache[cache_key] = {
-        'data': data,
-        'timestamp': time.time()
-    }
-    logger.info(f"Cache SET for {cache_key}")
+# Rate limits: failed ESPN authentications per user, and requests per session.
+# A limit of 0 disables the check.
+AUTH_FAILURE_LIMIT = int(os.getenv('AUTH_FAILURE_LIMIT', 10))
+AUTH_FAILURE_WINDOW = int(os.getenv('AUTH_FAILURE_WINDOW', 3600))
+SESSION_RATE_LIMIT = int(os.getenv('SESSION_RATE_LIMIT', 120))
+SESSION_RATE_WINDOW = int(os.getenv('SESSION_RATE_WINDOW', 60))
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 100000))
+
+# Upstream ESPN HTTP client configuration
+# Point ESPN_API_BASE_URL at benchmarks/mock_espn.py for local load tests
+ESPN_API_BASE_URL = os.getenv('ESPN_API_BASE_URL', "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl").rstrip('/')
+ESPN_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+ESPN_MAX_CONNECTIONS = int(os.getenv('ESPN_MAX_CONNECTIONS', 20))
+ESPN_REQUEST_TIMEOUT = 15.0
+
+# Upstream governor, per ESPN host: a token bucket of ESPN_RATE_LIMIT_RPS requests
+# per second (0 disables), jittered exponential retries on 429/5xx/transport errors
+# within ESPN_RETRY_DEADLINE seconds, and a circuit breaker that opens after
+# ESPN_BREAKER_THRESHOLD consecutive failed attempts for ESPN_BREAKER_COOLDOWN seconds
+ESPN_RATE_LIMIT_RPS = float(os.getenv('ESPN_RATE_LIMIT_RPS', 20))
+ESPN_RATE_LIMIT_BURST = int(os.getenv('ESPN_RATE_LIMIT_BURST', 40))
+ESPN_RETRY_ATTEMPTS = int(os.getenv('ESPN_RETRY_ATTEMPTS', 3))
+ESPN_RETRY_BASE_DELAY = float(os.getenv('ESPN_RETRY_BASE_DELAY', 0.25))
+ESPN_RETRY_MAX_DELAY = float(os.getenv('ESPN_RETRY_MAX_DELAY', 4.0))
+ESPN_RETRY_DEADLINE = float(os.getenv('ESPN_RETRY_DEADLINE', 30.0))
+ESPN_BREAKER_THRESHOLD = int(os.getenv('ESPN_BREAKER_THRESHOLD', 5))
+ESPN_BREAKER_COOLDOWN = float(os.getenv('ESPN_BREAKER_COOLDOWN', 30.0))
+
+# Upstream response cache: finished scoring periods never expire, the current
+# week and league-level views (mTeam, mSettings) get a short TTL
+UPSTREAM_CACHE_MAX_ENTRIES = int(os.getenv('UPSTREAM_CACHE_MAX_ENTRIES', 2000))
+UPSTREAM_CACHE_MAX_BYTES = int(os.getenv('UPSTREAM_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+UPSTREAM_CACHE_TTL = int(os.getenv('UPSTREAM_CACHE_TTL', 300))
+
+# Optional on-disk store of finished-week payloads that survives restarts.
+# Disabled unless ESPN_DISK_CACHE_PATH is set.
+ESPN_DISK_CACHE_PATH = os.getenv('ESPN_DISK_CACHE_PATH', '')
+ESPN_DISK_CACHE_MAX_BYTES = int(os.getenv('ESPN_DISK_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Week fan-out: default and hard cap on concurrent scoring-period fetches per request
+WEEK_FETCH_CONCURRENCY = int(os.getenv('WEEK_FETCH_CONCURRENCY', 6))
+MAX_WEEK_FETCH_CONCURRENCY = int(os.getenv('MAX_WEEK_FETCH_CONCURRENCY', 17))
+
+# Computed per-team-per-week records: the current week is fresh for RESULT_CACHE_TTL,
+# then served stale while it revalidates for up to RESULT_CACHE_STALE_TTL
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', 60))
+RESULT_CACHE_STALE_TTL = int(os.getenv('RESULT_CACHE_STALE_TTL', 900))
+RESULT_CACHE_MAX_WEEKS = int(os.getenv('RESULT_CACHE_MAX_WEEKS', 5000))
+
+# Response compression: bodies of at least COMPRESSION_MIN_BYTES are sent with
+# brotli or gzip when the client accepts it
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 5))
+COMPRESS_IN_THREAD_BYTES = 256 * 1024  # larger bodies are compressed off the event loop
+
+def dumps_json(content: Any) -> bytes:
+    """Compact UTF-8 JSON, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for the large analysis payloads.
+    
+    Returned directly from an endpoint it skips FastAPI's jsonable_encoder
+    walk, so content must already be plain JSON types.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported content-coding in an Accept-Encoding header; brotli wins ties"""
+    offered = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        params = params.strip()
+        quality = 1.0
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[coding.strip().lower()] = quality
+    
+    best, best_quality = None, 0.0
+    for coding in (['br'] if brotli is not None else []) + ['gzip']:
+        quality = offered.get(coding, offered.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression of whole response bodies.
+    
+    Only bodies sent in one piece (regular JSON responses) are compressed.
+    Streamed NDJSON/SSE responses pass through untouched so records are not
+    held back waiting for a compressor flush.
+    """
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    def compress(self, body: bytes, coding: str) -> bytes:
+        if coding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        coding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+            
+            body = message.get('body', b'')
+            headers = MutableHeaders(raw=start_message['headers'])
+            if message.get('more_body', False) or len(body) < self.minimum_size or 'content-encoding' in headers:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            if len(body) >= COMPRESS_IN_THREAD_BYTES:
+                body = await asyncio.to_thread(self.compress, body, coding)
+            else:
+                body = self.compress(body, coding)
+            headers['Content-Encoding'] = coding
+            headers['Content-Length'] = str(len(body))
+            headers.add_vary_header('Accept-Encoding')
+            await send(start_message)
+            await send({'type': 'http.response.body', 'body': body})
+        
+        await self.app(scope, receive, send_compressed)
+
+# Counters for the current request's summary line (None outside a request)
+request_log_fields: ContextVar[Optional[Dict[str, Any]]] = ContextVar('request_log_fields', default=None)
+
+class RequestLogMiddleware:
+    """One summary line per HTTP request instead of per-team/per-week lines.
+    
+    Successful requests are logged at the given sample rate; 4xx/5xx
+    responses always are. Fields: method, path, status, duration_ms, bytes,
+    upstream_calls (ESPN requests made while serving it).
+    """
+    def __init__(self, app, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        fields = {'method': scope['method'], 'path': scope['path'], 'status': 500, 'bytes': 0, 'upstream_calls': 0}
+        token = request_log_fields.set(fields)
+        
+        async def send_counted(message):
+            if message['type'] == 'http.response.start':
+                fields['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                fields['bytes'] += len(message.get('body', b''))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            request_log_fields.reset(token)
+            if fields['status'] >= 400 or (self.sample_rate > 0 and random.random() < self.sample_rate):
+                fields['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                logger.info(
+                    "%s %s %s %.1fms %s bytes, %s ESPN requests",
+                    fields['method'], fields['path'], fields['status'],
+                    fields['duration_ms'], fields['bytes'], fields['upstream_calls'],
+                    extra={'fields': fields}
+                )
 
 app = FastAPI(title="Secure ESPN Fantasy Football Server")
 # Get allowed origins from environment or use defaults
@@ -67,32 +302,324 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True, 
     allow_methods=["GET", "POST", "OPTIONS"], 
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After"]
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_BYTES,
+    gzip_level=GZIP_LEVEL,
+    brotli_quality=BROTLI_QUALITY
 )
+app.add_middleware(RequestLogMiddleware, sample_rate=LOG_SAMPLE_RATE)
 
 security = HTTPBearer()
 cipher_suite = Fernet(ENCRYPTION_KEY)
 
+class SessionStore:
+    """Encrypted ESPN sessions keyed by session id (``<user>_<league>``).
+    
+    A league index answers "any live session for this league" without a scan,
+    and a min-heap of expiry times lets each lookup drop just the sessions
+    that have expired since the last one. Heap entries left behind by logout
+    or re-authentication are skipped when popped and compacted away once
+    they outnumber live sessions.
+    """
+    def __init__(self):
+        self._sessions: Dict[str, Dict] = {}
+        self._by_league: Dict[str, Dict[str, None]] = {}  # insertion-ordered sets of session ids
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def put(self, session_id: str, session: Dict) -> None:
+        self.purge_expired()
+        if session_id in self._sessions:
+            self._remove(session_id)
+        self._sessions[session_id] = session
+        self._by_league.setdefault(str(session['league_id']), {})[session_id] = None
+        heapq.heappush(self._expiry_heap, (session['expires_at'], session_id))
+        if len(self._expiry_heap) > 2 * len(self._sessions) + 64:
+            self._expiry_heap = [(stored['expires_at'], stored_id) for stored_id, stored in self._sessions.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Live session by id, or None"""
+        self.purge_expired()
+        return self._sessions.get(session_id)
+    
+    def find(self, session_id: str, league_id: Any) -> Optional[Tuple[str, Dict]]:
+        """(session id, session) for session_id, else for the oldest live session in the same league"""
+        self.purge_expired()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            return session_id, session
+        for fallback_id in self._by_league.get(str(league_id), ()):
+            return fallback_id, self._sessions[fallback_id]
+        return None
+    
+    def remove(self, session_id: str) -> bool:
+        if session_id not in self._sessions:
+            return False
+        self._remove(session_id)
+        return True
+    
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Drop sessions whose expiry has passed; O(log n) per expired session"""
+        now = time.time() if now is None else now
+        purged = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, session_id = heapq.heappop(heap)
+            session = self._sessions.get(session_id)
+            if session is None or session['expires_at'] != expires_at:
+                continue  # logged out or re-authenticated since this entry was pushed
+            self._remove(session_id)
+            purged += 1
+            logger.debug("Cleaned up expired session: %s...", session_id[:8])
+        self.expirations += purged
+        return purged
+    
+    def session_ids(self) -> List[str]:
+        return list(self._sessions)
+    
+    def clear(self) -> None:
+        self._sessions.clear()
+        self._by_league.clear()
+        self._expiry_heap.clear()
+    
+    def _remove(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        league_sessions = self._by_league.get(str(session['league_id']))
+        if league_sessions is not None:
+            league_sessions.pop(session_id, None)
+            if not league_sessions:
+                del self._by_league[str(session['league_id'])]
+    
+    def close(self) -> None:
+        self.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': 'memory',
+            'active': len(self._sessions),
+            'leagues': len(self._by_league),
+            'expirations': self.expirations
+        }
+
+class SharedStateDB:
+    """SQLite file in WAL mode holding state that every worker process must see.
+    
+    Each thread gets its own connection; statements are short point reads
+    and writes on indexed columns.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self.connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                league_id TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_league ON sessions (league_id, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expiry ON sessions (expires_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_events (
+                limiter TEXT NOT NULL,
+                key TEXT NOT NULL,
+                ts REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_events_key ON rate_events (limiter, key, ts)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_events_ts ON rate_events (limiter, ts)")
+    
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+class SqliteSessionStore:
+    """SessionStore interface over a SharedStateDB, so a token issued by one worker works on all of them.
+    
+    Lookups ignore expired rows; the rows themselves are deleted through the
+    expiry index at most once per purge_interval seconds per process.
+    """
+    def __init__(self, db: SharedStateDB, purge_interval: float = 60.0):
+        self.db = db
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return self.db.connect().execute("SELECT COUNT(*) FROM sessions WHERE expires_at >= ?", (time.time(),)).fetchone()[0]
+    
+    def put(self, session_id: str, session: Dict) -> None:
+        if time.time() >= self._next_purge:
+            self.purge_expired()
+        self.db.connect().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, league_id, created_at, expires_at, data) VALUES (?, ?, ?, ?, ?)",
+            (session_id, str(session['league_id']), session.get('created_at', time.time()), session['expires_at'], json.dumps(session))
+        )
+    
+    def get(self, session_id: str) -> Optional[Dict]:
+        row = self.db.connect().execute(
+            "SELECT data FROM sessions WHERE session_id = ? AND expires_at >= ?", (session_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def find(self, session_id: str, league_id: Any) -> Optional[Tuple[str, Dict]]:
+        session = self.get(session_id)
+        if session is not None:
+            return session_id, session
+        row = self.db.connect().execute(
+            "SELECT session_id, data FROM sessions WHERE league_id = ? AND expires_at >= ? ORDER BY created_at LIMIT 1",
+            (str(league_id), time.time())
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+    
+    def remove(self, session_id: str) -> bool:
+        return self.db.connect().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+    
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        self._next_purge = now + self.purge_interval
+        purged = self.db.connect().execute("DELETE FROM sessions WHERE expires_at < ?", (now,)).rowcount
+        self.expirations += purged
+        return purged
+    
+    def session_ids(self) -> List[str]:
+        rows = self.db.connect().execute("SELECT session_id FROM sessions WHERE expires_at >= ?", (time.time(),))
+        return [row[0] for row in rows]
+    
+    def clear(self) -> None:
+        self.db.connect().execute("DELETE FROM sessions")
+    
+    def close(self) -> None:
+        # Other workers still serve these sessions; only drop this process's connection
+        self.db.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        active, leagues = self.db.connect().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT league_id) FROM sessions WHERE expires_at >= ?", (time.time(),)
+        ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'active': active,
+            'leagues': leagues,
+            'expirations': self.expirations
+        }
+
+state_db: Optional[SharedStateDB] = SharedStateDB(STATE_DB_PATH) if STATE_BACKEND == 'sqlite' else None
+
+def create_session_store():
+    return SqliteSessionStore(state_db) if state_db is not None else SessionStore()
+
+async def state_call(fn, *args):
+    """Call a session store or rate limiter method, in a worker thread when it goes to the shared SQLite file"""
+    if state_db is None:
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+class CredentialCache:
+    """Short-lived, memory-only cache of decrypted ESPN cookie headers per session.
+    
+    An entry is tied to the session's creation time, so a re-authenticated
+    session never gets the previous cookies, and never outlives the session.
+    A TTL of 0 disables caching.
+    """
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()  # session id -> (created_at, header, expires_at)
+        self.hits = 0
+        self.misses = 0
+    
+    def cookie_header(self, session_id: str, session: Dict) -> str:
+        now = time.time()
+        entry = self._entries.get(session_id)
+        if entry is not None and entry[0] == session.get('created_at') and now < entry[2]:
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        credentials = SecurityManager.decrypt_credentials(session['credentials'])
+        header = f"espn_s2={credentials['espn_s2']}; SWID={credentials['swid']}"
+        if self.ttl > 0:
+            self._entries[session_id] = (session.get('created_at'), header, min(now + self.ttl, session['expires_at']))
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return header
+    
+    def discard(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+credential_cache = CredentialCache(CREDENTIAL_CACHE_TTL, CREDENTIAL_CACHE_MAX_ENTRIES)
+
 # Secure server state
 class SecureServerState:
     def __init__(self):
-        self.encrypted_sessions: Dict[str, Dict] = {}
+        self.sessions = create_session_store()
         self.request_count = 0
         self.start_time = datetime.now()
-        self.failed_attempts: Dict[str, int] = {}
-    
-    def cleanup_expired_sessions(self):
-        """Remove expired sessions"""
-        current_time = time.time()
-        expired_sessions = [
-            session_id for session_id, data in self.encrypted_sessions.items()
-            if current_time > data.get('expires_at', 0)
-        ]
-        for session_id in expired_sessions:
-            del self.encrypted_sessions[session_id]
-            logger.info(f"Cleaned up expired session: {session_id[:8]}...")
 
 server_state = SecureServerState()
+
+# Shared pooled client for ESPN - created on startup, closed on shutdown
+espn_http_client: Optional[httpx.AsyncClient] = None
+
+def create_espn_client() -> httpx.AsyncClient:
+    """Create the keep-alive pooled HTTP client used for all ESPN calls"""
+    # Credentials are sent per request in the Cookie header. Never let the shared
+    # client persist Set-Cookie responses, or one user's cookies would leak to others.
+    no_cookie_jar = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(
+        headers={'User-Agent': ESPN_USER_AGENT},
+        cookies=httpx.Cookies(no_cookie_jar),
+        timeout=httpx.Timeout(ESPN_REQUEST_TIMEOUT, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=ESPN_MAX_CONNECTIONS,
+            max_keepalive_connections=ESPN_MAX_CONNECTIONS,
+            keepalive_expiry=30.0
+        )
+    )
+
+def get_espn_client() -> httpx.AsyncClient:
+    """Get the shared ESPN client, creating it if startup has not run yet"""
+    global espn_http_client
+    if espn_http_client is None or espn_http_client.is_closed:
+        espn_http_client = create_espn_client()
+    return espn_http_client
+
 class SecurityManager:
     @staticmethod
     def encrypt_credentials(credentials: Dict[str, str]) -> str:
@@ -102,7 +629,7 @@ class SecurityManager:
             encrypted = cipher_suite.encrypt(credentials_json.encode())
             return encrypted.decode()
         except Exception as e:
-            logger.error(f"Encryption failed: {str(e)}")
+            logger.error("Encryption failed: %s", e)
             raise HTTPException(status_code=500, detail="Security error")
     
     @staticmethod
@@ -112,7 +639,7 @@ class SecurityManager:
             decrypted = cipher_suite.decrypt(encrypted_data.encode())
             return json.loads(decrypted.decode())
         except Exception as e:
-            logger.error(f"Decryption failed: {str(e)}")
+            logger.error("Decryption failed: %s", e)
             raise HTTPException(status_code=401, detail="Invalid session")
     
     @staticmethod
@@ -129,34 +656,28 @@ class SecurityManager:
     @staticmethod
     def validate_session_token(token: str) -> Dict[str, Any]:
         """Validate JWT session token"""
-        logger.info(f"Validating JWT token: {token[:30]}...")
-        
         try:
             # Decode the JWT token
-            logger.info("Attempting to decode JWT...")
             payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            logger.info(f"JWT decoded successfully: {payload}")
             
             # Check expiration
             current_time = time.time()
             expires_at = payload.get('expires_at', 0)
-            logger.info(f"Current time: {current_time}, Expires at: {expires_at}")
             
             if current_time > expires_at:
-                logger.error(f"Token expired: {current_time} > {expires_at}")
+                logger.error("Token expired: %s > %s", current_time, expires_at)
                 raise HTTPException(status_code=401, detail="Session expired")
             
-            logger.info("Token validation successful")
             return payload
             
         except jwt.ExpiredSignatureError:
             logger.error("JWT signature expired")
             raise HTTPException(status_code=401, detail="Session expired")
         except jwt.InvalidTokenError as e:
-            logger.error(f"JWT invalid: {str(e)}")
+            logger.error("JWT invalid: %s", e)
             raise HTTPException(status_code=401, detail="Invalid session token")
         except Exception as e:
-            logger.error(f"Unexpected JWT error: {type(e).__name__}: {str(e)}")
+            logger.error("Unexpected JWT error: %s: %s", type(e).__name__, e)
             raise HTTPException(status_code=401, detail="Token validation failed")
 
 def validate_inputs(league_id: str, year: int = None):
@@ -171,96 +692,1107 @@ def validate_inputs(league_id: str, year: int = None):
     return league_id, year
 
 def get_position_name(position_id: int) -> str:
-    """Convert ESPN position ID to readable position name"""
+    """Convert ESPN defaultPositionId to readable position name.
+
+    Position ids are not lineup slot ids (slot 17 is K, position 17 does not
+    exist); slot names live in lineup_solver.LINEUP_SLOT_NAMES.
+    """
     position_map = {
-        0: 'QB',   # Quarterback
         1: 'QB',   # Quarterback
         2: 'RB',   # Running Back
         3: 'WR',   # Wide Receiver
         4: 'TE',   # Tight End
         5: 'K',    # Kicker
-        16: 'D/ST', # Defense/Special Teams
-        17: 'FLEX', # Flex
-        20: 'BENCH', # Bench
-        21: 'IR'    # Injured Reserve
+        16: 'D/ST' # Defense/Special Teams
     }
     return position_map.get(position_id, 'FLEX')
 
-def rate_limit_check(identifier: str) -> bool:
-    """Basic rate limiting"""
-    current_time = time.time()
+class SharedFetchAuthError(Exception):
+    """A coalesced fetch was rejected by ESPN with another caller's credentials"""
+
+class UpstreamSingleFlight:
+    """Coalesce concurrent identical ESPN fetches into a single in-flight request.
     
-    # Clean old attempts (older than 1 hour)
-    cleaned_attempts = {}
-    for k, v in server_state.failed_attempts.items():
+    The first caller for a key starts the fetch; callers arriving while it is
+    running await the same task and receive the same (read-only) result.
+    """
+    def __init__(self):
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+    
+    async def run(self, key: Tuple, fetch) -> Dict:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            # Shield so a disconnecting leader does not cancel the followers' fetch
+            return await asyncio.shield(task)
+        
+        self.coalesced_calls += 1
         try:
-            timestamp = float(k.split('_')[-1]) if k.split('_')[-1].isdigit() else 0
-            if current_time - timestamp < 3600:  # Keep if less than 1 hour old
-                cleaned_attempts[k] = v
-        except (ValueError, IndexError):
-            pass  # Skip malformed keys
+            return await asyncio.shield(task)
+        except HTTPException as e:
+            if e.status_code == 401:
+                raise SharedFetchAuthError() from e
+            raise
     
-    server_state.failed_attempts = cleaned_attempts
+    def _forget(self, key: Tuple, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
     
-    # Check recent failures
-    recent_failures = sum(1 for k in server_state.failed_attempts.keys() if k.startswith(identifier))
-    if recent_failures >= 10:  # Max 10 failures per hour
-        raise HTTPException(status_code=429, detail="Too many failed attempts")
+    def stats(self) -> Dict[str, int]:
+        return {
+            'upstream_calls': self.upstream_calls,
+            'coalesced_calls': self.coalesced_calls,
+            'in_flight': len(self._in_flight)
+        }
+
+upstream_single_flight = UpstreamSingleFlight()
+
+class TokenBucket:
+    """Request pacing for one upstream host, with multiplicative backoff on throttling.
     
-    return True
-def make_espn_request(session_token: str, league_id: str, year: int, view: str = "", scoring_period: int = None) -> Dict:
-    """Make secure ESPN API request"""
-    logger.info("=== ESPN REQUEST DEBUG ===")
-    
-    # Validate session and get credentials
-    session_data = SecurityManager.validate_session_token(session_token)
-    logger.info(f"Session data: {session_data}")
-    
-    # Simplified session lookup - use the expected session ID format
-    expected_session_id = f"{session_data['user_id']}_{session_data['league_id']}"
-    logger.info(f"Looking for session ID: {expected_session_id}")
-    logger.info(f"Available sessions: {list(server_state.encrypted_sessions.keys())}")
-    
-    if expected_session_id not in server_state.encrypted_sessions:
-        logger.error(f"Session not found: {expected_session_id}")
-        
-        # Clean up expired sessions first
-        server_state.cleanup_expired_sessions()
-        
-        # Try again after cleanup
-        if expected_session_id not in server_state.encrypted_sessions:
-            # Fallback: try to find any session for this league
-            session_found = None
-            for stored_session_id, session_info in server_state.encrypted_sessions.items():
-                if session_info.get('league_id') == session_data['league_id']:
-                    session_found = stored_session_id
-                    logger.info(f"Found fallback session: {session_found}")
+    Callers reserve a token and sleep until it is due, so concurrent callers
+    queue in arrival order without a lock. A 429 halves the rate (down to
+    1/16 of the configured rate) and pauses the host for its Retry-After;
+    each success then restores 1/20 of the configured rate.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+    
+    def reserve(self, now: float) -> float:
+        """Take a token; returns the seconds to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(-self.tokens / self.rate if self.tokens < 0 else 0.0, self.paused_until - now)
+    
+    def cancel(self) -> None:
+        """Return a reserved token that will not be used"""
+        self.tokens += 1
+    
+    def throttled(self, now: float, retry_after: float) -> None:
+        if self.configured_rate <= 0:
+            return
+        self.rate = max(self.configured_rate / 16, self.rate / 2)
+        self.paused_until = max(self.paused_until, now + retry_after)
+    
+    def succeeded(self) -> None:
+        if self.rate < self.configured_rate:
+            self.rate = min(self.configured_rate, self.rate + self.configured_rate / 20)
+
+class CircuitBreaker:
+    """Fail fast while an upstream host keeps failing.
+    
+    Opens after `threshold` consecutive failed attempts. After `cooldown`
+    seconds one probe request is let through (half-open): success closes the
+    breaker, failure opens it for another cooldown.
+    """
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.opens = 0
+        self.rejections = 0
+    
+    def allow(self, now: float) -> bool:
+        if self.threshold <= 0 or self.state == 'closed':
+            return True
+        if self.state == 'open' and now - self.opened_at >= self.cooldown:
+            self.state = 'half_open'
+        if self.state == 'half_open' and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.rejections += 1
+        return False
+    
+    def retry_after(self, now: float) -> int:
+        return max(1, int(self.opened_at + self.cooldown - now) + 1)
+    
+    def record_success(self) -> None:
+        self.state = 'closed'
+        self.failures = 0
+        self.probe_in_flight = False
+    
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.state == 'half_open' or (self.threshold > 0 and self.failures >= self.threshold):
+            if self.state != 'open':
+                self.opens += 1
+            self.state = 'open'
+            self.opened_at = now
+        self.probe_in_flight = False
+
+class UpstreamGovernor:
+    """Per-host token bucket and circuit breaker shared by every ESPN call"""
+    def __init__(self, rate: float, burst: int, breaker_threshold: int, breaker_cooldown: float):
+        self.rate = rate
+        self.burst = burst
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._hosts: Dict[str, Tuple[TokenBucket, CircuitBreaker]] = {}
+        self.requests = 0
+        self.retries = 0
+        self.throttled_responses = 0
+        self.wait_seconds = 0.0
+        self.deadline_exceeded = 0
+    
+    def host(self, host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+        state = self._hosts.get(host)
+        if state is None:
+            state = (TokenBucket(self.rate, self.burst), CircuitBreaker(self.breaker_threshold, self.breaker_cooldown))
+            self._hosts[host] = state
+        return state
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'throttled_responses': self.throttled_responses,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'deadline_exceeded': self.deadline_exceeded,
+            'hosts': {
+                host: {
+                    'rate': round(bucket.rate, 3),
+                    'configured_rate': bucket.configured_rate,
+                    'tokens': round(bucket.tokens, 2),
+                    'breaker': breaker.state,
+                    'consecutive_failures': breaker.failures,
+                    'breaker_opens': breaker.opens,
+                    'breaker_rejections': breaker.rejections
+                }
+                for host, (bucket, breaker) in self._hosts.items()
+            }
+        }
+
+espn_governor = UpstreamGovernor(ESPN_RATE_LIMIT_RPS, ESPN_RATE_LIMIT_BURST, ESPN_BREAKER_THRESHOLD, ESPN_BREAKER_COOLDOWN)
+
+class UpstreamResponseCache:
+    """Size-bounded LRU cache of parsed ESPN responses.
+    
+    Keys are (league_id, year, view, scoring_period). Entries stored with
+    ttl=None never expire (finished weeks); eviction is least-recently-used
+    by entry count and by approximate byte size of the raw response.
+    """
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Tuple) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if entry['expires_at'] is not None and time.time() > entry['expires_at']:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry['data']
+    
+    def peek(self, key: Tuple) -> Optional[Dict]:
+        """Fresh cached data without touching statistics or LRU order"""
+        entry = self._entries.get(key)
+        if entry is None or (entry['expires_at'] is not None and time.time() > entry['expires_at']):
+            return None
+        return entry['data']
+    
+    def put(self, key: Tuple, data: Dict, size_bytes: int, ttl: Optional[int]) -> None:
+        if size_bytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = {
+            'data': data,
+            'size': size_bytes,
+            'expires_at': time.time() + ttl if ttl is not None else None
+        }
+        self.total_bytes += size_bytes
+        
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+    
+    def discard(self, key: Tuple) -> None:
+        if key in self._entries:
+            self._remove(key)
+    
+    def _remove(self, key: Tuple) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry['size']
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+upstream_cache = UpstreamResponseCache(UPSTREAM_CACHE_MAX_ENTRIES, UPSTREAM_CACHE_MAX_BYTES)
+
+class DataVersionRegistry:
+    """Monotonic content version per upstream resource, keyed like the response cache.
+    
+    Every fetched ESPN payload is hashed; the version only moves when the
+    content differs from the last one seen, so refetching an unchanged week
+    keeps its version. Versions come from one counter and are never reused.
+    Forgetting a key (LRU beyond max_entries) is safe: it just gets a new version.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._versions: "OrderedDict[Tuple, Tuple[int, bytes]]" = OrderedDict()
+        self._counter = 0
+        self.changes = 0
+    
+    def observe(self, key: Tuple, content: bytes) -> int:
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        current = self._versions.get(key)
+        if current is not None and current[1] == digest:
+            self._versions.move_to_end(key)
+            return current[0]
+        
+        if current is not None:
+            self.changes += 1
+        self._counter += 1
+        self._versions[key] = (self._counter, digest)
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.max_entries:
+            self._versions.popitem(last=False)
+        return self._counter
+    
+    def get(self, key: Tuple) -> Optional[int]:
+        current = self._versions.get(key)
+        return current[0] if current is not None else None
+    
+    @property
+    def latest(self) -> int:
+        return self._counter
+    
+    def stats(self) -> Dict[str, int]:
+        return {'resources': len(self._versions), 'latest_version': self._counter, 'changes': self.changes}
+
+# Versions restart with the process, so ETags and client data versions carry a
+# per-process epoch. Room for every cached response plus a version per team-week.
+DATA_VERSION_EPOCH = secrets.token_hex(4)
+data_versions = DataVersionRegistry(UPSTREAM_CACHE_MAX_ENTRIES + 16 * RESULT_CACHE_MAX_WEEKS)
+
+class PersistentWeekStore:
+    """SQLite store of finished-week ESPN payloads keyed by league, year, view and period.
+    
+    Runs in WAL mode so any number of readers (threads or worker processes)
+    can read while one writer appends. Payloads are stored zlib-compressed and
+    evicted least-recently-accessed first once the size budget is exceeded.
+    """
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS week_payloads (
+                league_id TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                view TEXT NOT NULL,
+                scoring_period INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (league_id, year, view, scoring_period)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_week_payloads_access ON week_payloads (last_access)")
+        self._approx_bytes = self.total_bytes()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, key: Tuple) -> Optional[Tuple[Dict, bytes]]:
+        league_id, year, view, scoring_period = key
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT payload FROM week_payloads WHERE league_id = ? AND year = ? AND view = ? AND scoring_period = ?",
+            (league_id, year, view, scoring_period)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        
+        conn.execute(
+            "UPDATE week_payloads SET last_access = ? WHERE league_id = ? AND year = ? AND view = ? AND scoring_period = ?",
+            (time.time(), league_id, year, view, scoring_period)
+        )
+        self.hits += 1
+        content = zlib.decompress(row[0])
+        return json.loads(content), content
+    
+    def put(self, key: Tuple, content: bytes) -> None:
+        league_id, year, view, scoring_period = key
+        payload = zlib.compress(content)
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO week_payloads VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (league_id, year, view, scoring_period, payload, len(payload), now, now)
+        )
+        self.writes += 1
+        self._approx_bytes += len(payload)
+        if self._approx_bytes > self.max_bytes:
+            self.evict(int(self.max_bytes * 0.9))
+    
+    def total_bytes(self) -> int:
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM week_payloads").fetchone()[0]
+    
+    def evict(self, target_bytes: int) -> int:
+        """Drop least-recently-accessed payloads until the store fits in target_bytes"""
+        conn = self._connect()
+        total = self.total_bytes()
+        removed = 0
+        if total > target_bytes:
+            rows = conn.execute(
+                "SELECT rowid, size FROM week_payloads ORDER BY last_access ASC"
+            ).fetchall()
+            doomed = []
+            for rowid, size in rows:
+                if total <= target_bytes:
                     break
-            
-            if not session_found:
-                raise HTTPException(status_code=401, detail="Session not found - please re-authenticate")
-            expected_session_id = session_found
-    
-    # Get session data
-    session_info = server_state.encrypted_sessions[expected_session_id]
-    
-    # Check session expiration
-    if time.time() > session_info.get('expires_at', 0):
-        del server_state.encrypted_sessions[expected_session_id]
-        raise HTTPException(status_code=401, detail="Session expired - please re-authenticate")
-    
-    # Decrypt credentials
-    encrypted_creds = session_info['credentials']
-    credentials = SecurityManager.decrypt_credentials(encrypted_creds)
-    logger.info("Successfully retrieved and decrypted credentials")
-    
-    # Make ESPN request
-    headers = {
-        'Cookie': f"espn_s2={credentials['espn_s2']}; SWID={credentials['swid']}",
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+                doomed.append((rowid,))
+                total -= size
+            conn.executemany("DELETE FROM week_payloads WHERE rowid = ?", doomed)
+            removed = len(doomed)
+        self._approx_bytes = total
+        return removed
+    
+    def compact(self, target_bytes: Optional[int] = None) -> Dict[str, int]:
+        """Evict down to the budget, then reclaim file space"""
+        removed = self.evict(self.max_bytes if target_bytes is None else target_bytes)
+        conn = self._connect()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        return {'removed_entries': removed, 'bytes': self.total_bytes()}
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': True,
+            'path': self.path,
+            'bytes': self._approx_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes
+        }
+
+week_store: Optional[PersistentWeekStore] = (
+    PersistentWeekStore(ESPN_DISK_CACHE_PATH, ESPN_DISK_CACHE_MAX_BYTES) if ESPN_DISK_CACHE_PATH else None
+)
+
+def is_scoring_period_final(data: Dict, scoring_period: Optional[int]) -> bool:
+    """Whether ESPN reports this scoring period as finished (its data can no longer change)"""
+    if not scoring_period:
+        return False
+    
+    status = data.get('status') or {}
+    current_period = status.get('latestScoringPeriod') or data.get('scoringPeriodId')
+    if not current_period:
+        return False
+    if scoring_period < current_period:
+        return True
+    
+    # After the season ends the last period is final too
+    final_period = status.get('finalScoringPeriod')
+    return bool(final_period) and scoring_period <= final_period and status.get('isActive') is False
+
+def roster_owner_name(team: Dict) -> str:
+    """Owner display name as embedded in a roster view team, if present"""
+    owners = team.get('owners') or [{}]
+    owner = owners[0]
+    if isinstance(owner, dict):
+        return owner.get('displayName', 'Unknown Owner')
+    return 'Unknown Owner'
+
+def period_points(stats: List[Dict], period: int) -> Tuple[float, float]:
+    """Actual and projected fantasy points for one scoring period, in a single pass over stats.
+    
+    The single-period actual (statSourceId=0, statSplitTypeId=1) is the most
+    accurate; if it is missing or zero, the first actual line listed for the
+    period is used. Projections are the first statSourceId=1 line. Scanning
+    stops as soon as both the single-period actual and a projection are found.
+    """
+    split_actual = first_actual = projected = None
+    for stat in stats:
+        if stat.get('scoringPeriodId') != period:
+            continue
+        source = stat.get('statSourceId')
+        if source == 0:
+            if first_actual is None:
+                first_actual = stat.get('appliedTotal', 0.0)
+            if split_actual is None and stat.get('statSplitTypeId') == 1:
+                split_actual = stat.get('appliedTotal', 0.0)
+                if projected is not None:
+                    break
+        elif source == 1 and projected is None:
+            projected = stat.get('appliedTotal', 0.0)
+            if split_actual is not None:
+                break
+    return split_actual or first_actual or 0.0, projected or 0.0
+
+def extract_roster_entry(entry: Dict, week: int) -> Tuple[Dict, int, float, float]:
+    """Player, lineup slot, and actual and projected points for a scoring period from an mRoster entry"""
+    player = entry.get('playerPoolEntry', {}).get('player', {})
+    fantasy_points, projected_points = period_points(player.get('stats', []), week)
+    return player, entry.get('lineupSlotId', 20), fantasy_points, projected_points  # slot 20 = bench
+
+# Players share a handful of distinct eligibleSlots lists; keep one tuple per distinct list
+eligible_slot_tuples: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+def intern_eligible_slots(slots: List[int]) -> Tuple[int, ...]:
+    key = tuple(slots)
+    return eligible_slot_tuples.setdefault(key, key)
+
+class PlayerWeek:
+    """One player's line for a scoring period"""
+    __slots__ = ('name', 'position', 'points', 'projected', 'player_id', 'lineup_slot', 'eligible_slots')
+    
+    def __init__(self, name: str, position: str, points: float, projected: float,
+                 player_id: int, lineup_slot: int, eligible_slots: Tuple[int, ...] = ()):
+        self.name = name
+        self.position = position
+        self.points = points
+        self.projected = projected
+        self.player_id = player_id
+        self.lineup_slot = lineup_slot
+        self.eligible_slots = eligible_slots  # internal, not part of the API response
+    
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'position': self.position,
+            'points': self.points,
+            'projected': self.projected,
+            'player_id': self.player_id,
+            'lineup_slot': self.lineup_slot
+        }
+
+class TeamWeek:
+    """One team's lineup and bench for a scoring period"""
+    __slots__ = ('team_id', 'team_name', 'owner_name', 'lineup', 'bench')
+    
+    def __init__(self, team_id: str, team_name: str, owner_name: str,
+                 lineup: List[PlayerWeek], bench: List[PlayerWeek]):
+        self.team_id = team_id
+        self.team_name = team_name
+        self.owner_name = owner_name
+        self.lineup = lineup
+        self.bench = bench
+    
+    def rosters_dict(self) -> Dict[str, List[Dict]]:
+        return {
+            'lineup': [player.to_dict() for player in self.lineup],
+            'bench': [player.to_dict() for player in self.bench]
+        }
+    
+    def to_dict(self) -> Dict:
+        return {
+            'team_id': self.team_id,
+            'team_name': self.team_name,
+            'owner_name': self.owner_name,
+            **self.rosters_dict()
+        }
+
+# Compact wire format (request "format": "compact"). Players and teams are sent
+# once in player_table ([player_id, name, position]) and team_table ([team_id,
+# team_name, owner_name]); each team-week becomes [team_ref, lineup, bench] with
+# lineup/bench flattened into groups of COMPACT_PLAYER_FIELDS.
+COMPACT_ENCODING = 'compact-v1'
+COMPACT_PLAYER_FIELDS = ['player', 'points', 'projected', 'lineup_slot']
+
+class CompactRosterEncoder:
+    """Dictionary-encodes the TeamWeek records of one response"""
+    
+    def __init__(self):
+        self.player_refs: Dict[Tuple, int] = {}
+        self.team_refs: Dict[Tuple, int] = {}
+    
+    def player_rows(self, players: List[PlayerWeek]) -> List:
+        refs = self.player_refs
+        rows = []
+        for player in players:
+            key = (player.player_id, player.name, player.position)
+            ref = refs.get(key)
+            if ref is None:
+                ref = refs[key] = len(refs)
+            rows += (ref, player.points, player.projected, player.lineup_slot)
+        return rows
+    
+    def team_week(self, team_week: TeamWeek) -> List:
+        key = (team_week.team_id, team_week.team_name, team_week.owner_name)
+        ref = self.team_refs.get(key)
+        if ref is None:
+            ref = self.team_refs[key] = len(self.team_refs)
+        return [ref, self.player_rows(team_week.lineup), self.player_rows(team_week.bench)]
+    
+    def tables(self) -> Dict:
+        return {
+            'encoding': COMPACT_ENCODING,
+            'player_fields': COMPACT_PLAYER_FIELDS,
+            'player_table': [list(key) for key in self.player_refs],
+            'team_table': [list(key) for key in self.team_refs]
+        }
+
+def resolve_response_format(request: dict) -> Optional[CompactRosterEncoder]:
+    """Encoder for "format": "compact" requests, None for the default JSON layout"""
+    response_format = request.get('format') or 'json'
+    if response_format not in ('json', 'compact'):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'compact'")
+    return CompactRosterEncoder() if response_format == 'compact' else None
+
+def parse_team_week(team_roster: Dict, week: int) -> TeamWeek:
+    """Build one team's lineup/bench record for a scoring period from its mRoster entry"""
+    lineup_players = []
+    bench_players = []
+    
+    for entry in team_roster['roster'].get('entries', []):
+        player, lineup_slot_id, fantasy_points, projected_points = extract_roster_entry(entry, week)
+        
+        player_week = PlayerWeek(
+            player.get('fullName', 'Unknown Player'),
+            get_position_name(player.get('defaultPositionId', 0)),
+            fantasy_points,
+            projected_points,
+            player.get('id', 0),
+            lineup_slot_id,
+            intern_eligible_slots(player.get('eligibleSlots', []))
+        )
+        
+        if lineup_slot_id in [20, 21]:  # Bench or IR
+            bench_players.append(player_week)
+        else:  # Active lineup (QB=0, RB=2, WR=4, TE=6, FLEX=23, K=17, D/ST=16)
+            lineup_players.append(player_week)
+    
+    return TeamWeek(
+        str(team_roster.get('id')),
+        team_roster.get('name', 'Unknown Team'),
+        roster_owner_name(team_roster),
+        lineup_players,
+        bench_players
+    )
+
+def split_week_rosters(week_data: Dict, week: int) -> Dict[str, TeamWeek]:
+    """Split a league-wide mRoster response into per-team lineup/bench records in one pass"""
+    return {
+        str(team_roster.get('id')): parse_team_week(team_roster, week)
+        for team_roster in week_data.get('teams', [])
+        if 'roster' in team_roster
     }
+
+class WeekResultCache:
+    """Computed lineup/bench records per (league_id, year, week), one record per team.
+    
+    Any requested week range is assembled from these per-week pieces, so
+    overlapping ranges share work. Finished weeks never expire; other weeks are
+    fresh for RESULT_CACHE_TTL and may then be served stale, while a background
+    refresh runs, until RESULT_CACHE_STALE_TTL.
+    """
+    def __init__(self, max_weeks: int):
+        self.max_weeks = max_weeks
+        self._weeks: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.refreshing: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get(self, key: Tuple) -> Tuple[Optional[Dict[str, TeamWeek]], bool]:
+        """Return (team records, is_stale); records are None on a miss"""
+        entry = self._weeks.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        
+        age = time.time() - entry['stored_at']
+        if not entry['final'] and age > RESULT_CACHE_STALE_TTL:
+            del self._weeks[key]
+            self.misses += 1
+            return None, False
+        
+        self._weeks.move_to_end(key)
+        if not entry['final'] and age > RESULT_CACHE_TTL:
+            self.stale_hits += 1
+            return entry['teams'], True
+        
+        self.hits += 1
+        return entry['teams'], False
     
-    url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/{year}/segments/0/leagues/{league_id}"
+    def peek(self, key: Tuple) -> Optional[bool]:
+        """is_stale for a servable entry, None if get() would miss; statistics are untouched"""
+        entry = self._weeks.get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry['stored_at']
+        if entry['final'] or age <= RESULT_CACHE_TTL:
+            return False
+        return True if age <= RESULT_CACHE_STALE_TTL else None
+    
+    def put(self, key: Tuple, teams: Dict[str, TeamWeek], final: bool) -> None:
+        self._weeks[key] = {'teams': teams, 'final': final, 'stored_at': time.time()}
+        self._weeks.move_to_end(key)
+        while len(self._weeks) > self.max_weeks:
+            self._weeks.popitem(last=False)
+    
+    def invalidate_week(self, key: Tuple) -> None:
+        if self._weeks.pop(key, None) is not None:
+            self.invalidations += 1
+    
+    def finalized_weeks(self, league_id: str, year: int, current_period: int) -> List[int]:
+        """Weeks cached as in-progress that ESPN now reports as finished"""
+        return [
+            week for (l_id, yr, week), entry in self._weeks.items()
+            if l_id == league_id and yr == year and not entry['final'] and week < current_period
+        ]
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'weeks': len(self._weeks),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'refreshing': len(self.refreshing)
+        }
+
+week_result_cache = WeekResultCache(RESULT_CACHE_MAX_WEEKS)
+# Strong references to background revalidation tasks so they are not garbage collected
+background_tasks: set = set()
+
+class SlidingWindowLimiter:
+    """At most `limit` events per `window` seconds for each key.
+    
+    A key keeps the timestamps of its last `limit` events only, so checks
+    are amortized O(1) and memory is bounded by limit * max_keys. Keys are
+    ordered by last activity: every call sweeps the keys idle for a whole
+    window off the front, and past max_keys the least recently active key
+    is dropped.
+    """
+    def __init__(self, limit: int, window: float, max_keys: int):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._events: "OrderedDict[str, deque]" = OrderedDict()
+        self.rejections = 0
+        self.evictions = 0
+    
+    def _sweep(self, now: float) -> None:
+        horizon = now - self.window
+        while self._events:
+            oldest_key, events = next(iter(self._events.items()))
+            if events[-1] > horizon:
+                break
+            del self._events[oldest_key]
+    
+    def _recent(self, key: str, now: float) -> Optional[deque]:
+        events = self._events.get(key)
+        if events is not None:
+            horizon = now - self.window
+            while events and events[0] <= horizon:
+                events.popleft()
+        return events
+    
+    def allowed(self, key: str) -> bool:
+        """True if another event for key would stay within the limit (nothing is recorded)"""
+        if self.limit <= 0:
+            return True
+        now = time.monotonic()
+        self._sweep(now)
+        events = self._recent(key, now)
+        return events is None or len(events) < self.limit
+    
+    def record(self, key: str) -> None:
+        if self.limit <= 0:
+            return
+        now = time.monotonic()
+        events = self._events.get(key)
+        if events is None:
+            events = self._events[key] = deque(maxlen=self.limit)
+        else:
+            self._events.move_to_end(key)
+        events.append(now)
+        while len(self._events) > self.max_keys:
+            self._events.popitem(last=False)
+            self.evictions += 1
+    
+    def hit(self, key: str) -> bool:
+        """Record an event for key if it is within the limit; False (and nothing recorded) if not"""
+        if not self.allowed(key):
+            self.rejections += 1
+            return False
+        self.record(key)
+        return True
+    
+    def retry_after(self, key: str) -> int:
+        """Whole seconds until the oldest event for key leaves the window"""
+        events = self._events.get(key)
+        if not events:
+            return 0
+        return max(1, int(events[0] + self.window - time.monotonic()) + 1)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': 'memory',
+            'limit': self.limit,
+            'window_seconds': self.window,
+            'keys': len(self._events),
+            'rejections': self.rejections,
+            'evictions': self.evictions
+        }
+
+class SqliteWindowLimiter:
+    """SlidingWindowLimiter interface over a SharedStateDB, counting events from every worker.
+    
+    Uses wall-clock time (shared between processes). A key keeps at most its
+    last `limit` rows, and rows older than the window are swept at most every
+    tenth of a window per process.
+    """
+    def __init__(self, db: SharedStateDB, name: str, limit: int, window: float):
+        self.db = db
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._next_sweep = 0.0
+        self.rejections = 0
+        self.evictions = 0
+    
+    def _count(self, conn: sqlite3.Connection, key: str, now: float) -> int:
+        return conn.execute(
+            "SELECT COUNT(*) FROM rate_events WHERE limiter = ? AND key = ? AND ts > ?",
+            (self.name, key, now - self.window)
+        ).fetchone()[0]
+    
+    def _insert(self, conn: sqlite3.Connection, key: str, now: float) -> None:
+        conn.execute("INSERT INTO rate_events (limiter, key, ts) VALUES (?, ?, ?)", (self.name, key, now))
+        conn.execute(
+            "DELETE FROM rate_events WHERE limiter = ? AND key = ? AND ts < ("
+            "SELECT ts FROM rate_events WHERE limiter = ? AND key = ? ORDER BY ts DESC LIMIT 1 OFFSET ?)",
+            (self.name, key, self.name, key, self.limit - 1)
+        )
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.window / 10
+            conn.execute("DELETE FROM rate_events WHERE limiter = ? AND ts <= ?", (self.name, now - self.window))
+    
+    def allowed(self, key: str) -> bool:
+        if self.limit <= 0:
+            return True
+        return self._count(self.db.connect(), key, time.time()) < self.limit
+    
+    def record(self, key: str) -> None:
+        if self.limit <= 0:
+            return
+        self._insert(self.db.connect(), key, time.time())
+    
+    def hit(self, key: str) -> bool:
+        if self.limit <= 0:
+            return True
+        conn = self.db.connect()
+        now = time.time()
+        # Count and insert atomically, so concurrent workers cannot both take the last slot
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            allowed = self._count(conn, key, now) < self.limit
+            if allowed:
+                self._insert(conn, key, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if not allowed:
+            self.rejections += 1
+        return allowed
+    
+    def retry_after(self, key: str) -> int:
+        now = time.time()
+        oldest = self.db.connect().execute(
+            "SELECT MIN(ts) FROM rate_events WHERE limiter = ? AND key = ? AND ts > ?",
+            (self.name, key, now - self.window)
+        ).fetchone()[0]
+        if oldest is None:
+            return 0
+        return max(1, int(oldest + self.window - now) + 1)
+    
+    def stats(self) -> Dict[str, Any]:
+        keys = self.db.connect().execute(
+            "SELECT COUNT(DISTINCT key) FROM rate_events WHERE limiter = ? AND ts > ?",
+            (self.name, time.time() - self.window)
+        ).fetchone()[0]
+        return {
+            'backend': 'sqlite',
+            'limit': self.limit,
+            'window_seconds': self.window,
+            'keys': keys,
+            'rejections': self.rejections,
+            'evictions': self.evictions
+        }
+
+def create_rate_limiter(name: str, limit: int, window: float):
+    if state_db is not None:
+        return SqliteWindowLimiter(state_db, name, limit, window)
+    return SlidingWindowLimiter(limit, window, RATE_LIMIT_MAX_KEYS)
+
+failed_auth_limiter = create_rate_limiter('failed_auth', AUTH_FAILURE_LIMIT, AUTH_FAILURE_WINDOW)
+session_request_limiter = create_rate_limiter('session_requests', SESSION_RATE_LIMIT, SESSION_RATE_WINDOW)
+
+def rate_limit_check(identifier: str) -> bool:
+    """Reject an identifier with too many recent failed ESPN authentications"""
+    if not failed_auth_limiter.allowed(identifier):
+        failed_auth_limiter.rejections += 1
+        raise HTTPException(
+            status_code=429,
+            detail="Too many failed attempts",
+            headers={'Retry-After': str(failed_auth_limiter.retry_after(identifier))}
+        )
+    return True
+
+def resolve_league_teams(league_data: Dict) -> Dict[str, Dict]:
+    """Resolve display team names and owner names for every team in an mTeam response"""
+    teams = league_data.get('teams', [])
+    members = league_data.get('members', [])
+    
+    # Create member lookup dictionary for owner names
+    member_lookup = {}
+    for member in members:
+        member_id = member.get('id', '').replace('{', '').replace('}', '')
+        display_name = member.get('displayName', '')
+        if member_id and display_name:
+            member_lookup[member_id] = display_name
+    
+    league_teams = {}
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    # Process each team
+    for team in teams:
+        team_id = str(team.get('id'))
+        # Extract team name properly - try multiple ESPN fields with better fallbacks
+        team_name = None
+        
+        if debug:
+            logger.debug("Team %s raw data fields: %s", team_id, list(team.keys()))
+            logger.debug("Team %s name fields: name=%s, teamName=%s, abbrev=%s, location=%s, nickname=%s", team_id, team.get('name'), team.get('teamName'), team.get('abbrev'), team.get('location'), team.get('nickname'))
+        
+        # Try various ESPN team name fields in order of preference  
+        # ESPN typically stores custom team names in "location" field
+        potential_names = [
+            team.get('location'),  # Full custom team name (e.g. "Scott Hanson's Witching Hour")
+            team.get('nickname'),  # Team nickname
+            # Combine location + nickname if both exist
+            f"{team.get('location', '')} {team.get('nickname', '')}".strip() if team.get('location') and team.get('nickname') else None,
+            team.get('name'),
+            team.get('teamName'),
+            team.get('abbrev'),  # Last resort - abbreviation
+        ]
+        
+        for name in potential_names:
+            if name and name.strip() and not name.startswith('{') and len(name.strip()) > 2:
+                team_name = name.strip()
+                break
+        
+        # If no direct name found, try location + nickname
+        if not team_name:
+            location = team.get('location', '').strip()
+            nickname = team.get('nickname', '').strip()
+            if location and nickname:
+                team_name = f"{location} {nickname}"
+            elif location:
+                team_name = location
+            elif nickname:
+                team_name = nickname
+        
+        # Final fallback
+        if not team_name:
+            team_name = f"Team {team_id}"
+        
+        # Extract owner information properly - enhanced with member lookup
+        owners = team.get('owners', [])
+        owner_name = 'Unknown Owner'
+        owner_id = None
+        
+        # First try to get owner ID from various sources
+        if owners:
+            owner = owners[0]
+            if isinstance(owner, dict):
+                owner_id = owner.get('id', '').replace('{', '').replace('}', '')
+                # Try multiple owner name fields from the owner object
+                potential_owner_names = [
+                    owner.get('displayName'),
+                    owner.get('username'), 
+                    owner.get('firstName', '') + ' ' + owner.get('lastName', ''),
+                ]
+                
+                for name in potential_owner_names:
+                    if name and name.strip() and not name.startswith('{') and len(name.strip()) > 1:
+                        owner_name = name.strip()
+                        break
+            elif isinstance(owner, str):
+                # Owner might be just an ID string
+                owner_id = owner.replace('{', '').replace('}', '')
+                # Clean up owner ID strings as potential names
+                if not owner.startswith('{') and len(owner) < 50:  # Reasonable name length
+                    owner_name = owner.replace('-', ' ').strip()
+        
+        # Try primaryOwner field if no success yet            
+        if owner_name == 'Unknown Owner':
+            primary_owner = team.get('primaryOwner')
+            if isinstance(primary_owner, dict):
+                owner_id = primary_owner.get('id', '').replace('{', '').replace('}', '')
+                display_name = primary_owner.get('displayName')
+                if display_name and not display_name.startswith('{'):
+                    owner_name = display_name
+            elif isinstance(primary_owner, str):
+                owner_id = primary_owner.replace('{', '').replace('}', '')
+        
+        # Finally, try member lookup if we have an owner ID
+        if owner_name == 'Unknown Owner' and owner_id and owner_id in member_lookup:
+            owner_name = member_lookup[owner_id]
+        
+        if debug:
+            logger.debug("Team %s: %s, owner %s (ID: %s)", team_id, team_name, owner_name, owner_id)
+        
+        league_teams[team_id] = {
+            'team_id': team_id,
+            'team_name': team_name,
+            'owner_name': owner_name
+        }
+    
+    return league_teams
+
+def build_matchups(data: Dict, week: Any) -> List[Dict]:
+    """Home/away pairings and scores for one matchup period from an mMatchup response"""
+    team_names = {team.get('id'): team.get('name', 'Unknown Team') for team in data.get('teams', [])}
+    matchups = []
+    
+    for matchup in data.get('schedule', []):
+        if matchup.get('matchupPeriodId') != week:
+            continue
+        home_team = matchup.get('home', {})
+        away_team = matchup.get('away', {})
+        matchups.append({
+            'matchupId': matchup.get('id'),
+            'week': week,
+            'homeTeam': {
+                'teamId': home_team.get('teamId'),
+                'teamName': team_names.get(home_team.get('teamId'), 'Unknown Team'),
+                'score': home_team.get('totalPoints', 0)
+            },
+            'awayTeam': {
+                'teamId': away_team.get('teamId'),
+                'teamName': team_names.get(away_team.get('teamId'), 'Unknown Team'),
+                'score': away_team.get('totalPoints', 0)
+            },
+            'winner': 'home' if home_team.get('totalPoints', 0) > away_team.get('totalPoints', 0) else 'away'
+        })
+    
+    return matchups
+
+def lookup_session(session_data: Dict) -> Tuple[str, Dict]:
+    """Stored session for a validated token payload: the caller's own, else any live session in the same league"""
+    session_id = f"{session_data['user_id']}_{session_data['league_id']}"
+    found = server_state.sessions.find(session_id, session_data['league_id'])
+    if found is None:
+        raise HTTPException(status_code=401, detail="Session not found - please re-authenticate")
+    if found[0] != session_id:
+        logger.info("Found fallback session: %s...", found[0][:8])
+    return found
+
+class AuthContext:
+    """The caller of one request: validated token payload, stored session and ESPN cookies.
+    
+    Resolved once per request by the get_auth_context dependency and passed
+    down to every upstream call, so the JWT is decoded and the session looked
+    up once, and credentials are decrypted at most once (via credential_cache).
+    """
+    __slots__ = ('token', 'payload', 'session_id', 'session', '_cookie_header')
+    
+    def __init__(self, token: str, payload: Dict[str, Any], session_id: str, session: Dict):
+        self.token = token
+        self.payload = payload
+        self.session_id = session_id
+        self.session = session
+        self._cookie_header: Optional[str] = None
+    
+    @property
+    def user_id(self) -> str:
+        return self.payload['user_id']
+    
+    @property
+    def is_own_session(self) -> bool:
+        """False when the session is another member's, found through the league fallback"""
+        return self.session_id == f"{self.payload['user_id']}_{self.payload['league_id']}"
+    
+    @property
+    def user_teams(self) -> List[Dict]:
+        return self.session.get('user_teams', [])
+    
+    def require_league(self, league_id: str) -> None:
+        # Upstream data is shared between callers, so only members of this league may read it
+        if str(self.payload['league_id']) != str(league_id):
+            raise HTTPException(status_code=403, detail="Access denied to this league")
+    
+    @property
+    def espn_headers(self) -> Dict[str, str]:
+        if self._cookie_header is None:
+            self._cookie_header = credential_cache.cookie_header(self.session_id, self.session)
+        return {'Cookie': self._cookie_header}
+
+async def make_espn_request(
+    auth: AuthContext,
+    league_id: str,
+    year: int,
+    view: str = "",
+    scoring_period: int = None,
+    refresh: bool = False
+) -> Dict:
+    """Make secure ESPN API request (refresh=True skips the in-memory response cache)"""
+    auth.require_league(league_id)
     
     # Build query parameters
     params = []
@@ -269,85 +1801,512 @@ def make_espn_request(session_token: str, league_id: str, year: int, view: str =
     if scoring_period:
         params.append(f"scoringPeriodId={scoring_period}")
     
+    url = f"{ESPN_API_BASE_URL}/seasons/{year}/segments/0/leagues/{league_id}"
     if params:
         url += "?" + "&".join(params)
     
-    logger.info(f"Making ESPN API request to: {url}")
+    headers = auth.espn_headers
+    identifier = auth.user_id
+    
+    # Cached and in-flight responses are shared by every member of the league.
+    # Authorization above has already run for this caller.
+    key = (league_id, year, view, scoring_period)
+    cached = None if refresh else upstream_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    async def fetch_and_cache() -> Dict:
+        # Finished weeks may already be on disk from before a restart
+        if week_store is not None and scoring_period:
+            stored = await asyncio.to_thread(week_store.get, key)
+            if stored is not None:
+                data, content = stored
+                data_versions.observe(key, content)
+                upstream_cache.put(key, data, len(content), None)
+                return data
+        
+        data, content = await fetch_espn_json(url, headers, identifier)
+        data_versions.observe(key, content)
+        is_final = is_scoring_period_final(data, scoring_period)
+        upstream_cache.put(key, data, len(content), None if is_final else UPSTREAM_CACHE_TTL)
+        if is_final and week_store is not None:
+            await asyncio.to_thread(week_store.put, key, content)
+        return data
     
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            logger.info("ESPN API request successful")
-            return response.json()
-        elif response.status_code == 401:
-            # Log failed attempt
-            identifier = session_data['user_id']
-            server_state.failed_attempts[f"{identifier}_{int(time.time())}"] = 1
-            raise HTTPException(status_code=401, detail="ESPN authentication failed - credentials may be expired")
-        else:
-            logger.error(f"ESPN API error: {response.status_code} - {response.text[:200]}")
-            raise HTTPException(status_code=502, detail=f"ESPN API error: {response.status_code}")
+        return await upstream_single_flight.run(key, fetch_and_cache)
+    except SharedFetchAuthError:
+        # The shared fetch used another member's cookies and ESPN rejected them;
+        # retry once with this caller's own credentials.
+        return await fetch_and_cache()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        # HTTP-date form; fall back to our own backoff
+        return None
+
+async def espn_get(url: str, headers: Dict[str, str], timeout: float = ESPN_REQUEST_TIMEOUT) -> httpx.Response:
+    """GET from ESPN through the governor, retrying 429/5xx/transport errors.
+    
+    Returns the first response that is not retryable (including 401/404).
+    Raises 503 while the host's circuit breaker is open and 502 once the
+    retries or the ESPN_RETRY_DEADLINE are used up.
+    """
+    bucket, breaker = espn_governor.host(httpx.URL(url).host)
+    deadline = time.monotonic() + ESPN_RETRY_DEADLINE
+    attempt = 0
+    while True:
+        now = time.monotonic()
+        if not breaker.allow(now):
+            raise HTTPException(
+                status_code=503,
+                detail="ESPN API temporarily unavailable",
+                headers={'Retry-After': str(breaker.retry_after(now))}
+            )
+        # A half-open breaker lets exactly one call through: this one
+        probe = breaker.state == 'half_open'
+        recorded = False
+        try:
+            wait = bucket.reserve(now)
+            if now + wait >= deadline:
+                bucket.cancel()
+                espn_governor.deadline_exceeded += 1
+                raise HTTPException(status_code=502, detail="ESPN API unavailable")
+            if wait > 0:
+                espn_governor.wait_seconds += wait
+                await asyncio.sleep(wait)
             
-    except requests.RequestException as e:
-        logger.error(f"ESPN API request failed: {str(e)}")
-        raise HTTPException(status_code=502, detail="ESPN API unavailable")
+            attempt += 1
+            espn_governor.requests += 1
+            retry_after = None
+            try:
+                response = await get_espn_client().get(
+                    url, headers=headers, timeout=min(timeout, max(0.1, deadline - time.monotonic()))
+                )
+            except httpx.TransportError as e:
+                breaker.record_failure(time.monotonic())
+                recorded = True
+                failure = f"{type(e).__name__}: {e}"
+                error = HTTPException(status_code=502, detail="ESPN API unavailable")
+            except httpx.HTTPError as e:
+                logger.error("ESPN API request failed: %s", e)
+                raise HTTPException(status_code=502, detail="ESPN API unavailable")
+            else:
+                if response.status_code == 429:
+                    # ESPN is up but throttling us: slow the host down, don't trip the breaker
+                    espn_governor.throttled_responses += 1
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    bucket.throttled(time.monotonic(), retry_after or 0.0)
+                elif response.status_code >= 500:
+                    breaker.record_failure(time.monotonic())
+                    recorded = True
+                else:
+                    breaker.record_success()
+                    recorded = True
+                    bucket.succeeded()
+                    return response
+                failure = f"HTTP {response.status_code}"
+                error = HTTPException(status_code=502, detail=f"ESPN API error: {response.status_code}")
+        finally:
+            # A probe that ends without a verdict (throttled, out of time, cancelled
+            # or an unexpected error) hands the half-open slot to the next call
+            if probe and not recorded:
+                breaker.probe_in_flight = False
+        
+        # Full jitter, unless ESPN said when to come back
+        delay = retry_after if retry_after is not None else random.uniform(
+            0, min(ESPN_RETRY_MAX_DELAY, ESPN_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        )
+        if attempt >= ESPN_RETRY_ATTEMPTS or time.monotonic() + delay >= deadline:
+            logger.error("ESPN API request failed after %s attempt(s): %s", attempt, failure)
+            raise error
+        logger.warning("ESPN API request failed (%s), retrying in %.2fs", failure, delay)
+        espn_governor.retries += 1
+        await asyncio.sleep(delay)
+
+async def fetch_espn_json(url: str, headers: Dict[str, str], identifier: str) -> Tuple[Dict, bytes]:
+    """Perform one upstream ESPN GET; returns the decoded JSON body and the raw bytes"""
+    logger.debug("Making ESPN API request to: %s", url)
+    upstream_single_flight.upstream_calls += 1
+    request_summary = request_log_fields.get()
+    if request_summary is not None:
+        request_summary['upstream_calls'] += 1
     
-    url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/{year}/segments/0/leagues/{league_id}"
+    response = await espn_get(url, headers)
+    
+    if response.status_code == 200:
+        return response.json(), response.content
+    elif response.status_code == 401:
+        # Log failed attempt
+        await state_call(failed_auth_limiter.record, identifier)
+        raise HTTPException(status_code=401, detail="ESPN authentication failed - credentials may be expired")
+    else:
+        logger.error("ESPN API error: %s - %s", response.status_code, response.text[:200])
+        raise HTTPException(status_code=502, detail=f"ESPN API error: {response.status_code}")
+
+def request_upstream_calls() -> int:
+    """ESPN requests made so far while serving the current HTTP request (cache hits and coalesced fetches excluded)"""
+    request_summary = request_log_fields.get()
+    return request_summary['upstream_calls'] if request_summary is not None else 0
+
+def resolve_week_concurrency(request: dict) -> int:
+    """Per-request week fan-out parallelism, clamped to the server cap"""
+    try:
+        requested = int(request.get('max_concurrency') or WEEK_FETCH_CONCURRENCY)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid max_concurrency")
+    return max(1, min(requested, MAX_WEEK_FETCH_CONCURRENCY))
+
+async def iter_fetch_weeks(
+    auth: AuthContext,
+    league_id: str,
+    year: int,
+    weeks: List[int],
+    view: str = "mRoster",
+    max_concurrency: int = WEEK_FETCH_CONCURRENCY
+) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[Dict]]]:
+    """Fetch several scoring periods concurrently, yielding (week, data, failure) as each completes.
+    
+    A failed week never cancels the others and is yielded with a failure
+    record instead of data; authentication failures are re-raised since every
+    other week would fail the same way. Closing the iterator early cancels the
+    fetches that are still pending.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def fetch_one(week: int) -> Tuple[int, Optional[Dict], Optional[Dict]]:
+        async with semaphore:
+            try:
+                return week, await make_espn_request(auth, league_id, year, view, scoring_period=week), None
+            except HTTPException as e:
+                if e.status_code == 401:
+                    raise
+                return week, None, {'week': week, 'status': e.status_code, 'error': e.detail}
+            except Exception as e:
+                return week, None, {'week': week, 'status': 500, 'error': str(e)}
+    
+    tasks = [asyncio.ensure_future(fetch_one(week)) for week in weeks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            week, data, failure = await next_done
+            if failure:
+                logger.error("Failed to fetch week %s data: %s", week, failure['error'])
+            yield week, data, failure
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+def store_week_records(league_id: str, year: int, week: int, week_data: Dict) -> Dict[str, TeamWeek]:
+    """Parse a week's mRoster payload into the result cache and return its team records"""
+    teams = split_week_rosters(week_data, week)
+    week_result_cache.put((league_id, year, week), teams, is_scoring_period_final(week_data, week))
+    # Versioned together with the cache write, so delta responses never miss a change
+    for team_id, team_week in teams.items():
+        data_versions.observe((league_id, year, "team-week", week, team_id), dumps_json(team_week.to_dict()))
+    data_versions.observe((league_id, year, "week-teams", week), ','.join(sorted(teams)).encode())
+    
+    # A newly finished week invalidates only that week's in-progress entries
+    status = week_data.get('status') or {}
+    current_period = status.get('latestScoringPeriod') or week_data.get('scoringPeriodId')
+    if current_period:
+        for finished_week in week_result_cache.finalized_weeks(league_id, year, current_period):
+            logger.info("Week %s of league %s finalized - invalidating cached results", finished_week, league_id)
+            week_result_cache.invalidate_week((league_id, year, finished_week))
+            upstream_cache.discard((league_id, year, "mRoster", finished_week))
+    
+    return teams
+
+def schedule_week_refresh(auth: AuthContext, league_id: str, year: int, week: int) -> None:
+    """Revalidate a stale in-progress week in the background (at most one refresh per week)"""
+    key = (league_id, year, week)
+    if key in week_result_cache.refreshing:
+        return
+    week_result_cache.refreshing.add(key)
+    
+    async def refresh():
+        try:
+            week_data = await make_espn_request(
+                auth, league_id, year, "mRoster", scoring_period=week, refresh=True
+            )
+            store_week_records(league_id, year, week, week_data)
+        except Exception as e:
+            logger.warning("Background refresh of week %s for league %s failed: %s", week, league_id, e)
+        finally:
+            week_result_cache.refreshing.discard(key)
+    
+    task = asyncio.ensure_future(refresh())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def iter_week_records(
+    auth: AuthContext,
+    league_id: str,
+    year: int,
+    weeks: List[int],
+    max_concurrency: int = WEEK_FETCH_CONCURRENCY,
+    stats: Optional[Dict[str, int]] = None
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, TeamWeek]], Optional[Dict]]]:
+    """Yield (week, {team_id: record}, failure) for each requested week as soon as it is ready.
+    
+    Cached weeks come first; only weeks missing from the result cache are
+    fetched, and they are yielded in completion order. Stale in-progress weeks
+    are returned immediately and revalidated in the background. If given,
+    stats['weeks_fetched'] is set to the number of weeks requested upstream.
+    """
+    # Cached results skip make_espn_request, so authorize the caller here
+    auth.require_league(league_id)
+    
+    missing_weeks = []
+    for week in weeks:
+        teams, is_stale = week_result_cache.get((league_id, year, week))
+        if teams is None:
+            missing_weeks.append(week)
+            continue
+        if is_stale:
+            schedule_week_refresh(auth, league_id, year, week)
+        yield week, teams, None
+    
+    if stats is not None:
+        stats['weeks_fetched'] = len(missing_weeks)
+    if not missing_weeks:
+        return
+    
+    async for week, week_data, failure in iter_fetch_weeks(
+        auth, league_id, year, missing_weeks, max_concurrency=max_concurrency
+    ):
+        if failure:
+            yield week, None, failure
+            continue
+        try:
+            teams = store_week_records(league_id, year, week, week_data)
+        except Exception as e:
+            logger.error("Failed to process week %s data: %s", week, e)
+            yield week, None, {'week': week, 'status': 500, 'error': str(e)}
+            continue
+        yield week, teams, None
+
+async def get_week_records(
+    auth: AuthContext,
+    league_id: str,
+    year: int,
+    weeks: List[int],
+    max_concurrency: int = WEEK_FETCH_CONCURRENCY
+) -> Tuple[Dict[int, Dict[str, TeamWeek]], List[Dict], int]:
+    """Per-team lineup/bench records for each requested week, assembled from the result cache.
+    
+    Returns ({week: {team_id: record}} in week order, failed_weeks, weeks_fetched).
+    """
+    records = {}
+    failed_weeks = []
+    stats = {'weeks_fetched': 0}
+    async for week, teams, failure in iter_week_records(
+        auth, league_id, year, weeks, max_concurrency, stats
+    ):
+        if failure:
+            failed_weeks.append(failure)
+        else:
+            records[week] = teams
+    
+    ordered_records = {week: records[week] for week in weeks if week in records}
+    return ordered_records, sorted(failed_weeks, key=lambda f: f['week']), stats['weeks_fetched']
+
+# Conditional requests: a response's ETag is derived from the data versions of
+# the upstream resources it is built from (league-level views and mRoster weeks)
+def response_etag(scope: str, params: Tuple, league_id: str, year: int,
+                  views: List[str], weeks: List[int]) -> Optional[str]:
+    """Weak ETag for a response; None if the version of any input is unknown"""
+    keys = [(league_id, year, view, None) for view in views]
+    keys += [(league_id, year, "mRoster", week) for week in weeks]
+    versions = [data_versions.get(key) for key in keys]
+    if None in versions:
+        return None
+    digest = hashlib.blake2b(repr((scope, league_id, year, params, versions)).encode(), digest_size=12).hexdigest()
+    return f'W/"{DATA_VERSION_EPOCH}-{digest}"'
+
+def cached_response_etag(auth: AuthContext, scope: str, params: Tuple, league_id: str, year: int,
+                         views: List[str], weeks: List[int]) -> Optional[str]:
+    """ETag of the response the caches would produce right now, without any ESPN request.
+    
+    None unless every input is servable from cache. Stale in-progress weeks
+    are revalidated in the background exactly as a full request would.
+    """
+    auth.require_league(league_id)
+    if any(upstream_cache.peek((league_id, year, view, None)) is None for view in views):
+        return None
+    
+    week_states = [week_result_cache.peek((league_id, year, week)) for week in weeks]
+    if None in week_states:
+        return None
+    for week, is_stale in zip(weeks, week_states):
+        if is_stale:
+            schedule_week_refresh(auth, league_id, year, week)
+    return response_etag(scope, params, league_id, year, views, weeks)
+
+# Delta responses: the client sends back the data_version of its last response as
+# since_version and only receives team-weeks versioned after it
+def current_data_version() -> str:
+    return f"{DATA_VERSION_EPOCH}:{data_versions.latest}"
+
+def resolve_since_version(request: dict) -> Optional[int]:
+    """Client data version for a delta response; None (full response) if absent or from an earlier server process"""
+    since_version = request.get('since_version')
+    if not since_version:
+        return None
+    epoch, _, version = str(since_version).partition(':')
+    if epoch != DATA_VERSION_EPOCH:
+        return None
+    try:
+        return int(version)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since_version")
+
+def team_week_changed(league_id: str, year: int, week: int, team_id: str, since: Optional[int]) -> bool:
+    if since is None:
+        return True
+    version = data_versions.get((league_id, year, "team-week", week, team_id))
+    return version is None or version > since
+
+def team_week_removed(league_id: str, year: int, week: int, since: Optional[int]) -> bool:
+    """Tombstone check for a team missing from a week: did the week's set of teams change?"""
+    if since is None:
+        return False
+    version = data_versions.get((league_id, year, "week-teams", week))
+    return version is None or version > since
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    def opaque(tag: str) -> str:
+        return tag[2:] if tag.startswith('W/') else tag
     
-    # Build query parameters
-    params = []
-    if view:
-        params.append(f"view={view}")
-    if scoring_period:
-        params.append(f"scoringPeriodId={scoring_period}")
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(opaque(tag) == opaque(etag) for tag in tags)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag})
+
+def conditional_json_response(http_request: Request, content: Dict, etag: Optional[str]) -> Response:
+    """304 when the client already holds this version, else the JSON body tagged with its ETag"""
+    if etag is None:
+        return FastJSONResponse(content)
+    if etag_matches(http_request.headers.get('if-none-match'), etag):
+        return not_modified(etag)
+    return FastJSONResponse(content, headers={'ETag': etag})
+
+def verify_team_access(auth: AuthContext, team_id: Any) -> None:
+    """Ensure the caller's session owns the requested team"""
+    user_team_ids = [team['team_id'] for team in auth.user_teams]
+    logger.debug("User teams: %s, requested team: %s", user_team_ids, team_id)
     
-    if params:
-        url += "?" + "&".join(params)
+    if int(team_id) not in user_team_ids:
+        raise HTTPException(status_code=403, detail="Access denied to this team")
+
+# Streaming analysis: one JSON record per line (NDJSON) or Server-Sent Events
+STREAM_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+def resolve_stream_format(request: dict, accept: str) -> str:
+    """Pick the stream encoding from the request body, falling back to the Accept header"""
+    stream_format = request.get('format') or ('sse' if 'text/event-stream' in (accept or '') else 'ndjson')
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    return stream_format
+
+def encode_stream_record(record: Dict, stream_format: str) -> bytes:
+    """Encode a single stream record"""
+    payload = dumps_json(record)
+    if stream_format == 'sse':
+        return f"event: {record['type']}\ndata: ".encode() + payload + b"\n\n"
+    return payload + b"\n"
+
+def streaming_analysis_response(records: AsyncIterator[Dict], stream_format: str) -> StreamingResponse:
+    """Send records as they are produced; errors after the first byte become an 'error' record"""
+    async def body():
+        try:
+            async for record in records:
+                yield encode_stream_record(record, stream_format)
+        except HTTPException as e:
+            yield encode_stream_record({'type': 'error', 'status': e.status_code, 'detail': e.detail}, stream_format)
+        except Exception as e:
+            logger.error("Streaming analysis failed: %s", e, exc_info=True)
+            yield encode_stream_record({'type': 'error', 'status': 500, 'detail': 'Streaming analysis failed'}, stream_format)
     
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            logger.info("ESPN API request successful")
-            return response.json()
-        elif response.status_code == 401:
-            # Log failed attempt
-            identifier = session_data['user_id']
-            server_state.failed_attempts[f"{identifier}_{int(time.time())}"] = 1
-            raise HTTPException(status_code=401, detail="ESPN authentication failed")
-        else:
-            raise HTTPException(status_code=502, detail=f"ESPN API error: {response.status_code}")
-            
-    except requests.RequestException as e:
-        logger.error(f"ESPN API request failed: {str(e)}")
-        raise HTTPException(status_code=502, detail="ESPN API unavailable")
-async def get_current_session(credentials: HTTPAuthorizationCredentials = Security(security)) -> str:
+    return StreamingResponse(
+        body(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Security(security)) -> Dict[str, Any]:
     """Extract and validate session token"""
     if not credentials:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    token = credentials.credentials
-    logger.info(f"Validating session token: {token[:30]}...")
-    
     try:
-        # Validate the token and return it if valid
-        SecurityManager.validate_session_token(token)
-        return token
+        return SecurityManager.validate_session_token(credentials.credentials)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Session validation error: {str(e)}")
+        logger.error("Session validation error: %s", e)
         raise HTTPException(status_code=401, detail="Invalid session token")
+
+def authorize_caller(session_data: Dict) -> Tuple[str, Dict]:
+    """Charge the caller's request budget and return the stored session to use"""
+    # Budgeted per caller, even when their requests use a fallback session
+    caller = f"{session_data['user_id']}_{session_data['league_id']}"
+    if not session_request_limiter.hit(caller):
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests for this session",
+            headers={'Retry-After': str(session_request_limiter.retry_after(caller))}
+        )
+    return lookup_session(session_data)
+
+async def get_auth_context(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    session_data: Dict[str, Any] = Depends(get_token_payload)
+) -> AuthContext:
+    """Validate the token and look up its session once for the whole request"""
+    session_id, session_info = await state_call(authorize_caller, session_data)
+    return AuthContext(credentials.credentials, session_data, session_id, session_info)
+def shared_state_stats() -> Dict[str, Any]:
+    """Session and rate limiter figures for /health, after dropping expired sessions"""
+    server_state.sessions.purge_expired()
+    return {
+        'active_sessions': len(server_state.sessions),
+        'sessions': server_state.sessions.stats(),
+        'rate_limits': {
+            'failed_auth': failed_auth_limiter.stats(),
+            'session_requests': session_request_limiter.stats()
+        }
+    }
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    server_state.cleanup_expired_sessions()
+    state = await state_call(shared_state_stats)
     return {
         'status': 'healthy',
         'uptime_seconds': (datetime.now() - server_state.start_time).total_seconds(),
         'requests_processed': server_state.request_count,
-        'active_sessions': len(server_state.encrypted_sessions)
+        'active_sessions': state['active_sessions'],
+        'sessions': state['sessions'],
+        'credential_cache': credential_cache.stats(),
+        'rate_limits': state['rate_limits'],
+        'upstream': upstream_single_flight.stats(),
+        'upstream_governor': espn_governor.stats(),
+        'upstream_cache': upstream_cache.stats(),
+        'disk_cache': week_store.stats() if week_store is not None else {'enabled': False},
+        'result_cache': week_result_cache.stats(),
+        'data_versions': data_versions.stats()
     }
 @app.post("/secure-authenticate")
 async def secure_authenticate(request: dict):
@@ -355,9 +2314,6 @@ async def secure_authenticate(request: dict):
     server_state.request_count += 1
     
     try:
-        # Debug: Log the received request
-        logger.info(f"Received authentication request: {type(request)}")
-        
         # Handle case where request might be a string (FastAPI parsing issue)
         if isinstance(request, str):
             try:
@@ -370,12 +2326,10 @@ async def secure_authenticate(request: dict):
         swid = request.get('swid', '').strip() if isinstance(request, dict) else ''
         league_id = request.get('league_id', '').strip() if isinstance(request, dict) else ''
         
-        logger.info(f"Parsed credentials - League ID: {league_id}, ESPN_S2 length: {len(espn_s2)}, SWID: {swid}")
-        logger.info(f"ESPN_S2 (first 50 chars): {espn_s2[:50]}...")
-        logger.info(f"ESPN_S2 (last 20 chars): ...{espn_s2[-20:]}")
+        logger.info("Authentication request for league %s", league_id)
         
         if not all([espn_s2, swid, league_id]):
-            logger.error(f"Missing credentials - ESPN_S2: {bool(espn_s2)}, SWID: {bool(swid)}, League: {bool(league_id)}")
+            logger.error("Missing credentials - ESPN_S2: %s, SWID: %s, League: %s", bool(espn_s2), bool(swid), bool(league_id))
             raise HTTPException(status_code=400, detail="Missing required credentials")
         
         # Validate league ID format
@@ -383,23 +2337,22 @@ async def secure_authenticate(request: dict):
         
         # Rate limiting
         user_identifier = hashlib.sha256(f"{espn_s2}_{swid}".encode()).hexdigest()[:16]
-        rate_limit_check(user_identifier)
+        await state_call(rate_limit_check, user_identifier)
         
         # Test credentials by making a test request
         test_headers = {
-            'Cookie': f"espn_s2={espn_s2}; SWID={swid}",
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'Cookie': f"espn_s2={espn_s2}; SWID={swid}"
         }
         
-        test_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2024/segments/0/leagues/{league_id}?view=mTeam"
-        logger.info(f"Testing ESPN API connection to: {test_url}")
+        test_url = f"{ESPN_API_BASE_URL}/seasons/2024/segments/0/leagues/{league_id}?view=mTeam"
+        logger.debug("Testing ESPN API connection to: %s", test_url)
         
-        test_response = requests.get(test_url, headers=test_headers, timeout=10)
-        logger.info(f"ESPN API response status: {test_response.status_code}")
+        test_response = await espn_get(test_url, test_headers, timeout=10)
+        logger.debug("ESPN API response status: %s", test_response.status_code)
         
         if test_response.status_code != 200:
-            logger.error(f"ESPN API failed with status {test_response.status_code}: {test_response.text[:200]}")
-            server_state.failed_attempts[f"{user_identifier}_{int(time.time())}"] = 1
+            logger.error("ESPN API failed with status %s: %s", test_response.status_code, test_response.text[:200])
+            await state_call(failed_auth_limiter.record, user_identifier)
             raise HTTPException(status_code=401, detail=f"ESPN API error: {test_response.status_code}")
         
         # Verify user is member of this league
@@ -407,8 +2360,7 @@ async def secure_authenticate(request: dict):
         user_teams = []
         swid_clean = swid.replace('{', '').replace('}', '')
         
-        logger.info(f"League data received for league: {league_data.get('settings', {}).get('name', 'Unknown')}")
-        logger.info(f"Looking for SWID: {swid_clean}")
+        logger.info("League data received for league: %s", league_data.get('settings', {}).get('name', 'Unknown'))
         
         for team in league_data.get('teams', []):
             team_owners = team.get('owners', [])
@@ -424,7 +2376,7 @@ async def secure_authenticate(request: dict):
                 else:
                     team_name = team.get('abbrev', f"Team {team.get('id', '?')}")
             
-            logger.info(f"Team {team_name} has {len(team_owners)} owners")
+            logger.debug("Team %s has %s owners", team_name, len(team_owners))
 
             for owner in team_owners:
                 owner_id = ''
@@ -432,7 +2384,6 @@ async def secure_authenticate(request: dict):
                     owner_id = owner.get('id', '')
                 elif isinstance(owner, str):
                     owner_id = owner.replace('{', '').replace('}', '')
-                logger.info(f"Checking owner ID: {owner_id}")
                 
                 if owner_id == swid_clean:
                     # Get owner display name from members data
@@ -447,7 +2398,7 @@ async def secure_authenticate(request: dict):
                         'team_name': team_name,
                         'owner_name': owner_display_name
                     })
-                    logger.info(f"Found matching team: {team_name} (Owner: {owner_display_name})")
+                    logger.info("Found matching team: %s (Owner: %s)", team_name, owner_display_name)
                     break
         
         # Create secure session
@@ -457,15 +2408,15 @@ async def secure_authenticate(request: dict):
         
         # Store session with expiration
         session_id = f"{user_identifier}_{league_id}"
-        server_state.encrypted_sessions[session_id] = {
+        await state_call(server_state.sessions.put, session_id, {
             'credentials': encrypted_credentials,
             'league_id': league_id,
             'user_teams': user_teams,
             'expires_at': time.time() + SESSION_TIMEOUT,
             'created_at': time.time()
-        }
+        })
         
-        logger.info(f"Secure authentication successful for league {league_id}, user has {len(user_teams)} teams")
+        logger.info("Secure authentication successful for league %s, user has %s teams", league_id, len(user_teams))
         
         return {
             'session_token': session_token,
@@ -481,13 +2432,14 @@ async def secure_authenticate(request: dict):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}", exc_info=True)
+        logger.error("Authentication error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Authentication failed")
               
 @app.post("/secure-league-info")
 async def secure_get_league_info(
-    request: dict, 
-    session_token: str = Depends(get_current_session)
+    request: dict,
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get complete league information with competitive context"""
     server_state.request_count += 1
@@ -500,21 +2452,21 @@ async def secure_get_league_info(
             raise HTTPException(status_code=400, detail="League ID required")
         
         league_id, year = validate_inputs(league_id, year)
-        logger.info(f"Getting league info for {league_id}, year {year}")
+        logger.debug("Getting league info for %s, year %s", league_id, year)
         
-        # Get league data using secure request with team and member info
-        data = make_espn_request(session_token, league_id, year, "mTeam&mSettings")
+        # Only the caller's own session identifies their teams
+        user_teams = auth.user_teams if auth.is_own_session else []
         
-        # Get session info to identify user's team
-        session_data = SecurityManager.validate_session_token(session_token)
-        session_id = f"{session_data['user_id']}_{session_data['league_id']}"
+        user_team_ids = [team['team_id'] for team in user_teams]
         
-        # Safely get user teams
-        user_teams = []
-        if session_id in server_state.encrypted_sessions:
-            user_teams = server_state.encrypted_sessions[session_id].get('user_teams', [])
+        # isYou and your_teams depend on the caller, so they are part of the ETag
+        etag_params = (repr(user_teams),)
+        etag = cached_response_etag(auth, 'league-info', etag_params, league_id, year, ["mTeam&mSettings"], [])
+        if etag and etag_matches(http_request.headers.get('if-none-match'), etag):
+            return not_modified(etag)
         
-        user_team_ids = [team['team_id'] for team in user_teams]
+        # Get league data using secure request with team and member info
+        data = await make_espn_request(auth, league_id, year, "mTeam&mSettings")
         
         # Build a member lookup from league settings if available
         member_lookup = {}
@@ -524,13 +2476,10 @@ async def secure_get_league_info(
                 display_name = member.get('displayName') or f"{member.get('firstName', '')} {member.get('lastName', '')}".strip()
                 if display_name:
                     member_lookup[member_id] = display_name
-                logger.info(f"Member lookup: {member_id} -> {display_name}")
         
         # Build enhanced team data with competitive context
         teams = []
         for team in data.get('teams', []):
-            logger.info(f"Processing team data: {team}")
-            
             # Extract team name - try multiple fields
             team_name = team.get('name') or team.get('location', '') + ' ' + team.get('nickname', '')
             if not team_name or team_name.strip() == ' ':
@@ -540,8 +2489,6 @@ async def secure_get_league_info(
             owners = team.get('owners', [])
             owner_name = team_name  # Default to team name if no owner found
             
-            logger.info(f"Team {team.get('id')} owners: {owners}")
-            
             if owners:
                 owner = owners[0]
                 owner_id = None
@@ -563,13 +2510,12 @@ async def secure_get_league_info(
                 if owner_id and (not owner_name or owner_name == team_name):
                     if owner_id in member_lookup:
                         owner_name = member_lookup[owner_id]
-                        logger.info(f"Found owner name from member lookup: {owner_name}")
                 
                 # If still no owner name, just use team name (cleaner than showing IDs)
                 if not owner_name or owner_name == team_name:
                     owner_name = team_name
             
-            logger.info(f"Final team name: {team_name}, owner: {owner_name}")
+            logger.debug("Team %s: %s, owner %s", team.get('id'), team_name, owner_name)
             
             team_data = {
                 'teamId': team.get('id'),
@@ -598,20 +2544,22 @@ async def secure_get_league_info(
             'your_teams': user_teams
         }
         
-        logger.info(f"League info processed: {league_info['name']} with {len(teams)} teams")
+        logger.info("League info processed: %s with %s teams", league_info['name'], len(teams))
         
-        return league_info
+        etag = response_etag('league-info', etag_params, league_id, year, ["mTeam&mSettings"], [])
+        return conditional_json_response(http_request, league_info, etag)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching league info: {str(e)}", exc_info=True)
+        logger.error("Error fetching league info: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch league information: {str(e)}")
 
-@app.post("/secure-team-analysis")
+@app.post("/secure-team-analysis", response_class=FastJSONResponse)
 async def secure_get_team_analysis(
     request: dict,
-    session_token: str = Depends(get_current_session)
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get team analysis data for efficiency calculations"""
     server_state.request_count += 1
@@ -624,40 +2572,30 @@ async def secure_get_team_analysis(
         end_week = request.get('end_week', 17)
         
         league_id, year = validate_inputs(league_id, year)
+        compact = resolve_response_format(request)
         
         if not team_id:
             raise HTTPException(status_code=400, detail="Team ID required")
         
         # Verify user owns this team
-        session_data = SecurityManager.validate_session_token(session_token)
-        session_id = f"{session_data['user_id']}_{session_data['league_id']}"
+        verify_team_access(auth, team_id)
         
-        logger.info(f"Looking for session: {session_id}")
-        logger.info(f"Available sessions: {list(server_state.encrypted_sessions.keys())}")
+        # Get detailed roster data alongside the weekly rosters
+        weeks = list(range(start_week, min(end_week + 1, 18)))
+        since = resolve_since_version(request)
+        etag_params = (str(team_id), request.get('format'), since)
+        etag = cached_response_etag(auth, 'team-analysis', etag_params, league_id, year, ["mRoster&mMatchup"], weeks)
+        if etag and etag_matches(http_request.headers.get('if-none-match'), etag):
+            return not_modified(etag)
         
-        if session_id not in server_state.encrypted_sessions:
-            # Try to find any session for this league as fallback
-            session_found = None
-            for stored_session_id, session_info in server_state.encrypted_sessions.items():
-                if session_info.get('league_id') == session_data['league_id']:
-                    session_found = stored_session_id
-                    logger.info(f"Found fallback session: {session_found}")
-                    break
-            
-            if not session_found:
-                raise HTTPException(status_code=401, detail="Session not found - please re-authenticate")
-            session_id = session_found
-        
-        user_teams = server_state.encrypted_sessions[session_id]['user_teams']
-        user_team_ids = [team['team_id'] for team in user_teams]
+        logger.debug("Fetching weekly data for team %s from week %s to %s", team_id, start_week, end_week)
         
-        logger.info(f"User teams: {user_team_ids}, requested team: {team_id}")
-        
-        if int(team_id) not in user_team_ids:
-            raise HTTPException(status_code=403, detail="Access denied to this team")
-        
-        # Get detailed roster data
-        data = make_espn_request(session_token, league_id, year, "mRoster&mMatchup")
+        # Taken before reading any records: later changes are versioned above it
+        data_version = current_data_version()
+        data, (week_records, failed_weeks, _) = await asyncio.gather(
+            make_espn_request(auth, league_id, year, "mRoster&mMatchup"),
+            get_week_records(auth, league_id, year, weeks, max_concurrency=resolve_week_concurrency(request))
+        )
         
         # Find the specific team
         team_data = None
@@ -669,111 +2607,29 @@ async def secure_get_team_analysis(
         if not team_data:
             raise HTTPException(status_code=404, detail="Team not found")
         
-        # Process weekly lineup data for efficiency analysis
+        # Process weekly lineup data for efficiency analysis. In delta mode only
+        # team-weeks changed since the client's version are sent.
         weekly_analysis = {}
-        
-        logger.info(f"Fetching weekly data for team {team_id} from week {start_week} to {end_week}")
-        
-        # Get weekly roster data for each week
-        for week in range(start_week, min(end_week + 1, 18)):
-            try:
-                logger.info(f"Fetching week {week} data...")
-                
-                # Get roster data with lineup information for this week
-                week_data = make_espn_request(
-                    session_token, 
-                    league_id, 
-                    year, 
-                    "mRoster",
-                    scoring_period=week
-                )
-                
-                # Find team's roster for this week
-                team_week_data = None
-                for team in week_data.get('teams', []):
-                    if str(team.get('id')) == str(team_id):
-                        team_week_data = team
-                        break
-                
-                if not team_week_data or 'roster' not in team_week_data:
-                    logger.warning(f"No roster data found for team {team_id} in week {week}")
-                    continue
-                
-                # Process roster entries
-                lineup_players = []
-                bench_players = []
-                
-                for entry in team_week_data['roster'].get('entries', []):
-                    player_pool_entry = entry.get('playerPoolEntry', {})
-                    player = player_pool_entry.get('player', {})
-                    lineup_slot_id = entry.get('lineupSlotId', 20)  # 20 = bench
-                    
-                    # Get player stats for this week - find both actual and projected points
-                    fantasy_points = 0.0
-                    projected_points = 0.0
-                    stats = player.get('stats', [])
-                    
-                    # Try to find the stat with actual scoring data (not projected)
-                    # Priority 1: scoringPeriodId=week, statSourceId=0, statSplitTypeId=1 (most accurate)
-                    for stat in stats:
-                        if (stat.get('scoringPeriodId') == week and 
-                            stat.get('statSourceId') == 0 and 
-                            stat.get('statSplitTypeId') == 1):
-                            fantasy_points = stat.get('appliedTotal', 0.0)
-                            logger.info(f"Found actual stat for {player.get('fullName', 'Unknown')} week {week}: {fantasy_points}")
-                            break
-                    
-                    # Priority 2: If not found, try scoringPeriodId=week, statSourceId=0 (any statSplitTypeId)  
-                    if fantasy_points == 0.0:
-                        for stat in stats:
-                            if (stat.get('scoringPeriodId') == week and 
-                                stat.get('statSourceId') == 0):
-                                fantasy_points = stat.get('appliedTotal', 0.0)
-                                logger.info(f"Found fallback stat for {player.get('fullName', 'Unknown')} week {week}: {fantasy_points}")
-                                break
-                    
-                    # Try to find projected points - usually statSourceId=1 for projections
-                    for stat in stats:
-                        if (stat.get('scoringPeriodId') == week and 
-                            stat.get('statSourceId') == 1):
-                            projected_points = stat.get('appliedTotal', 0.0)
-                            logger.info(f"Found projected stat for {player.get('fullName', 'Unknown')} week {week}: {projected_points}")
-                            break
-                    
-                    # Get player info
-                    player_info = {
-                        'name': player.get('fullName', 'Unknown Player'),
-                        'position': get_position_name(player.get('defaultPositionId', 0)),
-                        'points': fantasy_points,
-                        'projected': projected_points,
-                        'player_id': player.get('id', 0),
-                        'lineup_slot': lineup_slot_id
-                    }
-                    
-                    # Categorize as lineup or bench (IR = 21, Bench = 20)
-                    if lineup_slot_id in [20, 21]:  # Bench or IR
-                        bench_players.append(player_info)
-                    else:  # Active lineup (QB=0, RB=2, WR=4, TE=6, FLEX=23, K=17, D/ST=16)
-                        lineup_players.append(player_info)
-                
-                # Store week data
-                weekly_analysis[str(week)] = {
-                    'teamRosters': {
-                        str(team_id): {
-                            'team_id': str(team_id),
-                            'team_name': team_week_data.get('name', 'Unknown Team'),
-                            'owner_name': team_week_data.get('owners', [{}])[0].get('displayName', 'Unknown Owner'),
-                            'lineup': lineup_players,
-                            'bench': bench_players
-                        }
-                    }
-                }
-                
-                logger.info(f"Week {week}: Found {len(lineup_players)} lineup players, {len(bench_players)} bench players")
-                
-            except Exception as e:
-                logger.error(f"Failed to fetch week {week} data: {str(e)}")
+        removed_weeks = []
+        weeks_processed = 0
+        
+        for week, week_teams in week_records.items():
+            team_week = week_teams.get(str(team_id))
+            if not team_week:
+                logger.debug("No roster data found for team %s in week %s", team_id, week)
+                if team_week_removed(league_id, year, week, since):
+                    removed_weeks.append(week)
+                continue
+            
+            weeks_processed += 1
+            if not team_week_changed(league_id, year, week, str(team_id), since):
                 continue
+            
+            weekly_analysis[str(week)] = compact.team_week(team_week) if compact else {
+                'teamRosters': {
+                    str(team_id): team_week.to_dict()
+                }
+            }
         
         analysis_result = {
             'team_id': str(team_data.get('id')),
@@ -781,24 +2637,34 @@ async def secure_get_team_analysis(
             'owner_name': team_data.get('owners', [{}])[0].get('displayName', 'Unknown Owner'),
             'season': year,
             'league_id': league_id,
-            'weeks_analyzed': list(range(start_week, min(end_week + 1, 18))),
+            'weeks_analyzed': weeks,
             'weekly_data': weekly_analysis,
-            'total_weeks_processed': len(weekly_analysis),
-            'message': f'Successfully processed {len(weekly_analysis)} weeks of real ESPN data'
+            'total_weeks_processed': weeks_processed,
+            'failed_weeks': failed_weeks,
+            'data_version': data_version,
+            'delta': since is not None,
+            'message': f'Successfully processed {weeks_processed} weeks of real ESPN data'
         }
+        if since is not None:
+            analysis_result['removed_weeks'] = removed_weeks
+        if compact:
+            analysis_result.update(compact.tables())
         
-        return analysis_result
+        etag = None if failed_weeks else response_etag(
+            'team-analysis', etag_params, league_id, year, ["mRoster&mMatchup"], weeks
+        )
+        return conditional_json_response(http_request, analysis_result, etag)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in team analysis: {str(e)}", exc_info=True)
+        logger.error("Error in team analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @app.post("/secure-league-matchups")
 async def secure_get_league_matchups(
     request: dict,
-    session_token: str = Depends(get_current_session)
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get all weekly matchups for the entire league"""
     server_state.request_count += 1
@@ -813,73 +2679,38 @@ async def secure_get_league_matchups(
         if not week:
             raise HTTPException(status_code=400, detail="Week required")
         
-        logger.info(f"Getting matchups for league {league_id}, week {week}, year {year}")
+        logger.debug("Getting matchups for league %s, week %s, year %s", league_id, week, year)
         
         # Get matchup data
-        data = make_espn_request(session_token, league_id, year, "mMatchup", scoring_period=week)
-        
-        # Build matchup data
-        matchups = []
-        schedule = data.get('schedule', [])
-        
-        for matchup in schedule:
-            if matchup.get('matchupPeriodId') == week:
-                home_team = matchup.get('home', {})
-                away_team = matchup.get('away', {})
-                
-                # Get team names from teams data
-                home_team_name = "Unknown Team"
-                away_team_name = "Unknown Team"
-                
-                for team in data.get('teams', []):
-                    if team.get('id') == home_team.get('teamId'):
-                        home_team_name = team.get('name', 'Unknown Team')
-                    elif team.get('id') == away_team.get('teamId'):
-                        away_team_name = team.get('name', 'Unknown Team')
-                
-                matchup_data = {
-                    'matchupId': matchup.get('id'),
-                    'week': week,
-                    'homeTeam': {
-                        'teamId': home_team.get('teamId'),
-                        'teamName': home_team_name,
-                        'score': home_team.get('totalPoints', 0)
-                    },
-                    'awayTeam': {
-                        'teamId': away_team.get('teamId'),
-                        'teamName': away_team_name,
-                        'score': away_team.get('totalPoints', 0)
-                    },
-                    'winner': 'home' if home_team.get('totalPoints', 0) > away_team.get('totalPoints', 0) else 'away'
-                }
-                matchups.append(matchup_data)
+        data = await make_espn_request(auth, league_id, year, "mMatchup", scoring_period=week)
         
         return {
             'league_id': league_id,
             'week': week,
             'year': year,
-            'matchups': matchups
+            'matchups': build_matchups(data, week)
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching matchups: {str(e)}", exc_info=True)
+        logger.error("Error fetching matchups: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch matchups: {str(e)}")
 
 @app.get("/debug-sessions")
 async def debug_sessions():
     """Debug endpoint to see current sessions"""
-    session_keys = list(server_state.encrypted_sessions.keys())
+    session_keys = await state_call(server_state.sessions.session_ids)
     return {
         "total_sessions": len(session_keys),
         "session_keys": session_keys
     }
 
-@app.post("/secure-all-teams-analysis")
+@app.post("/secure-all-teams-analysis", response_class=FastJSONResponse)
 async def secure_get_all_teams_analysis(
     request: dict,
-    session_token: str = Depends(get_current_session)
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get efficiency analysis for all teams in the league"""
     server_state.request_count += 1
@@ -891,202 +2722,54 @@ async def secure_get_all_teams_analysis(
         end_week = request.get('end_week', 17)
         
         league_id, year = validate_inputs(league_id, year)
-        
-        # Check cache first (DISABLED FOR TEAM NAME DEBUGGING)
-        cache_key = get_cache_key(league_id, year, start_week, end_week)
-        cached_result = None  # get_cached_analysis(cache_key)
-        if cached_result:
-            logger.info(f"Returning cached analysis for league {league_id}")
-            return cached_result
-        
-        logger.info(f"Getting all teams analysis for league {league_id} (cache miss - will compute)")
-        
-        # Get league data to get all team IDs - try mTeam view for more detailed team info
-        league_data = make_espn_request(session_token, league_id, year, view="mTeam")
-        teams = league_data.get('teams', [])
-        members = league_data.get('members', [])
-        
-        logger.info(f"Retrieved {len(teams)} teams from ESPN API with mTeam view")
-        logger.info(f"Retrieved {len(members)} members from ESPN API")
-        
-        # Create member lookup dictionary for owner names
-        member_lookup = {}
-        for member in members:
-            member_id = member.get('id', '').replace('{', '').replace('}', '')
-            display_name = member.get('displayName', '')
-            if member_id and display_name:
-                member_lookup[member_id] = display_name
-                logger.info(f"Member lookup: {member_id} -> {display_name}")
-        
-        all_teams_data = {}
-        
-        # Process each team
-        for team in teams:
-            team_id = str(team.get('id'))
-            # Extract team name properly - try multiple ESPN fields with better fallbacks
-            team_name = None
-            
-            # Debug: Log all available team fields
-            logger.info(f"Team {team_id} raw data fields: {list(team.keys())}")
-            logger.info(f"Team {team_id} name fields: name={team.get('name')}, teamName={team.get('teamName')}, abbrev={team.get('abbrev')}, location={team.get('location')}, nickname={team.get('nickname')}")
-            
-            # Try various ESPN team name fields in order of preference  
-            # ESPN typically stores custom team names in "location" field
-            potential_names = [
-                team.get('location'),  # Full custom team name (e.g. "Scott Hanson's Witching Hour")
-                team.get('nickname'),  # Team nickname
-                # Combine location + nickname if both exist
-                f"{team.get('location', '')} {team.get('nickname', '')}".strip() if team.get('location') and team.get('nickname') else None,
-                team.get('name'),
-                team.get('teamName'),
-                team.get('abbrev'),  # Last resort - abbreviation
-            ]
-            
-            for name in potential_names:
-                if name and name.strip() and not name.startswith('{') and len(name.strip()) > 2:
-                    team_name = name.strip()
-                    break
-            
-            # If no direct name found, try location + nickname
-            if not team_name:
-                location = team.get('location', '').strip()
-                nickname = team.get('nickname', '').strip()
-                if location and nickname:
-                    team_name = f"{location} {nickname}"
-                elif location:
-                    team_name = location
-                elif nickname:
-                    team_name = nickname
-            
-            # Final fallback
-            if not team_name:
-                team_name = f"Team {team_id}"
-            
-            logger.info(f"Processing team {team_id}: {team_name}")
-            
-            # Get weekly data for this team
-            weekly_analysis = {}
-            
-            for week in range(start_week, min(end_week + 1, 18)):
-                try:
-                    # Get roster data for this week
-                    week_data = make_espn_request(
-                        session_token, 
-                        league_id, 
-                        year, 
-                        "mRoster",
-                        scoring_period=week
-                    )
-                    
-                    # Find this team's roster
-                    team_week_data = None
-                    for team_roster in week_data.get('teams', []):
-                        if str(team_roster.get('id')) == team_id:
-                            team_week_data = team_roster
-                            break
-                    
-                    if not team_week_data or 'roster' not in team_week_data:
-                        continue
-                    
-                    # Process roster entries
-                    lineup_players = []
-                    bench_players = []
-                    
-                    for entry in team_week_data['roster'].get('entries', []):
-                        player_pool_entry = entry.get('playerPoolEntry', {})
-                        player = player_pool_entry.get('player', {})
-                        lineup_slot_id = entry.get('lineupSlotId', 20)
-                        
-                        # Get player stats for this week
-                        fantasy_points = 0.0
-                        stats = player.get('stats', [])
-                        for stat in stats:
-                            if (stat.get('scoringPeriodId') == week and 
-                                stat.get('statSourceId') == 0 and 
-                                stat.get('statSplitTypeId') == 1):
-                                # Use appliedTotal from the actual scoring stat (not projected)
-                                fantasy_points = stat.get('appliedTotal', 0.0)
-                                break
-                        
-                        player_info = {
-                            'name': player.get('fullName', 'Unknown Player'),
-                            'position': get_position_name(player.get('defaultPositionId', 0)),
-                            'points': fantasy_points,
-                            'player_id': player.get('id', 0),
-                            'lineup_slot': lineup_slot_id
-                        }
-                        
-                        if lineup_slot_id in [20, 21]:  # Bench or IR
-                            bench_players.append(player_info)
-                        else:  # Active lineup (QB=0, RB=2, WR=4, TE=6, FLEX=23, K=17, D/ST=16)
-                            lineup_players.append(player_info)
-                    
-                    weekly_analysis[str(week)] = {
-                        'lineup': lineup_players,
-                        'bench': bench_players
-                    }
-                    
-                except Exception as e:
-                    logger.error(f"Failed to fetch week {week} data for team {team_id}: {str(e)}")
+        compact = resolve_response_format(request)
+        
+        logger.debug("Getting all teams analysis for league %s", league_id)
+        
+        # Get league data to get all team IDs - try mTeam view for more detailed team info.
+        # Weekly rosters are fetched concurrently alongside it.
+        weeks = list(range(start_week, min(end_week + 1, 18)))
+        since = resolve_since_version(request)
+        etag_params = (request.get('format'), since)
+        etag = cached_response_etag(auth, 'all-teams', etag_params, league_id, year, ["mTeam"], weeks)
+        if etag and etag_matches(http_request.headers.get('if-none-match'), etag):
+            return not_modified(etag)
+        
+        # Taken before reading any records: later changes are versioned above it
+        data_version = current_data_version()
+        league_data, (week_records, failed_weeks, weeks_fetched) = await asyncio.gather(
+            make_espn_request(auth, league_id, year, view="mTeam"),
+            get_week_records(auth, league_id, year, weeks, max_concurrency=resolve_week_concurrency(request))
+        )
+        upstream_calls = request_upstream_calls()
+        logger.debug("Retrieved %s teams from ESPN API with mTeam view", len(league_data.get('teams', [])))
+        
+        all_teams_data = {
+            team_id: {**team_info, 'weekly_data': {}, 'weeks_processed': 0}
+            for team_id, team_info in resolve_league_teams(league_data).items()
+        }
+        if since is not None:
+            for team_data in all_teams_data.values():
+                team_data['removed_weeks'] = []
+        
+        # Week-major pass: each mRoster response already carries every team's
+        # roster, so each scoring period was fetched once and is split across teams.
+        # In delta mode only team-weeks changed since the client's version are sent.
+        for week, week_teams in week_records.items():
+            for team_id, team_data in all_teams_data.items():
+                team_week = week_teams.get(team_id)
+                if team_week is None:
+                    if team_week_removed(league_id, year, week, since):
+                        team_data['removed_weeks'].append(week)
                     continue
-            
-            # Extract owner information properly - enhanced with member lookup
-            owners = team.get('owners', [])
-            owner_name = 'Unknown Owner'
-            owner_id = None
-            
-            logger.info(f"Team {team_id} owners field: {owners}")
-            
-            # First try to get owner ID from various sources
-            if owners:
-                owner = owners[0]
-                if isinstance(owner, dict):
-                    owner_id = owner.get('id', '').replace('{', '').replace('}', '')
-                    # Try multiple owner name fields from the owner object
-                    potential_owner_names = [
-                        owner.get('displayName'),
-                        owner.get('username'), 
-                        owner.get('firstName', '') + ' ' + owner.get('lastName', ''),
-                    ]
-                    
-                    for name in potential_owner_names:
-                        if name and name.strip() and not name.startswith('{') and len(name.strip()) > 1:
-                            owner_name = name.strip()
-                            logger.info(f"Found owner name from team data: {owner_name}")
-                            break
-                elif isinstance(owner, str):
-                    # Owner might be just an ID string
-                    owner_id = owner.replace('{', '').replace('}', '')
-                    # Clean up owner ID strings as potential names
-                    if not owner.startswith('{') and len(owner) < 50:  # Reasonable name length
-                        owner_name = owner.replace('-', ' ').strip()
-            
-            # Try primaryOwner field if no success yet            
-            if owner_name == 'Unknown Owner':
-                primary_owner = team.get('primaryOwner')
-                if isinstance(primary_owner, dict):
-                    owner_id = primary_owner.get('id', '').replace('{', '').replace('}', '')
-                    display_name = primary_owner.get('displayName')
-                    if display_name and not display_name.startswith('{'):
-                        owner_name = display_name
-                        logger.info(f"Found owner name from primaryOwner: {owner_name}")
-                elif isinstance(primary_owner, str):
-                    owner_id = primary_owner.replace('{', '').replace('}', '')
-            
-            # Finally, try member lookup if we have an owner ID
-            if owner_name == 'Unknown Owner' and owner_id and owner_id in member_lookup:
-                owner_name = member_lookup[owner_id]
-                logger.info(f"Found owner name from member lookup: {owner_name}")
-            
-            logger.info(f"Final owner for team {team_id}: {owner_name} (ID: {owner_id})")
-            
-            all_teams_data[team_id] = {
-                'team_id': team_id,
-                'team_name': team_name,
-                'owner_name': owner_name,
-                'weekly_data': weekly_analysis,
-                'weeks_processed': len(weekly_analysis)
-            }
+                
+                team_data['weeks_processed'] += 1
+                if team_week_changed(league_id, year, week, team_id, since):
+                    team_data['weekly_data'][str(week)] = (
+                        compact.team_week(team_week) if compact else team_week.rosters_dict()
+                    )
+        
+        logger.debug("All teams analysis for league %s needed %s ESPN requests (%s weeks from result cache)", league_id, upstream_calls, len(weeks) - weeks_fetched)
         
         # Prepare result
         result = {
@@ -1094,26 +2777,270 @@ async def secure_get_all_teams_analysis(
             'year': year,
             'teams': all_teams_data,
             'total_teams': len(all_teams_data),
-            'weeks_range': f"{start_week}-{end_week}"
+            'weeks_range': f"{start_week}-{end_week}",
+            'failed_weeks': failed_weeks,
+            'data_version': data_version,
+            'delta': since is not None,
+            'metadata': {
+                'upstream_calls': upstream_calls
+            }
         }
+        if compact:
+            result.update(compact.tables())
         
-        # Cache the result for future requests (DISABLED FOR DEBUGGING)
-        # set_cached_analysis(cache_key, result)
-        
-        return result
+        etag = None if failed_weeks else response_etag('all-teams', etag_params, league_id, year, ["mTeam"], weeks)
+        return conditional_json_response(http_request, result, etag)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in all teams analysis: {str(e)}", exc_info=True)
+        logger.error("Error in all teams analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"All teams analysis failed: {str(e)}")
 
+def build_league_analytics(
+    week_records: Dict[int, Dict[str, TeamWeek]],
+    league_teams: Dict[str, Dict],
+    slot_counts: Dict[int, int],
+    include_players: bool
+) -> Tuple[Dict[str, Dict], Dict]:
+    """Per-team process scores and the league summary from one columnar store"""
+    store = LeagueSeasonStore.from_week_records(week_records, list(league_teams))
+    summary = league_summary(store, league_teams)
+    if slot_counts:
+        optimal = optimal_lineup_summary(store, slot_counts, league_teams)
+        summary['leaderboards'].update(optimal.pop('leaderboards'))
+        summary['optimalLineups'] = optimal
+    return analyze_league_season(store, league_teams, include_players), summary
+
+@app.post("/secure-league-process-scores", response_class=FastJSONResponse)
+async def secure_get_league_process_scores(
+    request: dict,
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Finished season process-score analytics for every team in the league"""
+    server_state.request_count += 1
+
+    try:
+        league_id = request.get('league_id')
+        year = request.get('year', 2024)
+        start_week = request.get('start_week', 1)
+        end_week = request.get('end_week', 17)
+        include_players = bool(request.get('include_players', False))
+
+        league_id, year = validate_inputs(league_id, year)
+
+        logger.debug("Getting process scores for league %s", league_id)
+
+        weeks = list(range(start_week, min(end_week + 1, 18)))
+        if not weeks:
+            raise HTTPException(status_code=400, detail="Invalid week range")
+        etag_params = (include_players,)
+        etag = cached_response_etag(auth, 'process-scores', etag_params, league_id, year, ["mTeam&mSettings"], weeks)
+        if etag and etag_matches(http_request.headers.get('if-none-match'), etag):
+            return not_modified(etag)
+        
+        league_data, (week_records, failed_weeks, _) = await asyncio.gather(
+            make_espn_request(auth, league_id, year, view="mTeam&mSettings"),
+            get_week_records(auth, league_id, year, weeks, max_concurrency=resolve_week_concurrency(request))
+        )
+        slot_counts = starting_slot_counts(league_data.get('settings', {}))
+
+        # Scoring is CPU-bound NumPy work; keep it off the event loop
+        teams, summary = await asyncio.to_thread(
+            build_league_analytics, week_records, resolve_league_teams(league_data), slot_counts, include_players
+        )
+
+        result = {
+            'league_id': league_id,
+            'year': year,
+            'teams': teams,
+            'total_teams': len(teams),
+            'weeks_range': f"{start_week}-{end_week}",
+            'league_summary': summary,
+            'failed_weeks': failed_weeks,
+            'metadata': {
+                'upstream_calls': request_upstream_calls()
+            }
+        }
+        
+        etag = None if failed_weeks else response_etag(
+            'process-scores', etag_params, league_id, year, ["mTeam&mSettings"], weeks
+        )
+        return conditional_json_response(http_request, result, etag)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in league process scores: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"League process scores failed: {str(e)}")
+
+async def stream_all_teams_records(
+    auth: AuthContext,
+    league_id: str,
+    year: int,
+    start_week: int,
+    end_week: int,
+    max_concurrency: int
+) -> AsyncIterator[Dict]:
+    """League header, then one record per week as it completes, then a summary"""
+    weeks = list(range(start_week, min(end_week + 1, 18)))
+    league_task = asyncio.ensure_future(make_espn_request(auth, league_id, year, view="mTeam"))
+    league_teams = None
+    weeks_processed = 0
+    failed_weeks = []
+    
+    async def league_header() -> Dict:
+        nonlocal league_teams
+        league_teams = resolve_league_teams(await league_task)
+        return {'type': 'league', 'league_id': league_id, 'year': year, 'teams': league_teams}
+    
+    try:
+        async for week, week_teams, failure in iter_week_records(
+            auth, league_id, year, weeks, max_concurrency
+        ):
+            if league_teams is None:
+                yield await league_header()
+            
+            if failure:
+                failed_weeks.append(failure)
+                yield {'type': 'week_failed', **failure}
+                continue
+            
+            weeks_processed += 1
+            yield {
+                'type': 'week',
+                'week': week,
+                'teams': {
+                    team_id: team_week.rosters_dict()
+                    for team_id, team_week in week_teams.items()
+                    if team_id in league_teams
+                }
+            }
+        
+        if league_teams is None:
+            yield await league_header()
+    finally:
+        if not league_task.done():
+            league_task.cancel()
+    
+    yield {
+        'type': 'summary',
+        'league_id': league_id,
+        'year': year,
+        'total_teams': len(league_teams),
+        'weeks_range': f"{start_week}-{end_week}",
+        'weeks_processed': weeks_processed,
+        'failed_weeks': sorted(failed_weeks, key=lambda f: f['week']),
+        'metadata': {
+            'upstream_calls': request_upstream_calls()
+        }
+    }
+
+@app.post("/secure-all-teams-analysis/stream")
+async def secure_stream_all_teams_analysis(
+    request: dict,
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Stream the all-teams analysis as NDJSON or SSE, one record per completed week"""
+    server_state.request_count += 1
+    
+    league_id, year = validate_inputs(request.get('league_id'), request.get('year', 2024))
+    stream_format = resolve_stream_format(request, http_request.headers.get('accept'))
+    # Fail fast with a normal HTTP error before the stream starts
+    auth.require_league(league_id)
+    
+    records = stream_all_teams_records(
+        auth,
+        league_id,
+        year,
+        request.get('start_week', 1),
+        request.get('end_week', 17),
+        resolve_week_concurrency(request)
+    )
+    return streaming_analysis_response(records, stream_format)
+
+async def stream_team_records(
+    auth: AuthContext,
+    league_id: str,
+    team_id: str,
+    year: int,
+    start_week: int,
+    end_week: int,
+    max_concurrency: int
+) -> AsyncIterator[Dict]:
+    """One record per completed week for a single team, then a summary"""
+    weeks = list(range(start_week, min(end_week + 1, 18)))
+    weeks_processed = 0
+    failed_weeks = []
+    team_name = 'Unknown Team'
+    owner_name = 'Unknown Owner'
+    
+    async for week, week_teams, failure in iter_week_records(
+        auth, league_id, year, weeks, max_concurrency
+    ):
+        if failure:
+            failed_weeks.append(failure)
+            yield {'type': 'week_failed', **failure}
+            continue
+        
+        team_week = week_teams.get(team_id)
+        if not team_week:
+            continue
+        
+        weeks_processed += 1
+        team_name = team_week.team_name
+        owner_name = team_week.owner_name
+        yield {'type': 'week', 'week': week, 'teamRosters': {team_id: team_week.to_dict()}}
+    
+    yield {
+        'type': 'summary',
+        'team_id': team_id,
+        'team_name': team_name,
+        'owner_name': owner_name,
+        'season': year,
+        'league_id': league_id,
+        'weeks_analyzed': weeks,
+        'total_weeks_processed': weeks_processed,
+        'failed_weeks': sorted(failed_weeks, key=lambda f: f['week'])
+    }
+
+@app.post("/secure-team-analysis/stream")
+async def secure_stream_team_analysis(
+    request: dict,
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Stream a team's weekly analysis as NDJSON or SSE, one record per completed week"""
+    server_state.request_count += 1
+    
+    league_id, year = validate_inputs(request.get('league_id'), request.get('year', 2024))
+    team_id = request.get('team_id')
+    if not team_id:
+        raise HTTPException(status_code=400, detail="Team ID required")
+    
+    stream_format = resolve_stream_format(request, http_request.headers.get('accept'))
+    verify_team_access(auth, team_id)
+    auth.require_league(league_id)
+    
+    records = stream_team_records(
+        auth,
+        league_id,
+        str(team_id),
+        year,
+        request.get('start_week', 1),
+        request.get('end_week', 17),
+        resolve_week_concurrency(request)
+    )
+    return streaming_analysis_response(records, stream_format)
+
 # FAST LOADING ENDPOINTS - Added to fix 3-5 minute load times
 
 @app.post("/secure-team-instant")  
 async def secure_get_team_instant(
     request: dict,
-    session_token: str = Depends(get_current_session)
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get INSTANT basic team info - just current week for immediate display (< 1 second)"""
     server_state.request_count += 1
@@ -1129,8 +3056,7 @@ async def secure_get_team_instant(
             raise HTTPException(status_code=400, detail="Team ID required")
             
         # Verify user owns this team
-        session_data = SecurityManager.validate_session_token(session_token)
-        session_id = f"{session_data['user_id']}_{session_data['league_id']}"
+        session_id = auth.session_id
         
         # Get just current week data - minimal processing
         espn_session = get_espn_session(session_id)
@@ -1159,19 +3085,20 @@ async def secure_get_team_instant(
             }
             
         except Exception as espn_error:
-            logger.error(f"ESPN API error in instant load: {espn_error}")
+            logger.error("ESPN API error in instant load: %s", espn_error)
             raise HTTPException(status_code=500, detail=f"ESPN API error: {str(espn_error)}")
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in instant load: {e}")
+        logger.error("Unexpected error in instant load: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.post("/secure-team-quick-summary")
+@app.post("/secure-team-quick-summary", response_class=FastJSONResponse)
 async def secure_get_team_quick_summary(
     request: dict,
-    session_token: str = Depends(get_current_session)
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get basic team summary with current week only - FAST loading"""
     server_state.request_count += 1
@@ -1182,149 +3109,84 @@ async def secure_get_team_quick_summary(
         year = request.get('year', 2024)
         
         league_id, year = validate_inputs(league_id, year)
+        compact = resolve_response_format(request)
         
         if not team_id:
             raise HTTPException(status_code=400, detail="Team ID required")
         
         # Verify user owns this team
-        session_data = SecurityManager.validate_session_token(session_token)
-        session_id = f"{session_data['user_id']}_{session_data['league_id']}"
-        
-        if session_id not in server_state.encrypted_sessions:
-            # Try to find fallback session
-            session_found = None
-            for stored_session_id, session_info in server_state.encrypted_sessions.items():
-                if session_info.get('league_id') == session_data['league_id']:
-                    session_found = stored_session_id
-                    break
-            if not session_found:
-                raise HTTPException(status_code=401, detail="Session not found - please re-authenticate")
-            session_id = session_found
-        
-        user_teams = server_state.encrypted_sessions[session_id]['user_teams']
-        user_team_ids = [team['team_id'] for team in user_teams]
-        
-        if int(team_id) not in user_team_ids:
-            raise HTTPException(status_code=403, detail="Access denied to this team")
+        verify_team_access(auth, team_id)
+        
+        def recent_weeks(league_data: Dict) -> Tuple[int, List[int]]:
+            # ONLY the last 3 weeks for quick loading (current + 2 previous)
+            current_week = league_data.get('scoringPeriodId', 1)
+            return current_week, list(range(max(1, current_week - 2), min(current_week + 1, 18)))
+        
+        etag_params = (str(team_id), request.get('format'))
+        cached_league_data = upstream_cache.peek((league_id, year, "mTeam&mSettings", None))
+        if cached_league_data is not None:
+            etag = cached_response_etag(
+                auth, 'quick-summary', etag_params, league_id, year,
+                ["mTeam&mSettings"], recent_weeks(cached_league_data)[1]
+            )
+            if etag and etag_matches(http_request.headers.get('if-none-match'), etag):
+                return not_modified(etag)
         
         # Get current league data to find current week
-        league_data = make_espn_request(session_token, league_id, year, "mTeam&mSettings")
-        current_week = league_data.get('scoringPeriodId', 1)
+        league_data = await make_espn_request(auth, league_id, year, "mTeam&mSettings")
+        current_week, weeks = recent_weeks(league_data)
+        start_week, end_week = max(1, current_week - 2), current_week
         
-        # Get ONLY the last 3 weeks for quick loading (current + 2 previous)
-        start_week = max(1, current_week - 2)
-        end_week = current_week
-        
-        logger.info(f"Quick summary: Fetching weeks {start_week}-{end_week} for team {team_id}")
+        logger.debug("Quick summary: Fetching weeks %s-%s for team %s", start_week, end_week, team_id)
         
         # Process only recent weeks
+        week_records, failed_weeks, _ = await get_week_records(
+            auth, league_id, year, weeks, max_concurrency=resolve_week_concurrency(request)
+        )
+        
         weekly_analysis = {}
-        for week in range(start_week, min(end_week + 1, 18)):
-            try:
-                week_data = make_espn_request(
-                    session_token, 
-                    league_id, 
-                    year, 
-                    "mRoster",
-                    scoring_period=week
-                )
-                
-                team_week_data = None
-                for team in week_data.get('teams', []):
-                    if str(team.get('id')) == str(team_id):
-                        team_week_data = team
-                        break
-                
-                if not team_week_data or 'roster' not in team_week_data:
-                    continue
-                
-                # Process roster entries (same logic as before)
-                lineup_players = []
-                bench_players = []
-                
-                for entry in team_week_data['roster'].get('entries', []):
-                    player_pool_entry = entry.get('playerPoolEntry', {})
-                    player = player_pool_entry.get('player', {})
-                    lineup_slot_id = entry.get('lineupSlotId', 20)
-                    
-                    fantasy_points = 0.0
-                    projected_points = 0.0
-                    stats = player.get('stats', [])
-                    
-                    # Get actual points
-                    for stat in stats:
-                        if (stat.get('scoringPeriodId') == week and 
-                            stat.get('statSourceId') == 0 and 
-                            stat.get('statSplitTypeId') == 1):
-                            fantasy_points = stat.get('appliedTotal', 0.0)
-                            break
-                    
-                    if fantasy_points == 0.0:
-                        for stat in stats:
-                            if (stat.get('scoringPeriodId') == week and 
-                                stat.get('statSourceId') == 0):
-                                fantasy_points = stat.get('appliedTotal', 0.0)
-                                break
-                    
-                    # Get projected points
-                    for stat in stats:
-                        if (stat.get('scoringPeriodId') == week and 
-                            stat.get('statSourceId') == 1):
-                            projected_points = stat.get('appliedTotal', 0.0)
-                            break
-                    
-                    player_info = {
-                        'name': player.get('fullName', 'Unknown Player'),
-                        'position': get_position_name(player.get('defaultPositionId', 0)),
-                        'points': fantasy_points,
-                        'projected': projected_points,
-                        'player_id': player.get('id', 0),
-                        'lineup_slot': lineup_slot_id
-                    }
-                    
-                    if lineup_slot_id in [20, 21]:
-                        bench_players.append(player_info)
-                    else:
-                        lineup_players.append(player_info)
-                
-                weekly_analysis[str(week)] = {
-                    'teamRosters': {
-                        str(team_id): {
-                            'team_id': str(team_id),
-                            'team_name': team_week_data.get('name', 'Unknown Team'),
-                            'owner_name': team_week_data.get('owners', [{}])[0].get('displayName', 'Unknown Owner'),
-                            'lineup': lineup_players,
-                            'bench': bench_players
-                        }
-                    }
-                }
-                
-            except Exception as e:
-                logger.error(f"Quick summary - Failed to fetch week {week}: {str(e)}")
+        for week, week_teams in week_records.items():
+            team_week = week_teams.get(str(team_id))
+            if not team_week:
                 continue
+            
+            weekly_analysis[str(week)] = compact.team_week(team_week) if compact else {
+                'teamRosters': {
+                    str(team_id): team_week.to_dict()
+                }
+            }
         
-        return {
+        result = {
             'team_id': str(team_id),
             'season': year,
             'league_id': league_id,
             'current_week': current_week,
-            'weeks_analyzed': list(range(start_week, min(end_week + 1, 18))),
+            'weeks_analyzed': weeks,
             'weekly_data': weekly_analysis,
+            'failed_weeks': failed_weeks,
             'is_partial': True,
             'message': f'Quick summary loaded {len(weekly_analysis)} recent weeks. Full season available separately.',
             'full_season_available': True
         }
+        if compact:
+            result.update(compact.tables())
+        
+        etag = None if failed_weeks else response_etag(
+            'quick-summary', etag_params, league_id, year, ["mTeam&mSettings"], weeks
+        )
+        return conditional_json_response(http_request, result, etag)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in quick team summary: {str(e)}", exc_info=True)
+        logger.error("Error in quick team summary: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Quick summary failed: {str(e)}")
 
-@app.post("/secure-team-week-range")
+@app.post("/secure-team-week-range", response_class=FastJSONResponse)
 async def secure_get_team_week_range(
     request: dict,
-    session_token: str = Depends(get_current_session)
+    http_request: Request,
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """Get team analysis for a specific week range - for progressive loading"""
     server_state.request_count += 1
@@ -1339,173 +3201,127 @@ async def secure_get_team_week_range(
         # Limit range to prevent long loading times
         if end_week - start_week > 6:
             end_week = start_week + 6
-            logger.warning(f"Week range limited to 7 weeks maximum: {start_week}-{end_week}")
+            logger.warning("Week range limited to 7 weeks maximum: %s-%s", start_week, end_week)
         
         league_id, year = validate_inputs(league_id, year)
+        compact = resolve_response_format(request)
         
         if not team_id:
             raise HTTPException(status_code=400, detail="Team ID required")
         
         # Verify user owns this team
-        session_data = SecurityManager.validate_session_token(session_token)
-        session_id = f"{session_data['user_id']}_{session_data['league_id']}"
-        
-        if session_id not in server_state.encrypted_sessions:
-            # Try to find fallback session
-            session_found = None
-            for stored_session_id, session_info in server_state.encrypted_sessions.items():
-                if session_info.get('league_id') == session_data['league_id']:
-                    session_found = stored_session_id
-                    break
-            if not session_found:
-                raise HTTPException(status_code=401, detail="Session not found - please re-authenticate")
-            session_id = session_found
+        verify_team_access(auth, team_id)
         
-        user_teams = server_state.encrypted_sessions[session_id]['user_teams']
-        user_team_ids = [team['team_id'] for team in user_teams]
+        logger.debug("Week range request: Fetching weeks %s-%s for team %s", start_week, end_week, team_id)
         
-        if int(team_id) not in user_team_ids:
-            raise HTTPException(status_code=403, detail="Access denied to this team")
+        # Use the same logic as the original but for limited range
+        weeks = list(range(start_week, min(end_week + 1, 18)))
+        etag_params = (str(team_id), start_week, end_week, request.get('format'))
+        etag = cached_response_etag(auth, 'week-range', etag_params, league_id, year, [], weeks)
+        if etag and etag_matches(http_request.headers.get('if-none-match'), etag):
+            return not_modified(etag)
         
-        logger.info(f"Week range request: Fetching weeks {start_week}-{end_week} for team {team_id}")
+        week_records, failed_weeks, _ = await get_week_records(
+            auth, league_id, year, weeks, max_concurrency=resolve_week_concurrency(request)
+        )
         
-        # Use the same logic as the original but for limited range
         weekly_analysis = {}
-        for week in range(start_week, min(end_week + 1, 18)):
-            try:
-                week_data = make_espn_request(
-                    session_token, 
-                    league_id, 
-                    year, 
-                    "mRoster",
-                    scoring_period=week
-                )
-                
-                team_week_data = None
-                for team in week_data.get('teams', []):
-                    if str(team.get('id')) == str(team_id):
-                        team_week_data = team
-                        break
-                
-                if not team_week_data or 'roster' not in team_week_data:
-                    continue
-                
-                # Process roster entries (same logic as original)
-                lineup_players = []
-                bench_players = []
-                
-                for entry in team_week_data['roster'].get('entries', []):
-                    player_pool_entry = entry.get('playerPoolEntry', {})
-                    player = player_pool_entry.get('player', {})
-                    lineup_slot_id = entry.get('lineupSlotId', 20)
-                    
-                    fantasy_points = 0.0
-                    projected_points = 0.0
-                    stats = player.get('stats', [])
-                    
-                    # Get actual points
-                    for stat in stats:
-                        if (stat.get('scoringPeriodId') == week and 
-                            stat.get('statSourceId') == 0 and 
-                            stat.get('statSplitTypeId') == 1):
-                            fantasy_points = stat.get('appliedTotal', 0.0)
-                            break
-                    
-                    if fantasy_points == 0.0:
-                        for stat in stats:
-                            if (stat.get('scoringPeriodId') == week and 
-                                stat.get('statSourceId') == 0):
-                                fantasy_points = stat.get('appliedTotal', 0.0)
-                                break
-                    
-                    # Get projected points
-                    for stat in stats:
-                        if (stat.get('scoringPeriodId') == week and 
-                            stat.get('statSourceId') == 1):
-                            projected_points = stat.get('appliedTotal', 0.0)
-                            break
-                    
-                    player_info = {
-                        'name': player.get('fullName', 'Unknown Player'),
-                        'position': get_position_name(player.get('defaultPositionId', 0)),
-                        'points': fantasy_points,
-                        'projected': projected_points,
-                        'player_id': player.get('id', 0),
-                        'lineup_slot': lineup_slot_id
-                    }
-                    
-                    if lineup_slot_id in [20, 21]:
-                        bench_players.append(player_info)
-                    else:
-                        lineup_players.append(player_info)
-                
-                weekly_analysis[str(week)] = {
-                    'teamRosters': {
-                        str(team_id): {
-                            'team_id': str(team_id),
-                            'team_name': team_week_data.get('name', 'Unknown Team'),
-                            'owner_name': team_week_data.get('owners', [{}])[0].get('displayName', 'Unknown Owner'),
-                            'lineup': lineup_players,
-                            'bench': bench_players
-                        }
-                    }
-                }
-                
-            except Exception as e:
-                logger.error(f"Week range - Failed to fetch week {week}: {str(e)}")
+        for week, week_teams in week_records.items():
+            team_week = week_teams.get(str(team_id))
+            if not team_week:
                 continue
+            
+            weekly_analysis[str(week)] = compact.team_week(team_week) if compact else {
+                'teamRosters': {
+                    str(team_id): team_week.to_dict()
+                }
+            }
         
-        return {
+        result = {
             'team_id': str(team_id),
             'season': year,
             'league_id': league_id,
-            'weeks_analyzed': list(range(start_week, min(end_week + 1, 18))),
+            'weeks_analyzed': weeks,
             'weekly_data': weekly_analysis,
+            'failed_weeks': failed_weeks,
             'start_week': start_week,
             'end_week': min(end_week, 17),
             'total_weeks_processed': len(weekly_analysis),
             'message': f'Processed weeks {start_week}-{min(end_week, 17)} ({len(weekly_analysis)} weeks of data)'
         }
+        if compact:
+            result.update(compact.tables())
+        
+        etag = None if failed_weeks else response_etag('week-range', etag_params, league_id, year, [], weeks)
+        return conditional_json_response(http_request, result, etag)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in week range analysis: {str(e)}", exc_info=True)
+        logger.error("Error in week range analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Week range analysis failed: {str(e)}")
 
 @app.delete("/logout")
-async def logout(session_token: str = Depends(get_current_session)):
+async def logout(session_data: Dict[str, Any] = Depends(get_token_payload)):
     """Logout and cleanup session"""
     try:
-        session_data = SecurityManager.validate_session_token(session_token)
         session_id = f"{session_data['user_id']}_{session_data['league_id']}"
         
-        if session_id in server_state.encrypted_sessions:
-            del server_state.encrypted_sessions[session_id]
-            logger.info(f"Session logged out: {session_id}")
+        credential_cache.discard(session_id)
+        if await state_call(server_state.sessions.remove, session_id):
+            logger.info("Session logged out: %s...", session_id[:8])
         
         return {'message': 'Logged out successfully'}
         
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
+        logger.error("Logout error: %s", e)
         return {'message': 'Logout completed'}
 
 @app.on_event("startup")
 async def startup_event():
     """Startup tasks"""
+    global espn_http_client
     logger.info("🔒 Secure ESPN Fantasy Football Server starting up")
-    logger.info(f"📊 Session timeout: {SESSION_TIMEOUT} seconds")
+    espn_http_client = create_espn_client()
+    logger.info("🌐 ESPN client pool: %s keep-alive connections", ESPN_MAX_CONNECTIONS)
+    logger.info("📊 Session timeout: %s seconds", SESSION_TIMEOUT)
     
 @app.on_event("shutdown") 
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("🔒 Secure server shutting down")
-    server_state.encrypted_sessions.clear()
+    server_state.sessions.close()
+    credential_cache.clear()
+    if espn_http_client is not None:
+        await espn_http_client.aclose()
+
+def compact_disk_cache(argv: List[str]) -> None:
+    """CLI: python secure-espn-server.py compact-cache [max_bytes]"""
+    if week_store is None:
+        print("ESPN_DISK_CACHE_PATH is not set - nothing to compact")
+        return
+    target_bytes = int(argv[0]) if argv else None
+    result = week_store.compact(target_bytes)
+    print(f"🧹 Removed {result['removed_entries']} cached weeks, store is now {result['bytes']} bytes")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "compact-cache":
+        compact_disk_cache(sys.argv[2:])
+        sys.exit(0)
+    
     port = int(os.getenv('PORT', 8000))
+    workers = int(os.getenv('WEB_CONCURRENCY', 1))
+    if workers > 1 and STATE_BACKEND == 'memory':
+        print("❌ WEB_CONCURRENCY > 1 needs STATE_BACKEND=sqlite so every worker sees the same sessions")
+        sys.exit(1)
     print(f"🔒 Starting Secure ESPN Fantasy Football Server on port {port}")
     print(f"🎯 Test League ID: 329849")
     print(f"🔐 Security: JWT tokens, encrypted credentials, rate limiting")
+    print(f"👥 Workers: {workers}, state backend: {STATE_BACKEND}")
     print("✅ Server ready for secure connections!")
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
\ No newline at end of file
+    if workers > 1:
+        # Each worker process imports the app itself
+        uvicorn.run("secure-espn-server:app", app_dir=os.path.dirname(os.path.abspath(__file__)),
+                    host="0.0.0.0", port=port, workers=workers, log_level="info")
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
\ No newline at end of file
@@ -64,6 +64,22 @@ export interface PlayerAnalysis {
   };
 }
 
+// One bench/start move between the actual and the optimal lineup (see lineup_solver.py).
+// slot is where the player starts in the optimal lineup / sat in the actual one.
+export interface LineupSwap {
+  start: { name: string; player_id: number; points: number; slot: string } | null;
+  bench: { name: string; player_id: number; points: number; slot: string } | null;
+  gain: number;
+}
+
+export interface OptimalLineupWeek {
+  week: number;
+  points: number;
+  optimalPoints: number;
+  pointsLeftOnBench: number;
+  swaps: LineupSwap[];
+}
+
 export interface WeeklyAnalysisData {
   week: number;
   totalPoints: number;
@@ -72,6 +88,8 @@ export interface WeeklyAnalysisData {
   processScore: number;
   efficiency: number;
   pointsLostToBench: number;
+  optimalPoints: number;
+  swaps: LineupSwap[];
   context: string;
   lineup: PlayerAnalysis[];
   keyInsights: {
@@ -82,8 +100,128 @@ export interface WeeklyAnalysisData {
   bottomLine: string;
 }
 
+// Compact wire format ("format": "compact"), see CompactRosterEncoder in the backend.
+// Players and teams are sent once; each team-week is [teamRef, lineup, bench] with
+// lineup/bench flattened into groups of player_fields ([playerRef, points, projected, lineup_slot]).
+type CompactTeamWeek = [number, number[], number[]];
+
+export function decodeCompactResponse(data: any): any {
+  if (!data || data.encoding !== 'compact-v1') {
+    return data;
+  }
+
+  const { encoding, player_fields, player_table, team_table, ...decoded } = data;
+  const stride = player_fields.length;
+
+  const decodePlayers = (rows: number[]) => {
+    const players = [];
+    for (let i = 0; i < rows.length; i += stride) {
+      const [player_id, name, position] = player_table[rows[i]];
+      players.push({ name, position, points: rows[i + 1], projected: rows[i + 2], player_id, lineup_slot: rows[i + 3] });
+    }
+    return players;
+  };
+
+  const decodeTeamWeek = ([teamRef, lineup, bench]: CompactTeamWeek) => {
+    const [team_id, team_name, owner_name] = team_table[teamRef];
+    return { team_id, team_name, owner_name, lineup: decodePlayers(lineup), bench: decodePlayers(bench) };
+  };
+
+  // Single-team endpoints: weekly_data[week] = { teamRosters: { [teamId]: roster } }
+  if (decoded.weekly_data) {
+    for (const week of Object.keys(decoded.weekly_data)) {
+      const roster = decodeTeamWeek(decoded.weekly_data[week]);
+      decoded.weekly_data[week] = { teamRosters: { [roster.team_id]: roster } };
+    }
+  }
+
+  // All-teams endpoint: teams[teamId].weekly_data[week] = { lineup, bench }
+  if (decoded.teams) {
+    for (const team of Object.values<any>(decoded.teams)) {
+      for (const week of Object.keys(team.weekly_data || {})) {
+        const { lineup, bench } = decodeTeamWeek(team.weekly_data[week]);
+        team.weekly_data[week] = { lineup, bench };
+      }
+    }
+  }
+
+  return decoded;
+}
+
+// Delta responses ("since_version"): only team-weeks changed since that data version
+// are sent, with removed_weeks as tombstones. Applies one to the previous full response.
+export function mergeDeltaResponse(base: any, delta: any): any {
+  if (!base || !delta?.delta) {
+    return delta;
+  }
+
+  const mergeWeeks = (weekly: Record<string, any>, changed: Record<string, any>, removed: number[] = []) => {
+    const merged = { ...weekly, ...changed };
+    for (const week of removed) {
+      delete merged[week.toString()];
+    }
+    return merged;
+  };
+
+  const { removed_weeks, ...merged } = delta;
+  merged.delta = false;
+
+  // Single-team endpoints
+  if (delta.weekly_data) {
+    merged.weekly_data = mergeWeeks(base.weekly_data || {}, delta.weekly_data, removed_weeks);
+  }
+
+  // All-teams endpoint: tombstones are per team
+  if (delta.teams) {
+    merged.teams = {};
+    for (const [teamId, team] of Object.entries<any>(delta.teams)) {
+      const { removed_weeks: teamRemoved, ...teamData } = team;
+      teamData.weekly_data = mergeWeeks(base.teams?.[teamId]?.weekly_data || {}, team.weekly_data, teamRemoved);
+      merged.teams[teamId] = teamData;
+    }
+  }
+
+  return merged;
+}
+
 class ESPNApiService {
   private sessionToken: string | null = null;
+  // Last response per request and its ETag, revalidated with If-None-Match
+  private revalidationCache = new Map<string, { etag: string; data: any }>();
+  // Last full team analysis per request, brought up to date with delta responses
+  private teamAnalysisBase = new Map<string, any>();
+
+  // POST that reuses the previous response when the server answers 304 (its ETags
+  // follow the league's per-week data versions). Compact responses are decoded.
+  private async conditionalPost(path: string, body: object): Promise<{ response: Response; data?: any }> {
+    // since_version is part of the server's ETag, so one entry per request is enough
+    const { since_version, ...identity } = body as Record<string, any>;
+    const key = `${path} ${JSON.stringify(identity)}`;
+    const cached = this.revalidationCache.get(key);
+    const response = await fetch(`${API_BASE_URL}${path}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${this.sessionToken}`,
+        ...(cached ? { 'If-None-Match': cached.etag } : {})
+      },
+      body: JSON.stringify(body),
+    });
+
+    if (response.status === 304 && cached) {
+      return { response, data: cached.data };
+    }
+    if (!response.ok) {
+      return { response };
+    }
+
+    const data = decodeCompactResponse(await response.json());
+    const etag = response.headers.get('ETag');
+    if (etag) {
+      this.revalidationCache.set(key, { etag, data });
+    }
+    return { response, data };
+  }
 
   async authenticate(credentials: ESPNCredentials): Promise<AuthResponse & { success: boolean; message?: string }> {
     console.log('🔄 Starting authentication request to:', `${API_BASE_URL}/secure-authenticate`);
@@ -144,16 +282,16 @@ class ESPNApiService {
       // Add small delay to prevent resource exhaustion
       await new Promise(resolve => setTimeout(resolve, 100));
       
-      const response = await fetch(`${API_BASE_URL}/secure-team-analysis`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${this.sessionToken}`
-        },
-        body: JSON.stringify(request),
+      // After the first load only team-weeks changed since the held version are sent
+      const baseKey = JSON.stringify(request);
+      const base = this.teamAnalysisBase.get(baseKey);
+      const { response, data: received } = await this.conditionalPost('/secure-team-analysis', {
+        ...request,
+        format: 'compact',
+        ...(base ? { since_version: base.data_version } : {})
       });
 
-      if (!response.ok) {
+      if (received === undefined) {
         const errorData = await response.json().catch(() => ({ detail: 'Network error' }));
         return {
           success: false,
@@ -169,7 +307,8 @@ class ESPNApiService {
         };
       }
 
-      const data = await response.json();
+      const data = mergeDeltaResponse(base, received);
+      this.teamAnalysisBase.set(baseKey, data);
       
       return {
         success: true,
@@ -337,22 +476,57 @@ class ESPNApiService {
     };
   }
 
+  // The server's optimal lineup for one team-week, solved from the league's slot
+  // rules and player eligibility. Null if the league analytics are unavailable.
+  async getOptimalLineupWeek(teamId: string, week: number, year: number = 2024): Promise<OptimalLineupWeek | null> {
+    if (!this.sessionToken) {
+      this.sessionToken = localStorage.getItem('fantasy-session-token');
+    }
+
+    if (!this.sessionToken) {
+      return null;
+    }
+
+    try {
+      const { data } = await this.conditionalPost('/secure-league-process-scores', {
+        league_id: localStorage.getItem('league-id') || '329849',
+        year: year,
+        start_week: week,
+        end_week: week
+      });
+      const weeks: OptimalLineupWeek[] = data?.league_summary?.optimalLineups?.teams?.[teamId]?.weeks || [];
+      return weeks.find(entry => entry.week === week) || null;
+    } catch (error) {
+      console.error('Optimal lineup lookup failed:', error);
+      return null;
+    }
+  }
+
   async getWeeklyAnalysis(teamId: string, week: number, year: number = 2024): Promise<WeeklyAnalysisData | null> {
     // Get stored league ID
     const leagueId = localStorage.getItem('league-id') || '329849';
     
-    const analysis = await this.getTeamAnalysis({
-      league_id: leagueId,
-      team_id: teamId,
-      year: year,
-      start_week: week,
-      end_week: week
-    });
+    const [analysis, optimal] = await Promise.all([
+      this.getTeamAnalysis({
+        league_id: leagueId,
+        team_id: teamId,
+        year: year,
+        start_week: week,
+        end_week: week
+      }),
+      this.getOptimalLineupWeek(teamId, week, year)
+    ]);
 
     if (!analysis.success || !analysis.data) {
       return null;
     }
 
+    // Efficiency and bench points come only from the solved optimal lineup
+    if (!optimal) {
+      console.error(`No optimal lineup for team ${teamId} week ${week}`);
+      return null;
+    }
+
     // Transform the backend response into the format expected by the frontend
     const weekData = analysis.data.weekly_data?.[week.toString()];
     if (!weekData) return null;
@@ -372,19 +546,17 @@ class ESPNApiService {
     const totalProjected = analyzedLineup.reduce((sum, player) => sum + player.projected, 0);
     const avgProcessScore = analyzedLineup.reduce((sum, player) => sum + player.processScore, 0) / analyzedLineup.length;
     
-    // Calculate points lost to bench
-    const bestBenchScores = benchPlayers.map((bp: any) => bp.points || 0).sort((a: number, b: number) => b - a);
-    const worstLineupScores = analyzedLineup.map(p => p.espnPoints).sort((a, b) => a - b);
-    let pointsLostToBench = 0;
-    for (let i = 0; i < Math.min(bestBenchScores.length, worstLineupScores.length); i++) {
-      if (bestBenchScores[i] > worstLineupScores[i]) {
-        pointsLostToBench += bestBenchScores[i] - worstLineupScores[i];
-      }
-    }
+    // Best lineup the league's slot rules allowed with this roster
+    const pointsLostToBench = optimal.pointsLeftOnBench;
+    const efficiency = optimal.optimalPoints > 0 ? Math.round((optimal.points / optimal.optimalPoints) * 1000) / 10 : 0;
+    const swaps = optimal.swaps;
+    const describeSwap = ({ start, bench, gain }: LineupSwap) =>
+      start && bench ? `Start ${start.name} (${start.points.toFixed(1)}) at ${start.slot} over ${bench.name} (${bench.points.toFixed(1)}): +${gain.toFixed(1)} points` :
+      start ? `Start ${start.name} (${start.points.toFixed(1)}) at ${start.slot}: +${gain.toFixed(1)} points` :
+      `Bench ${bench?.name} (${bench?.points.toFixed(1)})`;
 
     // Generate insights
     const eliteDecisions = analyzedLineup.filter(p => p.processScore >= 8);
-    const benchMisses = analyzedLineup.filter(p => p.benchImpact.includes('⚠️'));
     const projectionBeats = analyzedLineup.filter(p => p.projectionDiff > 5);
 
     const analysisResult = {
@@ -393,10 +565,12 @@ class ESPNApiService {
       totalProjected: Math.round(totalProjected * 10) / 10,
       projectionDiff: Math.round((totalPoints - totalProjected) * 10) / 10,
       processScore: Math.round(avgProcessScore * 10) / 10,
-      efficiency: totalProjected > 0 ? Math.round(((totalPoints - pointsLostToBench) / totalPoints) * 1000) / 10 : 0,
+      efficiency,
       pointsLostToBench: Math.round(pointsLostToBench * 10) / 10,
+      optimalPoints: Math.round(optimal.optimalPoints * 10) / 10,
+      swaps,
       context: eliteDecisions.length >= 2 ? `Elite decision-making drives strong week` : 
-               benchMisses.length >= 3 ? `Multiple bench optimization opportunities` :
+               swaps.length >= 3 ? `Multiple bench optimization opportunities` :
                projectionBeats.length >= 2 ? `Projection smashes overcome lineup issues` :
                `Mixed performance with ${Math.round(avgProcessScore * 10) / 10}/10 average process score`,
       lineup: analyzedLineup,
@@ -404,8 +578,8 @@ class ESPNApiService {
         eliteDecisionMaking: eliteDecisions.length > 0 ? 
           eliteDecisions.slice(0, 3).map(p => `${p.position} Choice: ${p.name} delivered ${p.processScore}/10 process score`) :
           ['Focus on identifying high-leverage position decisions'],
-        benchManagement: benchMisses.length > 0 ?
-          benchMisses.slice(0, 3).map(p => p.benchImpact.replace('⚠️ ', '').replace('(+', ' could have gained ').replace(')', ' points')) :
+        benchManagement: swaps.length > 0 ?
+          swaps.slice(0, 3).map(describeSwap) :
           [`Excellent bench management - only ${pointsLostToBench.toFixed(1)} points left on bench`],
         projectionAccuracy: [
           `${totalPoints > totalProjected ? '+' : ''}${(totalPoints - totalProjected).toFixed(1)} points vs projections (${Math.round((totalPoints / totalProjected) * 100)}% accuracy)`,
@@ -413,7 +587,7 @@ class ESPNApiService {
           `Biggest beats: ${projectionBeats.slice(0, 2).map(p => `${p.name} (+${p.projectionDiff.toFixed(1)})`).join(', ') || 'None'}`
         ]
       },
-      bottomLine: `You executed ${eliteDecisions.length} elite decisions with a ${avgProcessScore.toFixed(1)}/10 average process score. ${pointsLostToBench > 5 ? `Consider ${benchMisses.length} lineup optimizations that could have gained ${pointsLostToBench.toFixed(1)} points.` : 'Strong lineup construction with minimal bench regrets.'} Your ${totalPoints.toFixed(1)} points with ${Math.round(((totalPoints - pointsLostToBench) / totalPoints) * 100)}% efficiency demonstrates ${avgProcessScore >= 7 ? 'excellent' : avgProcessScore >= 6 ? 'solid' : avgProcessScore >= 5 ? 'average' : 'developing'} fantasy management.`
+      bottomLine: `You executed ${eliteDecisions.length} elite decisions with a ${avgProcessScore.toFixed(1)}/10 average process score. ${pointsLostToBench > 5 ? `Consider ${swaps.length} lineup optimizations that could have gained ${pointsLostToBench.toFixed(1)} points.` : 'Strong lineup construction with minimal bench regrets.'} Your ${totalPoints.toFixed(1)} points with ${Math.round(efficiency)}% efficiency demonstrates ${avgProcessScore >= 7 ? 'excellent' : avgProcessScore >= 6 ? 'solid' : avgProcessScore >= 5 ? 'average' : 'developing'} fantasy management.`
     };
 
     return analysisResult;
@@ -429,176 +603,20 @@ class ESPNApiService {
     }
 
     try {
-      // Get all teams analysis data
-      const response = await fetch(`${API_BASE_URL}/secure-all-teams-analysis`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${this.sessionToken}`
-        },
-        body: JSON.stringify({
-          league_id: localStorage.getItem('league-id') || '329849',
-          year: year,
-          start_week: 1,
-          end_week: 17
-        }),
+      // Process scores for every team are computed server-side in one batch;
+      // the response already has the getLeagueAnalysis() shape per team
+      const { data } = await this.conditionalPost('/secure-league-process-scores', {
+        league_id: localStorage.getItem('league-id') || '329849',
+        year: year,
+        start_week: 1,
+        end_week: 17
       });
-
-      const data = await response.json();
       
-      if (!response.ok || !data.teams) {
+      if (!data?.teams) {
         return null;
       }
 
-      // Process all teams with the same analysis engine
-      const leagueAnalysis = {};
-
-      for (const [teamId, teamData] of Object.entries(data.teams as any)) {
-        const weeklyData = teamData.weekly_data || {};
-        const weeks = Object.keys(weeklyData)
-          .filter(w => parseInt(w) <= 17)
-          .sort((a, b) => parseInt(a) - parseInt(b));
-
-        // Process each week to get analytics
-        const weeklyAnalytics = [];
-        let totalPoints = 0;
-        let totalProcessScore = 0;
-        let eliteGames = 0;
-        let strongGames = 0;
-        let averageGames = 0;
-        let poorGames = 0;
-
-        for (const week of weeks) {
-          const weekNum = parseInt(week);
-          const weekDataForWeek = weeklyData[week];
-          
-          if (!weekDataForWeek) continue;
-
-          const lineupPlayers = weekDataForWeek.lineup || [];
-          const benchPlayers = weekDataForWeek.bench || [];
-
-          // Calculate weekly metrics using the same algorithm
-          const analyzedLineup = lineupPlayers.map((player: any) => 
-            this.calculatePlayerProcessScore(player, benchPlayers, this.getProjectedPoints(player))
-          );
-
-          const weekPoints = analyzedLineup.reduce((sum, player) => sum + player.espnPoints, 0);
-          const validProcessScores = analyzedLineup.filter(p => 
-            p.processScore !== null && 
-            p.processScore !== undefined && 
-            !isNaN(p.processScore) && 
-            p.processScore > 0
-          );
-          const weekProcessScore = validProcessScores.length > 0 ? 
-            validProcessScores.reduce((sum, player) => sum + player.processScore, 0) / validProcessScores.length : 
-            5.0; // Default to middle score if no valid scores
-
-          totalPoints += weekPoints;
-          totalProcessScore += weekProcessScore;
-
-          // Count performance tiers based on Process Score
-          if (weekProcessScore >= 8.0) eliteGames++;
-          else if (weekProcessScore >= 6.5) strongGames++;
-          else if (weekProcessScore >= 5.0) averageGames++;
-          else poorGames++;
-
-          // Find top performer and any major misses
-          const topPerformer = analyzedLineup.reduce((best, current) => 
-            current.espnPoints > best.espnPoints ? current : best, analyzedLineup[0] || { name: 'None', espnPoints: 0 });
-          
-          const bigMiss = analyzedLineup.find(p => p.benchImpact.includes('⚠️') && 
-            parseFloat(p.benchImpact.match(/\+(\d+\.?\d*)/)?.[1] || '0') > 5);
-
-          weeklyAnalytics.push({
-            week: weekNum,
-            points: Math.round(weekPoints * 10) / 10,
-            topPlayer: topPerformer?.name || 'Unknown',
-            topPoints: Math.round((topPerformer?.espnPoints || 0) * 10) / 10,
-            processScore: Math.round(weekProcessScore * 10) / 10,
-            bigMiss: bigMiss?.benchAlternative || null
-          });
-        }
-
-        const avgPoints = weeks.length > 0 ? totalPoints / weeks.length : 0;
-        const avgProcessScore = weeks.length > 0 ? totalProcessScore / weeks.length : 0;
-
-        // Calculate season highlights and improvement areas
-        const allPlayerPerformances = [];
-        const positionMisses = { QB: 0, RB: 0, WR: 0, TE: 0, K: 0, 'D/ST': 0, FLEX: 0 };
-
-        for (const week of weeks) {
-          const weekDataForWeek = weeklyData[week];
-          if (!weekDataForWeek) continue;
-
-          const lineupPlayers = weekDataForWeek.lineup || [];
-          const benchPlayers = weekDataForWeek.bench || [];
-          const analyzedLineup = lineupPlayers.map((player: any) => 
-            this.calculatePlayerProcessScore(player, benchPlayers, this.getProjectedPoints(player))
-          );
-
-          // Track individual performances
-          analyzedLineup.forEach(player => {
-            if (player.espnPoints >= 20) {
-              allPlayerPerformances.push({
-                week: parseInt(week),
-                player: player.name,
-                points: player.espnPoints,
-                type: player.espnPoints >= 25 ? 'elite' : 'good'
-              });
-            }
-
-            // Track position-specific misses
-            if (player.benchImpact.includes('⚠️')) {
-              const missedPoints = parseFloat(player.benchImpact.match(/\+(\d+\.?\d*)/)?.[1] || '0');
-              positionMisses[player.position as keyof typeof positionMisses] += missedPoints;
-            }
-          });
-        }
-
-        // Get top 5 highlights
-        const seasonHighlights = allPlayerPerformances
-          .sort((a, b) => b.points - a.points)
-          .slice(0, 5);
-
-        // Calculate improvement areas
-        const improvementAreas = Object.entries(positionMisses)
-          .filter(([_, points]) => points > 5)
-          .sort(([,a], [,b]) => b - a)
-          .slice(0, 4)
-          .map(([position, points]) => ({
-            area: `${position} ${position === 'RB' ? 'Rotation Timing' : position === 'WR' ? 'Matchup Analysis' : position === 'QB' ? 'Streaming Decisions' : 'Start/Sit Decisions'}`,
-            impact: `+${points.toFixed(1)} pts`,
-            priority: points > 15 ? 'high' : points > 8 ? 'medium' : 'low',
-            description: position === 'RB' ? 'Better start/sit decisions for running backs' :
-                        position === 'WR' ? 'Exploit favorable receiver matchups' :
-                        position === 'QB' ? 'Optimize quarterback streaming' :
-                        position === 'TE' ? 'Improve tight end selection' :
-                        position === 'K' ? 'Target dome games and good matchups' :
-                        position === 'D/ST' ? 'Stream defenses more effectively' :
-                        'General lineup optimization'
-          }));
-
-        leagueAnalysis[teamId] = {
-          teamId,
-          teamName: teamData.team_name || teamData.teamName || `Team ${teamId}`,
-          ownerName: teamData.owner_name || teamData.ownerName || 'Unknown Owner',
-          seasonSummary: {
-            avgPoints: Math.round(avgPoints * 10) / 10,
-            avgProcessScore: Math.round(avgProcessScore * 10) / 10,
-            totalWeeks: weeks.length,
-            eliteGames,
-            strongGames,
-            averageGames,
-            poorGames,
-            benchPoints: 0 // Calculate if needed
-          },
-          weeklyPerformance: weeklyAnalytics,
-          seasonHighlights,
-          improvementAreas
-        };
-      }
-
-      return leagueAnalysis;
+      return data.teams;
 
     } catch (error) {
       console.error('League analysis failed:', error);
@@ -827,25 +845,18 @@ class ESPNApiService {
       // Add small delay to prevent resource exhaustion
       await new Promise(resolve => setTimeout(resolve, 100));
       
-      const response = await fetch(`${API_BASE_URL}/secure-team-quick-summary`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${this.sessionToken}`
-        },
-        body: JSON.stringify({
-          league_id: localStorage.getItem('league-id') || '329849',
-          team_id: teamId,
-          year: year
-        }),
+      const { response, data } = await this.conditionalPost('/secure-team-quick-summary', {
+        league_id: localStorage.getItem('league-id') || '329849',
+        team_id: teamId,
+        year: year,
+        format: 'compact'
       });
 
-      if (!response.ok) {
+      if (data === undefined) {
         const errorData = await response.json().catch(() => ({ detail: 'Network error' }));
         throw new Error(errorData.detail || 'Quick summary failed');
       }
 
-      const data = await response.json();
       return data;
       
     } catch (error) {
@@ -868,27 +879,20 @@ class ESPNApiService {
       // Add small delay to prevent resource exhaustion
       await new Promise(resolve => setTimeout(resolve, 100));
       
-      const response = await fetch(`${API_BASE_URL}/secure-team-week-range`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${this.sessionToken}`
-        },
-        body: JSON.stringify({
-          league_id: localStorage.getItem('league-id') || '329849',
-          team_id: teamId,
-          year: year,
-          start_week: startWeek,
-          end_week: endWeek
-        }),
+      const { response, data } = await this.conditionalPost('/secure-team-week-range', {
+        league_id: localStorage.getItem('league-id') || '329849',
+        team_id: teamId,
+        year: year,
+        start_week: startWeek,
+        end_week: endWeek,
+        format: 'compact'
       });
 
-      if (!response.ok) {
+      if (data === undefined) {
         const errorData = await response.json().catch(() => ({ detail: 'Network error' }));
         throw new Error(errorData.detail || 'Week range request failed');
       }
 
-      const data = await response.json();
       return data;
       
     } catch (error) {
@@ -1129,6 +1133,8 @@ class ESPNApiService {
 
   clearSession() {
     this.sessionToken = null;
+    this.revalidationCache.clear();
+    this.teamAnalysisBase.clear();
     localStorage.removeItem('fantasy-session-token');
   }
 }